@@ -8,8 +8,12 @@ import json
 import math
 import re
 import hashlib
+import base64
 import secrets
 import shutil
+import queue
+import random
+import threading
 from pathlib import Path
 from functools import wraps
 from datetime import datetime, timedelta, time as dt_time, timezone
@@ -31,15 +35,23 @@ from api import PropertyFinderClient, PropertyFinderAPIError, Config
 from models import PropertyListing, PropertyType, OfferingType, Location, Price
 from utils import BulkListingManager
 from database import (
-    db, LocalListing, PFSession, User, PFCache, AppSettings, ListingFolder, 
-    LoopConfig, LoopListing, DuplicatedListing, LoopExecutionLog, 
-    Lead, LeadUserTag, LeadReminder, LeadComment, Contact, Customer,
+    db, LocalListing, PFSession, User, PFCache, PublishJob, PublishJobItem, AppSettings, ListingFolder, 
+    LoopConfig, LoopListing, DuplicatedListing, LoopCleanupJob, LoopExecutionLog, LoopExecutionDailyStat, SchedulerLease,
+    Lead, LeadUserTag, LeadExportJob, LeadReminder, LeadComment, Contact, Customer,
     TaskBoard, TaskLabel, Task, TaskComment, BoardMember, BOARD_PERMISSIONS, task_assignee_association,
     Workspace, WorkspaceMember, WorkspaceConnection, WorkspaceApiCredential, WorkspaceInvite, PasswordResetToken,
     WorkspaceUserPermissionOverride,
-    SystemRole, UserSystemRole, WorkspaceRole, ModulePermission, ObjectACL, FeatureFlag, AuditLog
+    SystemRole, UserSystemRole, WorkspaceRole, ModulePermission, ObjectACL, FeatureFlag, AuditLog,
+    normalize_phone_e164, normalize_email_key, normalize_search_text, parse_listing_image_urls
 )
 from images import ImageProcessor
+from src.services.lead_dedupe import cluster_sorted_keys
+from src.services.listing_search import ListingSearch, SEARCH_MODE_FULL, SEARCH_MODE_TYPEAHEAD
+from src.services.media_validation import MediaUrlValidator
+from src.services.loop_schedule import LoopRunScheduler, WorkspaceFairExecutor
+from src.services.leader_election import LeaderElection, PostgresAdvisoryLock, FileLock
+from src.services.loop_projection import CallBudgetProjection
+from src.services.reminder_notifications import ReminderNotificationHub
 from src.services.i18n import (
     SUPPORTED_LANGUAGES,
     DEFAULT_LANGUAGE,
@@ -86,11 +98,13 @@ if IS_PRODUCTION and RAILWAY_VOLUME_PATH.exists():
     # Use Railway Volume for persistent storage
     UPLOAD_FOLDER = RAILWAY_VOLUME_PATH / 'uploads'
     LISTING_IMAGES_FOLDER = RAILWAY_VOLUME_PATH / 'uploads' / 'listings'
+    EXPORTS_FOLDER = RAILWAY_VOLUME_PATH / 'exports'
     print(f"[STARTUP] Using Railway Volume at: {RAILWAY_VOLUME_PATH}")
 else:
     # Local development storage
     UPLOAD_FOLDER = ROOT_DIR / 'uploads'
     LISTING_IMAGES_FOLDER = ROOT_DIR / 'uploads' / 'listings'
+    EXPORTS_FOLDER = ROOT_DIR / 'exports'
     print(f"[STARTUP] Using local storage at: {UPLOAD_FOLDER}")
 
 # Ensure upload directories exist
@@ -99,6 +113,8 @@ try:
     LISTING_IMAGES_FOLDER.mkdir(parents=True, exist_ok=True)
     (UPLOAD_FOLDER / 'logos').mkdir(parents=True, exist_ok=True)
     (UPLOAD_FOLDER / 'processed').mkdir(parents=True, exist_ok=True)
+    # Exports hold lead data, so they live outside the public uploads folder.
+    EXPORTS_FOLDER.mkdir(parents=True, exist_ok=True)
     print(f"[STARTUP] Upload directories created/verified")
 except Exception as e:
     print(f"[STARTUP] Warning: Could not create upload directories: {e}")
@@ -142,6 +158,22 @@ else:
     print(f"[STARTUP] Using SimpleCache (in-memory)")
 
 cache = Cache(app)
+_cache_counter_lock = threading.Lock()
+
+
+def _cache_incr(key):
+    """Add one to a never-expiring integer cache entry and return the new value.
+
+    Redis increments atomically (INCR). SimpleCache lives in this process, so a
+    lock is enough; its inc() would also put the entry on the default timeout.
+    """
+    if REDIS_URL:
+        return cache.inc(key)
+    with _cache_counter_lock:
+        value = int(cache.get(key) or 0) + 1
+        cache.set(key, value, timeout=0)
+        return value
+
 
 # Add a simple ping endpoint before any database setup
 @app.route('/ping')
@@ -169,6 +201,7 @@ app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
 
 # Initialize database
 db.init_app(app)
+listing_search = ListingSearch()
 
 # Create tables and default admin user
 with app.app_context():
@@ -262,6 +295,244 @@ with app.app_context():
         except Exception as e:
             print(f"[MIGRATION] crm_leads.tags migration skipped or failed: {e}")
 
+        # Migration: Composite index for per-column Kanban paging
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_leads_workspace_status_created ON crm_leads(workspace_id, status, created_at)"))
+                conn.commit()
+        except Exception as e:
+            print(f"[MIGRATION] crm_leads Kanban index migration skipped or failed: {e}")
+
+        # Migration: Normalized phone/email match keys for lead/contact deduplication
+        try:
+            inspector = db.inspect(db.engine)
+            with db.engine.connect() as conn:
+                for table_name in ('crm_leads', 'contacts'):
+                    existing_columns = {col['name'] for col in inspector.get_columns(table_name)}
+                    if 'phone_normalized' not in existing_columns:
+                        print(f"[MIGRATION] Adding phone_normalized column to {table_name}...")
+                        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN phone_normalized VARCHAR(20)"))
+                    if 'email_normalized' not in existing_columns:
+                        print(f"[MIGRATION] Adding email_normalized column to {table_name}...")
+                        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN email_normalized VARCHAR(120)"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_leads_workspace_phone_normalized ON crm_leads(workspace_id, phone_normalized)"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_leads_workspace_email_normalized ON crm_leads(workspace_id, email_normalized)"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_contacts_workspace_phone_normalized ON contacts(workspace_id, phone_normalized)"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_contacts_workspace_email_normalized ON contacts(workspace_id, email_normalized)"))
+                conn.commit()
+
+            # Backfill rows written before the columns existed (updated_at left untouched).
+            # Runs once: rows with no usable phone or email keep NULL keys and would
+            # otherwise be rescanned on every startup. The flag is looked up by key alone
+            # because the workspace backfill below moves global settings rows.
+            backfilled = 0
+            if not AppSettings.query.filter_by(key='lead_dedupe_keys_backfilled', value='true').first():
+                for model, extra_column in ((Lead, Lead.whatsapp), (Contact, Contact.country_code)):
+                    table = model.__table__
+                    update_stmt = table.update().where(table.c.id == db.bindparam('b_id')).values(
+                        phone_normalized=db.bindparam('b_phone'),
+                        email_normalized=db.bindparam('b_email'),
+                        updated_at=table.c.updated_at
+                    )
+                    last_id = 0
+                    while True:
+                        batch = db.session.query(model.id, model.phone, model.email, extra_column).filter(
+                            model.id > last_id,
+                            model.phone_normalized.is_(None),
+                            model.email_normalized.is_(None)
+                        ).order_by(model.id).limit(1000).all()
+                        if not batch:
+                            break
+                        last_id = batch[-1][0]
+                        params = []
+                        for record_id, phone, email, extra in batch:
+                            if model is Lead:
+                                phone_key = normalize_phone_e164(phone) or normalize_phone_e164(extra)
+                            else:
+                                phone_key = normalize_phone_e164(phone, default_country_code=extra or '+971')
+                            email_key = normalize_email_key(email)
+                            if phone_key or email_key:
+                                params.append({'b_id': record_id, 'b_phone': phone_key, 'b_email': email_key})
+                        if params:
+                            db.session.execute(update_stmt, params)
+                            db.session.commit()
+                            backfilled += len(params)
+                AppSettings.set('lead_dedupe_keys_backfilled', 'true', workspace_id=None)
+            if backfilled:
+                print(f"[MIGRATION] Backfilled normalized match keys for {backfilled} leads/contacts")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[MIGRATION] Lead dedupe key migration skipped or failed: {e}")
+
+        # Migration: Normalized listing search document + dialect search index
+        try:
+            inspector = db.inspect(db.engine)
+            listing_columns = {col['name'] for col in inspector.get_columns('listings')}
+            if 'search_document' not in listing_columns:
+                print("[MIGRATION] Adding search_document column to listings...")
+                with db.engine.connect() as conn:
+                    conn.execute(text("ALTER TABLE listings ADD COLUMN search_document TEXT"))
+                    conn.commit()
+
+            listings_table = LocalListing.__table__
+            update_stmt = listings_table.update().where(listings_table.c.id == db.bindparam('b_id')).values(
+                search_document=db.bindparam('b_document'),
+                updated_at=listings_table.c.updated_at
+            )
+            source_columns = [getattr(LocalListing, field) for field in LocalListing.SEARCH_DOCUMENT_FIELDS]
+            backfilled = 0
+            last_id = 0
+            while True:
+                batch = db.session.query(LocalListing.id, *source_columns).filter(
+                    LocalListing.id > last_id,
+                    LocalListing.search_document.is_(None)
+                ).order_by(LocalListing.id).limit(1000).all()
+                if not batch:
+                    break
+                last_id = batch[-1][0]
+                params = [
+                    {'b_id': row[0], 'b_document': normalize_search_text(*row[1:]) or None}
+                    for row in batch
+                ]
+                params = [item for item in params if item['b_document']]
+                if params:
+                    db.session.execute(update_stmt, params)
+                    db.session.commit()
+                    backfilled += len(params)
+            if backfilled:
+                print(f"[MIGRATION] Backfilled search_document for {backfilled} listings")
+
+            for message in listing_search.ensure_schema(db):
+                print(f"[MIGRATION] {message}")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[MIGRATION] Listing search migration skipped or failed: {e}")
+
+        # Migration: Denormalized image_count / cover_image on listings
+        try:
+            inspector = db.inspect(db.engine)
+            listing_columns = {col['name'] for col in inspector.get_columns('listings')}
+            with db.engine.connect() as conn:
+                if 'image_count' not in listing_columns:
+                    print("[MIGRATION] Adding image_count column to listings...")
+                    conn.execute(text("ALTER TABLE listings ADD COLUMN image_count INTEGER"))
+                if 'cover_image' not in listing_columns:
+                    print("[MIGRATION] Adding cover_image column to listings...")
+                    conn.execute(text("ALTER TABLE listings ADD COLUMN cover_image TEXT"))
+                conn.commit()
+
+            # One-time backfill: rows added before the columns have image_count NULL.
+            listings_table = LocalListing.__table__
+            update_stmt = listings_table.update().where(listings_table.c.id == db.bindparam('b_id')).values(
+                image_count=db.bindparam('b_count'),
+                cover_image=db.bindparam('b_cover'),
+                updated_at=listings_table.c.updated_at
+            )
+            backfilled = 0
+            last_id = 0
+            while True:
+                batch = db.session.query(LocalListing.id, LocalListing.images).filter(
+                    LocalListing.id > last_id,
+                    LocalListing.image_count.is_(None)
+                ).order_by(LocalListing.id).limit(1000).all()
+                if not batch:
+                    break
+                last_id = batch[-1][0]
+                params = []
+                for listing_id, raw_images in batch:
+                    try:
+                        urls = parse_listing_image_urls(raw_images)
+                    except Exception:
+                        urls = []
+                    params.append({'b_id': listing_id, 'b_count': len(urls), 'b_cover': urls[0] if urls else None})
+                db.session.execute(update_stmt, params)
+                db.session.commit()
+                backfilled += len(params)
+            if backfilled:
+                print(f"[MIGRATION] Backfilled image metadata for {backfilled} listings")
+
+            # Covers computed while parse_listing_image_urls mangled "uploads/listings/..." paths.
+            fixed = db.session.execute(listings_table.update().where(
+                listings_table.c.cover_image.like('/uploads/istings/%')
+            ).values(
+                cover_image=db.literal('/uploads/listings/') + db.func.substr(listings_table.c.cover_image, len('/uploads/istings/') + 1),
+                updated_at=listings_table.c.updated_at
+            )).rowcount
+            db.session.commit()
+            if fixed:
+                print(f"[MIGRATION] Repaired cover image path for {fixed} listings")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[MIGRATION] Listing image metadata migration skipped or failed: {e}")
+
+        # Migration: Hashes of the last payload pushed to PF (change detection)
+        try:
+            inspector = db.inspect(db.engine)
+            listing_columns = {col['name'] for col in inspector.get_columns('listings')}
+            if 'pf_payload_hashes' not in listing_columns:
+                print("[MIGRATION] Adding pf_payload_hashes column to listings...")
+                with db.engine.connect() as conn:
+                    conn.execute(text("ALTER TABLE listings ADD COLUMN pf_payload_hashes TEXT"))
+                    conn.commit()
+        except Exception as e:
+            print(f"[MIGRATION] PF payload hash migration skipped or failed: {e}")
+
+        # Migration: Retry backoff for publish queue items
+        try:
+            inspector = db.inspect(db.engine)
+            if inspector.has_table('publish_job_items'):
+                item_columns = {col['name'] for col in inspector.get_columns('publish_job_items')}
+                if 'next_attempt_at' not in item_columns:
+                    print("[MIGRATION] Adding next_attempt_at column to publish_job_items...")
+                    with db.engine.connect() as conn:
+                        conn.execute(text("ALTER TABLE publish_job_items ADD COLUMN next_attempt_at TIMESTAMP"))
+                        conn.commit()
+        except Exception as e:
+            print(f"[MIGRATION] Publish item backoff migration skipped or failed: {e}")
+
+        # Migration: Scheduling lag per loop run
+        try:
+            inspector = db.inspect(db.engine)
+            if inspector.has_table('loop_execution_logs'):
+                log_columns = {col['name'] for col in inspector.get_columns('loop_execution_logs')}
+                with db.engine.connect() as conn:
+                    if 'scheduled_for' not in log_columns:
+                        print("[MIGRATION] Adding scheduled_for column to loop_execution_logs...")
+                        conn.execute(text("ALTER TABLE loop_execution_logs ADD COLUMN scheduled_for TIMESTAMP"))
+                    if 'lag_ms' not in log_columns:
+                        print("[MIGRATION] Adding lag_ms column to loop_execution_logs...")
+                        conn.execute(text("ALTER TABLE loop_execution_logs ADD COLUMN lag_ms INTEGER"))
+                    conn.commit()
+        except Exception as e:
+            print(f"[MIGRATION] Loop execution lag migration skipped or failed: {e}")
+
+        # Migration: Per-loop log index for keyset paging and retention
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_loop_exec_loop_executed ON loop_execution_logs(loop_config_id, executed_at)"))
+                conn.commit()
+        except Exception as e:
+            print(f"[MIGRATION] loop_execution_logs index migration skipped or failed: {e}")
+
+        # Migration: Ordered per-loop index for next-listing lookups
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_loop_listings_loop_order ON loop_listings(loop_config_id, order_index)"))
+                conn.commit()
+        except Exception as e:
+            print(f"[MIGRATION] loop_listings order index migration skipped or failed: {e}")
+
+        # Migration: Prefix indexes for the listings summary search (PostgreSQL only;
+        # SQLite has no text_pattern_ops, and scanning one workspace there is acceptable)
+        if db.engine.dialect.name == 'postgresql':
+            try:
+                with db.engine.connect() as conn:
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_listings_lower_reference_prefix ON listings (lower(reference) text_pattern_ops)"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_listings_lower_title_prefix ON listings (lower(title_en) text_pattern_ops)"))
+                    conn.commit()
+            except Exception as e:
+                print(f"[MIGRATION] listings prefix search index migration skipped or failed: {e}")
+
         # Migration: Create lead_reminders table if it doesn't exist
         try:
             with db.engine.connect() as conn:
@@ -1635,15 +1906,18 @@ def validate_loop_schedule_payload(data):
     return normalized
 
 
-def is_loop_schedule_allowed_now(loop, now_utc=None):
-    """Return (is_allowed, reason) for current time under loop schedule."""
+def is_loop_schedule_allowed_now(loop, now_utc=None, tz=None):
+    """Return (is_allowed, reason) for current time under loop schedule.
+
+    `tz` skips the workspace timezone lookup (used when projecting many runs).
+    """
     if now_utc is None:
         now_utc = datetime.utcnow()
     mode = _loop_schedule_mode(loop)
     if mode == LoopConfig.SCHEDULE_INTERVAL:
         return True, 'ready'
 
-    tz = get_workspace_zoneinfo(loop.workspace_id)
+    tz = tz or get_workspace_zoneinfo(loop.workspace_id)
     now_local = now_utc.replace(tzinfo=timezone.utc).astimezone(tz)
 
     if mode == LoopConfig.SCHEDULE_WINDOWED_INTERVAL:
@@ -1665,7 +1939,7 @@ def is_loop_schedule_allowed_now(loop, now_utc=None):
     return (in_exact_time, 'ready' if in_exact_time else 'waiting_time')
 
 
-def compute_next_loop_run_at(loop, now_utc=None):
+def compute_next_loop_run_at(loop, now_utc=None, tz=None):
     """Compute next UTC execution time for a loop based on its schedule mode."""
     if now_utc is None:
         now_utc = datetime.utcnow()
@@ -1675,7 +1949,7 @@ def compute_next_loop_run_at(loop, now_utc=None):
     if mode == LoopConfig.SCHEDULE_INTERVAL:
         return now_utc + _loop_interval_delta(loop)
 
-    tz = get_workspace_zoneinfo(loop.workspace_id)
+    tz = tz or get_workspace_zoneinfo(loop.workspace_id)
     now_local = now_utc.replace(tzinfo=timezone.utc).astimezone(tz)
 
     if mode == LoopConfig.SCHEDULE_WINDOWED_INTERVAL:
@@ -1767,8 +2041,28 @@ def serialize_loop_for_api(loop):
     data['schedule_status'] = get_loop_schedule_status(loop)
     return data
 
-def execute_loop_job(loop_id):
-    """Execute a single loop iteration"""
+def _release_loop_claim(loop_id):
+    """Put a loop claimed by run_due_loops back on its schedule when no run happened.
+
+    The claim pushed next_run_at out by LOOP_RUN_CLAIM_SECONDS; only a finished
+    run sets the real value, so every path that skips the run comes here.
+    """
+    try:
+        loop = db.session.get(LoopConfig, loop_id)
+        if loop:
+            loop.next_run_at = compute_next_loop_run_at(loop, now_utc=datetime.utcnow())
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[LOOP] Could not reschedule loop {loop_id}: {e}")
+
+
+def execute_loop_job(loop_id, scheduled_for=None):
+    """Execute a single loop iteration.
+
+    `scheduled_for` is the next_run_at the run was due at; the delay between
+    it and the actual start is logged as the run's scheduling lag.
+    """
     with app.app_context():
         try:
             loop = LoopConfig.query.get(loop_id)
@@ -1777,16 +2071,21 @@ def execute_loop_job(loop_id):
                 return
             
             start_time = datetime.utcnow()
+            lag_ms = None
+            if scheduled_for is not None:
+                lag_ms = max(0, int((start_time - scheduled_for).total_seconds() * 1000))
             
             # Get next listing in sequence
             loop_listing = loop.get_next_listing()
             if not loop_listing:
                 print(f"[LOOP] Loop {loop_id} has no listings, skipping")
+                _release_loop_claim(loop_id)
                 return
             
             listing = loop_listing.listing
             if loop.workspace_id and listing and listing.workspace_id != loop.workspace_id:
                 print(f"[LOOP] Listing {listing.id} not in workspace {loop.workspace_id}, skipping")
+                _release_loop_claim(loop_id)
                 return
             print(f"[LOOP] Executing loop '{loop.name}' for listing {listing.reference}")
             
@@ -1835,23 +2134,29 @@ def execute_loop_job(loop_id):
                 success=success,
                 message=message,
                 pf_listing_id=pf_id,
-                duration_ms=duration_ms
+                duration_ms=duration_ms,
+                scheduled_for=scheduled_for,
+                lag_ms=lag_ms
             )
             db.session.add(log)
             
-            # Advance to next listing
-            loop.advance_index()
+            # Advance to next listing (written with the rest of this run's changes)
+            loop.advance_index(commit=False)
             completed_at = datetime.utcnow()
             loop.last_run_at = completed_at
             loop.next_run_at = compute_next_loop_run_at(loop, now_utc=completed_at)
             db.session.commit()
             
-            print(f"[LOOP] Completed: success={success}, message={message}")
+            print(f"[LOOP] Completed: success={success}, lag_ms={lag_ms}, message={message}")
             
         except Exception as e:
             import traceback
+            db.session.rollback()
             print(f"[LOOP] Error executing loop {loop_id}: {e}")
             traceback.print_exc()
+            _release_loop_claim(loop_id)
+        finally:
+            db.session.remove()
 
 
 def create_duplicate_listing(loop, original_listing, client):
@@ -1946,6 +2251,7 @@ def create_duplicate_listing(loop, original_listing, client):
         )
         db.session.add(duplicate)
         db.session.commit()
+        bump_listing_counts_version(duplicate.workspace_id)
         
         # Create on PropertyFinder
         pf_data = duplicate.to_pf_format()
@@ -1954,6 +2260,7 @@ def create_duplicate_listing(loop, original_listing, client):
         
         if pf_id:
             duplicate.pf_listing_id = pf_id
+            duplicate.remember_pf_payload(pf_data)
             
             # Publish it
             client.publish_listing(pf_id)
@@ -1993,6 +2300,7 @@ def delete_and_republish_listing(loop, listing, client):
         # Clear PF ID
         old_pf_id = listing.pf_listing_id
         listing.pf_listing_id = None
+        listing.remember_pf_payload(None)
         listing.status = 'draft'
         db.session.commit()
         
@@ -2003,6 +2311,7 @@ def delete_and_republish_listing(loop, listing, client):
         
         if pf_id:
             listing.pf_listing_id = pf_id
+            listing.remember_pf_payload(pf_data)
             
             # Publish it
             client.publish_listing(pf_id)
@@ -2017,130 +2326,508 @@ def delete_and_republish_listing(loop, listing, client):
         return False, str(e), None
 
 
-def start_loop_scheduler():
-    """Initialize and start the loop scheduler"""
-    try:
-        # Add a job that checks for pending loops frequently (seconds precision for second-based intervals).
-        poll_seconds_raw = os.getenv('LOOP_SCHEDULER_POLL_SECONDS', '1')
+def _runnable_loop_entries():
+    """(loop_id, next_run_at) for every active, unpaused loop (scheduler reconciliation)."""
+    with app.app_context():
         try:
-            poll_seconds = max(1, int(float(poll_seconds_raw)))
-        except (TypeError, ValueError):
-            poll_seconds = 1
-
-        loop_scheduler.add_job(
-            func=check_and_run_loops,
-            trigger=IntervalTrigger(seconds=poll_seconds),
-            id='loop_checker',
-            name='Check and run pending loops',
-            replace_existing=True
-        )
-        
-        loop_scheduler.start()
-        print(f"[SCHEDULER] Loop scheduler started (poll every {poll_seconds}s)")
-        
-        # Shutdown scheduler when app exits
-        atexit.register(lambda: loop_scheduler.shutdown())
-        
-    except Exception as e:
-        print(f"[SCHEDULER] Failed to start scheduler: {e}")
+            return db.session.query(LoopConfig.id, LoopConfig.next_run_at).filter(
+                LoopConfig.is_active == True,
+                LoopConfig.is_paused == False
+            ).all()
+        finally:
+            db.session.remove()
 
 
-def check_and_run_loops():
-    """Check for loops that need to run"""
+def run_due_loops(loop_ids):
+    """Claim loops the schedule heap reported as due (re-checked against the DB) and hand them to the executor.
+
+    Due rows are locked with SKIP LOCKED and their next_run_at is pushed out
+    by LOOP_RUN_CLAIM_SECONDS in the same transaction, so a loop can only be
+    claimed once even if two nodes briefly both believe they lead.
+    The run itself sets the real next_run_at when it finishes; loops the
+    executor refuses (already queued or running) are rescheduled right away.
+    """
     with app.app_context():
         try:
             now = datetime.utcnow()
-            
-            # Find active loops that are due
             due_loops = LoopConfig.query.filter(
+                LoopConfig.id.in_(loop_ids),
                 LoopConfig.is_active == True,
                 LoopConfig.is_paused == False,
                 db.or_(
                     LoopConfig.next_run_at == None,
                     LoopConfig.next_run_at <= now
                 )
-            ).all()
+            ).with_for_update(skip_locked=True).all()
             
+            claimed = []
             for loop in due_loops:
                 allowed_now, _reason = is_loop_schedule_allowed_now(loop, now_utc=now)
                 if not allowed_now:
                     loop.next_run_at = compute_next_loop_run_at(loop, now_utc=now)
-                    db.session.commit()
                     continue
-                print(f"[SCHEDULER] Running loop: {loop.name}")
-                execute_loop_job(loop.id)
+                claimed.append((loop.id, loop.workspace_id, loop.name, loop.next_run_at))
+                loop.next_run_at = now + timedelta(seconds=LOOP_RUN_CLAIM_SECONDS)
+            db.session.commit()
+            
+            for loop_id, workspace_id, name, scheduled_for in claimed:
+                if loop_executor.submit(workspace_id, loop_id, execute_loop_job, loop_id, scheduled_for):
+                    print(f"[SCHEDULER] Queued loop: {name} (workspace_id={workspace_id})")
+                else:
+                    _release_loop_claim(loop_id)
                 
         except Exception as e:
-            print(f"[SCHEDULER] Error checking loops: {e}")
+            db.session.rollback()
+            print(f"[SCHEDULER] Error running due loops: {e}")
+        finally:
+            db.session.remove()
+
+
+def _env_int(name, default, minimum=1):
+    try:
+        return max(minimum, int(float(os.getenv(name, str(default)))))
+    except (TypeError, ValueError):
+        return default
+
+
+# Loops run on a shared pool; each workspace gets at most LOOP_WORKSPACE_CONCURRENCY of it.
+LOOP_EXECUTOR_WORKERS = _env_int('LOOP_EXECUTOR_WORKERS', 4)
+LOOP_WORKSPACE_CONCURRENCY = _env_int('LOOP_WORKSPACE_CONCURRENCY', 1)
+loop_executor = WorkspaceFairExecutor(
+    max_workers=LOOP_EXECUTOR_WORKERS,
+    per_workspace=LOOP_WORKSPACE_CONCURRENCY
+)
+
+LOOP_SCHEDULER_RESYNC_SECONDS = _env_int('LOOP_SCHEDULER_RESYNC_SECONDS', 60, minimum=5)
+
+# A claimed loop is not due again for this long unless its run reschedules it first.
+LOOP_RUN_CLAIM_SECONDS = _env_int('LOOP_RUN_CLAIM_SECONDS', 600, minimum=60)
+
+loop_run_scheduler = LoopRunScheduler(
+    runner=run_due_loops,
+    loader=_runnable_loop_entries,
+    resync_seconds=LOOP_SCHEDULER_RESYNC_SECONDS
+)
+
+# Loop fields that decide whether and when a loop is on the schedule heap.
+LOOP_SCHEDULE_ATTRS = ('is_active', 'is_paused', 'next_run_at')
+
+
+@db.event.listens_for(db.session, 'after_flush')
+def _track_loop_schedule_changes(session, flush_context):
+    """Remember loops whose schedule changes in this transaction."""
+    changes = session.info.setdefault('loop_schedule_changes', {})
+    for obj in session.deleted:
+        if isinstance(obj, LoopConfig):
+            changes[obj.id] = None
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, LoopConfig) or obj in session.deleted:
+            continue
+        state = db.inspect(obj)
+        if obj not in session.new and not any(state.attrs[attr].history.has_changes() for attr in LOOP_SCHEDULE_ATTRS):
+            continue
+        runnable = bool(obj.is_active) and not obj.is_paused
+        changes[obj.id] = (obj.next_run_at,) if runnable else None
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def _apply_loop_schedule_changes(session):
+    for loop_id, entry in session.info.pop('loop_schedule_changes', {}).items():
+        if entry is None:
+            loop_run_scheduler.discard(loop_id)
+        else:
+            loop_run_scheduler.upsert(loop_id, entry[0])
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def _discard_loop_schedule_changes(session):
+    session.info.pop('loop_schedule_changes', None)
+
+
+# ==================== SCHEDULER LEADER ELECTION ====================
+# APScheduler runs in every process (one-off jobs such as exports and publish
+# runs execute where they were requested). Periodic jobs and the loop
+# dispatcher only run on the elected leader; see src/services/leader_election.py.
+
+SCHEDULER_LEASE_NAME = 'scheduler'
+SCHEDULER_LEADER_LOCK_KEY = 0x4C4D5343  # pg advisory lock key ("LMSC")
+SCHEDULER_LEADER_INTERVAL_SECONDS = _env_int('SCHEDULER_LEADER_INTERVAL_SECONDS', 15, minimum=1)
+
+# Interval jobs registered with register_leader_job(): id -> add_job kwargs.
+_leader_jobs = {}
+# One-off jobs added with add_leader_date_job(); removed on demotion, not re-added.
+_leader_date_job_ids = set()
+_leader_jobs_lock = threading.Lock()
+
+
+def _scheduler_leader_lock():
+    """Advisory lock on PostgreSQL, a lock file next to the database otherwise."""
+    if db.engine.dialect.name == 'postgresql':
+        return PostgresAdvisoryLock(db.engine, SCHEDULER_LEADER_LOCK_KEY)
+    database = db.engine.url.database
+    if database and database != ':memory:':
+        lock_path = f"{database}.scheduler.lock"
+    else:
+        lock_path = os.path.join(app.instance_path, 'scheduler.lock')
+        os.makedirs(app.instance_path, exist_ok=True)
+    return FileLock(lock_path)
+
+
+def _add_leader_job(job_id, job_kwargs):
+    try:
+        loop_scheduler.add_job(id=job_id, replace_existing=True, **job_kwargs)
+    except Exception as e:
+        print(f"[SCHEDULER] Failed to add job {job_id}: {e}")
+
+
+def register_leader_job(job_id, **job_kwargs):
+    """Add an APScheduler job that only the elected leader runs."""
+    with _leader_jobs_lock:
+        _leader_jobs[job_id] = job_kwargs
+        if scheduler_election.is_leader:
+            _add_leader_job(job_id, job_kwargs)
+
+
+def add_leader_date_job(job_id, **job_kwargs):
+    """Add a one-off job from leader-only code; it is dropped if this node is demoted."""
+    with _leader_jobs_lock:
+        if not scheduler_election.is_leader:
+            return False
+        _leader_date_job_ids.add(job_id)
+        _add_leader_job(job_id, job_kwargs)
+        return True
+
+
+def _start_leader_jobs():
+    print(f"[SCHEDULER] {scheduler_election.node_id} elected leader ({scheduler_election.backend})")
+    loop_run_scheduler.start()
+    with _leader_jobs_lock:
+        for job_id, job_kwargs in _leader_jobs.items():
+            _add_leader_job(job_id, job_kwargs)
+
+
+def _stop_leader_jobs():
+    print(f"[SCHEDULER] {scheduler_election.node_id} is no longer leader")
+    loop_run_scheduler.stop()
+    with _leader_jobs_lock:
+        for job_id in list(_leader_jobs) + list(_leader_date_job_ids):
+            try:
+                loop_scheduler.remove_job(job_id)
+            except Exception:
+                pass
+        _leader_date_job_ids.clear()
+
+
+def _record_scheduler_lease(election):
+    """Leader heartbeat: record who leads so every node can report it."""
+    with app.app_context():
+        try:
+            now = datetime.utcnow()
+            lease = db.session.get(SchedulerLease, SCHEDULER_LEASE_NAME)
+            if lease is None:
+                lease = SchedulerLease(name=SCHEDULER_LEASE_NAME, node_id=election.node_id)
+                db.session.add(lease)
+            if lease.node_id != election.node_id or lease.acquired_at is None:
+                lease.node_id = election.node_id
+                lease.acquired_at = now
+            lease.backend = election.backend
+            lease.heartbeat_at = now
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"[SCHEDULER] Failed to record leader heartbeat: {e}")
+        finally:
+            db.session.remove()
+
+
+with app.app_context():
+    scheduler_election = LeaderElection(
+        _scheduler_leader_lock(),
+        on_elected=_start_leader_jobs,
+        on_demoted=_stop_leader_jobs,
+        heartbeat=_record_scheduler_lease,
+        interval_seconds=SCHEDULER_LEADER_INTERVAL_SECONDS
+    )
+
+
+def start_loop_scheduler():
+    """Start background job scheduling and campaign for scheduler leadership"""
+    try:
+        loop_scheduler.start()
+        scheduler_election.start()
+        print(f"[SCHEDULER] Loop scheduler started (reconcile every {LOOP_SCHEDULER_RESYNC_SECONDS}s, node {scheduler_election.node_id})")
+        
+        # Shutdown scheduler when app exits; leadership is released first so another node takes over
+        atexit.register(lambda: loop_scheduler.shutdown())
+        atexit.register(loop_executor.shutdown)
+        atexit.register(lambda: auto_refresh_executor.shutdown())
+        atexit.register(scheduler_election.stop)
+        
+    except Exception as e:
+        print(f"[SCHEDULER] Failed to start scheduler: {e}")
+
+
+# ==================== PF AUTO-REFRESH ====================
+# The 5-minute planner only decides which workspaces are stale (one query);
+# refreshes run on a pool with one refresh per PF account at a time, each
+# started after a random delay so PF traffic is spread over the window.
+
+AUTO_REFRESH_CONCURRENCY = _env_int('AUTO_REFRESH_CONCURRENCY', 4)
+AUTO_REFRESH_JITTER_SECONDS = _env_int('AUTO_REFRESH_JITTER_SECONDS', 120, minimum=0)
+auto_refresh_executor = WorkspaceFairExecutor(
+    max_workers=AUTO_REFRESH_CONCURRENCY,
+    per_workspace=1,  # keyed by PF account, not workspace
+    thread_name_prefix='pf-auto-refresh'
+)
+
+
+def _stale_auto_refresh_workspaces(now_utc):
+    """(workspace_id, age_minutes) for active workspaces due a refresh, from a single query."""
+    enabled_ws = db.aliased(AppSettings)
+    enabled_global = db.aliased(AppSettings)
+    interval_ws = db.aliased(AppSettings)
+    interval_global = db.aliased(AppSettings)
+    rows = db.session.query(
+        Workspace.id,
+        enabled_ws.value,
+        enabled_global.value,
+        interval_ws.value,
+        interval_global.value,
+        PFCache.updated_at
+    ).outerjoin(enabled_ws, db.and_(
+        enabled_ws.workspace_id == Workspace.id, enabled_ws.key == 'auto_sync_enabled'
+    )).outerjoin(enabled_global, db.and_(
+        enabled_global.workspace_id == None, enabled_global.key == 'auto_sync_enabled'
+    )).outerjoin(interval_ws, db.and_(
+        interval_ws.workspace_id == Workspace.id, interval_ws.key == 'sync_interval_minutes'
+    )).outerjoin(interval_global, db.and_(
+        interval_global.workspace_id == None, interval_global.key == 'sync_interval_minutes'
+    )).outerjoin(PFCache, db.and_(
+        PFCache.workspace_id == Workspace.id, PFCache.cache_type == 'listings'
+    )).filter(Workspace.is_active == True).all()
+
+    stale = []
+    for ws_id, enabled, enabled_default, interval, interval_default, last_updated in rows:
+        # Same fallbacks as AppSettings.get: workspace value, then global, then default.
+        if next((v for v in (enabled, enabled_default) if v is not None), 'true') != 'true':
+            continue
+        try:
+            sync_interval = int(next((v for v in (interval, interval_default) if v is not None), '30'))
+        except (TypeError, ValueError):
+            sync_interval = 30
+        age_minutes = None
+        if last_updated:
+            age_minutes = (now_utc - last_updated).total_seconds() / 60
+            if age_minutes < sync_interval:
+                continue
+        stale.append((ws_id, age_minutes))
+    return stale
+
+
+def _pf_account_keys(workspace_ids):
+    """{workspace_id: PF API key} so refreshes sharing an account don't overlap."""
+    keys = {ws_id: Config.API_KEY or 'env' for ws_id in workspace_ids}
+    if not workspace_ids:
+        return keys
+    connections = WorkspaceConnection.query.filter(
+        WorkspaceConnection.workspace_id.in_(workspace_ids),
+        WorkspaceConnection.provider == 'propertyfinder',
+        WorkspaceConnection.is_active == True
+    ).all()
+    for conn in connections:
+        try:
+            creds = conn.get_credentials()
+        except Exception:
+            continue
+        if creds.get('api_key') and creds.get('api_secret'):
+            keys[conn.workspace_id] = creds['api_key']
+    return keys
+
+
+def refresh_workspace_pf_data(ws_id):
+    """Refresh one workspace's PF cache, local listing statuses and credits."""
+    with app.app_context():
+        try:
+            print(f"[AUTO-REFRESH] Refreshing PropertyFinder data (workspace_id={ws_id})...")
+            get_cached_pf_data(force_refresh=True, quick_load=False, workspace_id=ws_id)
+            status_result = sync_local_listing_statuses_from_pf_cache(workspace_id=ws_id)
+            if status_result.get('matched'):
+                print(f"[AUTO-REFRESH] Status sync (workspace_id={ws_id}): matched={status_result.get('matched')}, updated={status_result.get('updated')}")
+
+            # Fetch credits (account-level analytics)
+            try:
+                client = get_client(workspace_id=ws_id)
+                credits = client.get_credits()
+                cache = _get_pf_cache(workspace_id=ws_id)
+                cache['credits'] = credits
+                PFCache.set_cache('credits', credits, workspace_id=ws_id)
+            except Exception as e:
+                print(f"[AUTO-REFRESH] Credits sync failed (workspace_id={ws_id}): {e}")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[AUTO-REFRESH] Error (workspace_id={ws_id}): {e}")
+        finally:
+            db.session.remove()
+
+
+def _submit_workspace_refresh(ws_id, account_key):
+    if not scheduler_election.is_leader:
+        return  # demoted while the jittered job was waiting
+    auto_refresh_executor.submit(account_key, ('pf_refresh', ws_id), refresh_workspace_pf_data, ws_id)
 
 
 def auto_refresh_pf_data():
-    """Background job to automatically refresh PropertyFinder data (per-workspace)."""
+    """Background job: find stale workspaces and schedule their PF refreshes with jitter."""
     with app.app_context():
         try:
-            workspaces = Workspace.query.filter_by(is_active=True).all()
-            if not workspaces:
+            stale = _stale_auto_refresh_workspaces(datetime.utcnow())
+            if not stale:
                 return
-            
-            for ws in workspaces:
-                ws_id = ws.id
-                
-                # Check if auto-sync is enabled (workspace-scoped)
-                auto_sync_enabled = AppSettings.get('auto_sync_enabled', 'true', workspace_id=ws_id) == 'true'
-                if not auto_sync_enabled:
-                    continue
-                
-                # Get sync interval (use existing setting name, default: 30 minutes)
-                try:
-                    sync_interval = int(AppSettings.get('sync_interval_minutes', '30', workspace_id=ws_id))
-                except Exception:
-                    sync_interval = 30
-                
-                # Check if cache is stale
-                last_updated = PFCache.get_last_update('listings', workspace_id=ws_id)
-                if last_updated:
-                    age_minutes = (datetime.now() - last_updated).total_seconds() / 60
-                    if age_minutes < sync_interval:
-                        print(f"[AUTO-REFRESH] Cache is fresh ({age_minutes:.1f}m old), skipping (workspace_id={ws_id})")
-                        continue
-                
-                print(f"[AUTO-REFRESH] Refreshing PropertyFinder data (workspace_id={ws_id})...")
-                get_cached_pf_data(force_refresh=True, quick_load=False, workspace_id=ws_id)
-                status_result = sync_local_listing_statuses_from_pf_cache(workspace_id=ws_id)
-                if status_result.get('matched'):
-                    print(f"[AUTO-REFRESH] Status sync (workspace_id={ws_id}): matched={status_result.get('matched')}, updated={status_result.get('updated')}")
-
-                # Fetch credits (account-level analytics)
-                try:
-                    client = get_client(workspace_id=ws_id)
-                    credits = client.get_credits()
-                    cache = _get_pf_cache(workspace_id=ws_id)
-                    cache['credits'] = credits
-                    PFCache.set_cache('credits', credits, workspace_id=ws_id)
-                except Exception as e:
-                    print(f"[AUTO-REFRESH] Credits sync failed (workspace_id={ws_id}): {e}")
-            
-            print("[AUTO-REFRESH] Complete")
-            
+            account_keys = _pf_account_keys([ws_id for ws_id, _age in stale])
+            now = datetime.now()
+            for ws_id, age_minutes in stale:
+                if auto_refresh_executor.is_pending(('pf_refresh', ws_id)):
+                    continue  # previous refresh still queued or running
+                delay = random.uniform(0, AUTO_REFRESH_JITTER_SECONDS)
+                if not add_leader_date_job(
+                    f'pf_auto_refresh_ws_{ws_id}',
+                    func=_submit_workspace_refresh,
+                    trigger='date',
+                    run_date=now + timedelta(seconds=delay),
+                    args=[ws_id, account_keys[ws_id]],
+                    name=f'Auto-refresh PropertyFinder data (workspace {ws_id})'
+                ):
+                    return
+                age_text = f"{age_minutes:.1f}m old" if age_minutes is not None else 'never loaded'
+                print(f"[AUTO-REFRESH] Workspace {ws_id} stale ({age_text}), refresh in {delay:.0f}s")
         except Exception as e:
             print(f"[AUTO-REFRESH] Error: {e}")
+        finally:
+            db.session.remove()
 
 
 # Start the scheduler
 start_loop_scheduler()
 
 # Add auto-refresh job (check every 5 minutes, but only refresh if stale)
-try:
-    loop_scheduler.add_job(
-        func=auto_refresh_pf_data,
-        trigger=IntervalTrigger(minutes=5),
-        id='pf_auto_refresh',
-        name='Auto-refresh PropertyFinder data',
-        replace_existing=True
-    )
-    print("[SCHEDULER] PF auto-refresh job added")
-except Exception as e:
-    print(f"[SCHEDULER] Failed to add auto-refresh job: {e}")
+register_leader_job(
+    'pf_auto_refresh',
+    func=auto_refresh_pf_data,
+    trigger=IntervalTrigger(minutes=5),
+    name='Auto-refresh PropertyFinder data'
+)
+
+
+# ==================== LOOP LOG RETENTION ====================
+# Raw LoopExecutionLog rows are kept for LOOP_LOG_RETENTION_DAYS; older whole
+# days are rolled up into LoopExecutionDailyStat and then deleted in batches.
+
+LOOP_LOG_RETENTION_DAYS = _env_int('LOOP_LOG_RETENTION_DAYS', 30)
+LOOP_LOG_PRUNE_BATCH_SIZE = _env_int('LOOP_LOG_PRUNE_BATCH_SIZE', 1000, minimum=100)
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def rollup_loop_execution_day(day):
+    """Aggregate one UTC day of raw logs into daily stats rows (one transaction)."""
+    day_start = datetime.combine(day, dt_time.min)
+    rows = db.session.query(
+        LoopExecutionLog.loop_config_id,
+        LoopExecutionLog.action,
+        LoopExecutionLog.success,
+        LoopExecutionLog.duration_ms
+    ).filter(
+        LoopExecutionLog.executed_at >= day_start,
+        LoopExecutionLog.executed_at < day_start + timedelta(days=1)
+    ).yield_per(5000)
+
+    groups = {}
+    for loop_config_id, action, success, duration_ms in rows:
+        group = groups.setdefault((loop_config_id, action), {'runs': 0, 'successes': 0, 'durations': []})
+        group['runs'] += 1
+        if success:
+            group['successes'] += 1
+        if duration_ms is not None:
+            group['durations'].append(duration_ms)
+
+    for (loop_config_id, action), group in groups.items():
+        durations = sorted(group['durations'])
+        db.session.add(LoopExecutionDailyStat(
+            loop_config_id=loop_config_id,
+            day=day,
+            action=action,
+            runs=group['runs'],
+            successes=group['successes'],
+            failures=group['runs'] - group['successes'],
+            avg_duration_ms=int(round(sum(durations) / len(durations))) if durations else None,
+            p95_duration_ms=_percentile(durations, 95)
+        ))
+    db.session.commit()
+    return len(groups)
+
+
+def prune_loop_execution_logs(before):
+    """Delete raw logs executed before `before` in short batches; returns rows deleted."""
+    table = LoopExecutionLog.__table__
+    deleted = 0
+    while True:
+        batch_ids = [row[0] for row in db.session.query(LoopExecutionLog.id).filter(
+            LoopExecutionLog.executed_at < before
+        ).order_by(LoopExecutionLog.id).limit(LOOP_LOG_PRUNE_BATCH_SIZE).all()]
+        if not batch_ids:
+            return deleted
+        db.session.execute(table.delete().where(table.c.id.in_(batch_ids)))
+        db.session.commit()
+        deleted += len(batch_ids)
+
+
+def apply_loop_log_retention():
+    """Roll up and prune loop execution logs older than the retention window."""
+    with app.app_context():
+        try:
+            cutoff = datetime.combine(
+                datetime.utcnow().date() - timedelta(days=LOOP_LOG_RETENTION_DAYS), dt_time.min
+            )
+            oldest = db.session.query(db.func.min(LoopExecutionLog.executed_at)).filter(
+                LoopExecutionLog.executed_at < cutoff
+            ).scalar()
+            if oldest is None:
+                return
+
+            # A day that already has stats was rolled up by an earlier run whose
+            # pruning did not finish; its leftover rows are only pruned.
+            rolled_days = {row[0] for row in db.session.query(LoopExecutionDailyStat.day).filter(
+                LoopExecutionDailyStat.day >= oldest.date(),
+                LoopExecutionDailyStat.day < cutoff.date()
+            ).distinct()}
+            day = oldest.date()
+            groups = 0
+            while day < cutoff.date():
+                if day not in rolled_days:
+                    groups += rollup_loop_execution_day(day)
+                day += timedelta(days=1)
+
+            deleted = prune_loop_execution_logs(cutoff)
+            print(f"[LOOP] Log retention: rolled up {groups} loop/day groups, pruned {deleted} logs before {cutoff.date()}")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[LOOP] Log retention failed: {e}")
+        finally:
+            db.session.remove()
+
+
+register_leader_job(
+    'loop_log_retention',
+    func=apply_loop_log_retention,
+    trigger=IntervalTrigger(hours=6),
+    name='Roll up and prune loop execution logs'
+)
 
 
 # ==================== GLOBAL ERROR HANDLER ====================
@@ -3204,11 +3891,124 @@ def get_visible_folder_or_404(folder_id, workspace_id=None, user=None):
     return visible_folder_query(workspace_id=ws_id, user=user).filter_by(id=folder_id).first_or_404()
 
 
-def require_workspace_listing_admin(f):
-    """Decorator: listing organization actions are admin-only within a workspace."""
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        ws_id = get_active_workspace_id()
+# Per-user folder counts are cached briefly; listing writes bump the workspace version.
+LISTING_FOLDER_COUNTS_CACHE_SECONDS = 60
+
+
+def _listing_counts_version(workspace_id):
+    """Per-workspace generation counter mixed into listing count cache keys."""
+    return cache.get(f'listing_counts_version:{workspace_id}') or 0
+
+
+def bump_listing_counts_version(workspace_id):
+    """Invalidate cached listing/folder counts for a workspace after listing writes."""
+    if not workspace_id:
+        return
+    try:
+        _cache_incr(f'listing_counts_version:{workspace_id}')
+    except Exception as e:
+        print(f"[LISTINGS] Failed to bump count version (workspace_id={workspace_id}): {e}")
+
+
+def visible_listing_folder_counts(workspace_id=None, user=None):
+    """{folder_id: count} for listings visible to the user (one GROUP BY, cached)."""
+    ws_id = workspace_id or get_active_workspace_id()
+    user = user or getattr(g, 'user', None)
+    cache_key = f'listing_folder_counts:{ws_id}:{_listing_counts_version(ws_id)}:{user.id if user else 0}'
+    counts = cache.get(cache_key)
+    if counts is not None:
+        return counts
+    rows = visible_local_listing_query(ws_id, user=user).with_entities(
+        LocalListing.folder_id,
+        db.func.count(LocalListing.id)
+    ).group_by(LocalListing.folder_id).all()
+    counts = {folder_id: int(count) for folder_id, count in rows}
+    cache.set(cache_key, counts, timeout=LISTING_FOLDER_COUNTS_CACHE_SECONDS)
+    return counts
+
+
+# Stats are invalidated by the same version bump; the TTL only covers writers that don't bump.
+LISTING_STATS_CACHE_SECONDS = 300
+
+
+def _listing_visibility_scope_key(workspace_id, user):
+    """Cache key part shared by all users who see the same listing rows."""
+    if not user:
+        return 'none'
+    if is_system_admin(user):
+        return 'workspace'
+    scope = get_module_scope(user=user, workspace_id=workspace_id, module='listings', action='read')
+    if scope == 'workspace':
+        return 'workspace'
+    return f'user:{user.id}'
+
+
+def visible_listing_stats(workspace_id=None, user=None):
+    """Total/published/draft/sale/rent counts in one conditional-aggregation query (cached)."""
+    ws_id = workspace_id or get_active_workspace_id()
+    user = user or getattr(g, 'user', None)
+    scope_key = _listing_visibility_scope_key(ws_id, user)
+    cache_key = f'listing_stats:{ws_id}:{_listing_counts_version(ws_id)}:{scope_key}'
+    stats = cache.get(cache_key)
+    if stats is not None:
+        return stats
+    row = visible_local_listing_query(ws_id, user=user).with_entities(
+        db.func.count(LocalListing.id),
+        db.func.count(db.case((LocalListing.status == 'published', 1))),
+        db.func.count(db.case((LocalListing.status == 'draft', 1))),
+        db.func.count(db.case((LocalListing.offering_type == 'sale', 1))),
+        db.func.count(db.case((LocalListing.offering_type == 'rent', 1))),
+    ).order_by(None).one()
+    stats = {
+        'total': int(row[0] or 0),
+        'published': int(row[1] or 0),
+        'draft': int(row[2] or 0),
+        'for_sale': int(row[3] or 0),
+        'for_rent': int(row[4] or 0),
+    }
+    cache.set(cache_key, stats, timeout=LISTING_STATS_CACHE_SECONDS)
+    return stats
+
+
+# Columns whose changes move listings between stats/folder buckets.
+LISTING_COUNT_ATTRS = ('workspace_id', 'status', 'offering_type', 'folder_id', 'assigned_to_id')
+
+
+@db.event.listens_for(db.session, 'after_flush')
+def _track_listing_count_changes(session, flush_context):
+    """Remember workspaces whose listing counts change in this transaction."""
+    touched = session.info.setdefault('listing_count_workspaces', set())
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, LocalListing):
+            touched.add(obj.workspace_id)
+    for obj in session.dirty:
+        if not isinstance(obj, LocalListing):
+            continue
+        state = db.inspect(obj)
+        for attr in LISTING_COUNT_ATTRS:
+            history = state.attrs[attr].history
+            if history.has_changes():
+                touched.add(obj.workspace_id)
+                touched.update(value for value in history.deleted if attr == 'workspace_id')
+                break
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def _bump_listing_counts_after_commit(session):
+    for workspace_id in session.info.pop('listing_count_workspaces', ()):
+        bump_listing_counts_version(workspace_id)
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def _discard_listing_count_changes(session):
+    session.info.pop('listing_count_workspaces', None)
+
+
+def require_workspace_listing_admin(f):
+    """Decorator: listing organization actions are admin-only within a workspace."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        ws_id = get_active_workspace_id()
         if workspace_user_can_manage_all_listings(workspace_id=ws_id):
             return f(*args, **kwargs)
 
@@ -3827,15 +4627,43 @@ def _validate_open_api_listing_payload(data):
     return errors
 
 
-def _create_local_listing_record(data, workspace_id, actor_user=None, can_manage_all=True, force_draft=False):
-    """Shared listing creation helper used by internal and open APIs."""
-    reference = (data.get('reference') or '').strip()
-    if not reference:
-        return None, ('validation_error', 'Reference is required.', 422, {'reference': 'This field is required.'})
+def _workspace_member_lookup(workspace_id):
+    """Preloaded assignee lookup for a workspace: member ids and active members by email."""
+    rows = db.session.query(WorkspaceMember.user_id, User.email, User.is_active).join(
+        User, WorkspaceMember.user_id == User.id
+    ).filter(WorkspaceMember.workspace_id == workspace_id).all()
+    return {
+        'ids': {user_id for user_id, _email, _active in rows},
+        'ids_by_email': {
+            (email or '').strip().lower(): user_id
+            for user_id, email, is_active in rows
+            if email and is_active
+        },
+    }
 
-    existing = LocalListing.query.filter_by(reference=reference, workspace_id=workspace_id).first()
-    if existing:
-        return None, ('duplicate_reference', 'Reference already exists in this workspace.', 409, None)
+
+def _build_local_listing_record(data, workspace_id, actor_user=None, can_manage_all=True, force_draft=False,
+                                members=None, default_agent_email=None):
+    """Unsaved LocalListing with workspace defaults and assignee applied.
+
+    `members` (from _workspace_member_lookup) and `default_agent_email` let
+    batch callers resolve assignees without per-row queries.
+    Returns (listing, error) like _create_local_listing_record.
+    """
+    def validate_assignee(raw):
+        if members is None:
+            return _validate_assignee(workspace_id, raw)
+        try:
+            assignee_id = int(raw) if raw else None
+        except (TypeError, ValueError):
+            return None
+        return assignee_id if assignee_id in members['ids'] else None
+
+    def assignee_from_email(email):
+        if members is None:
+            return _resolve_assignee_id_from_assigned_agent_email(workspace_id, email)
+        value = str(email or '').strip().lower()
+        return members['ids_by_email'].get(value) if '@' in value else None
 
     listing = LocalListing.from_dict(data)
     listing.workspace_id = workspace_id
@@ -3844,34 +4672,56 @@ def _create_local_listing_record(data, workspace_id, actor_user=None, can_manage
         listing.status = 'draft'
 
     if not (listing.assigned_agent or '').strip():
-        listing.assigned_agent = get_default_assigned_agent_email(workspace_id=workspace_id, user=actor_user)
+        if default_agent_email is None:
+            default_agent_email = get_default_assigned_agent_email(workspace_id=workspace_id, user=actor_user)
+        listing.assigned_agent = default_agent_email
 
-    default_assigned_to_id = _validate_assignee(workspace_id, actor_user.id) if actor_user else None
+    default_assigned_to_id = validate_assignee(actor_user.id) if actor_user else None
     if can_manage_all:
         if 'assigned_to_id' in (data or {}):
             raw_assignee = data.get('assigned_to_id')
             if raw_assignee in (None, '', 'null'):
                 listing.assigned_to_id = None
             else:
-                assigned_to_id = _validate_assignee(workspace_id, raw_assignee)
+                assigned_to_id = validate_assignee(raw_assignee)
                 if not assigned_to_id:
                     return None, ('validation_error', 'Assigned user must be in this workspace.', 422, {'assigned_to_id': 'Invalid workspace member.'})
                 listing.assigned_to_id = assigned_to_id
         else:
-            inferred_assignee_id = _resolve_assignee_id_from_assigned_agent_email(
-                workspace_id,
-                listing.assigned_agent
-            )
+            inferred_assignee_id = assignee_from_email(listing.assigned_agent)
             listing.assigned_to_id = inferred_assignee_id or default_assigned_to_id
     elif actor_user:
         listing.assigned_to_id = default_assigned_to_id or actor_user.id
 
+    return listing, None
+
+
+def _create_local_listing_record(data, workspace_id, actor_user=None, can_manage_all=True, force_draft=False):
+    """Shared listing creation helper used by internal and open APIs."""
+    reference = (data.get('reference') or '').strip()
+    if not reference:
+        return None, ('validation_error', 'Reference is required.', 422, {'reference': 'This field is required.'})
+
+    existing = LocalListing.query.filter_by(reference=reference, workspace_id=workspace_id).first()
+    if existing:
+        return None, ('duplicate_reference', 'Reference already exists in this workspace.', 409, None)
+
+    listing, error = _build_local_listing_record(
+        data, workspace_id,
+        actor_user=actor_user,
+        can_manage_all=can_manage_all,
+        force_draft=force_draft
+    )
+    if error:
+        return None, error
+
     db.session.add(listing)
     try:
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
         return None, ('duplicate_reference', 'Reference already exists.', 409, None)
+    bump_listing_counts_version(workspace_id)
 
     return listing, None
 
@@ -4313,6 +5163,7 @@ def sync_pf_leads_to_db(pf_leads, workspace_id=None):
     
     imported = 0
     updated = 0
+    new_leads = []
     for pf_lead in pf_leads:
         try:
             pf_id = str(pf_lead.get('id', ''))
@@ -4402,6 +5253,7 @@ def sync_pf_leads_to_db(pf_leads, workspace_id=None):
                 workspace_id=ws_id
             )
             db.session.add(lead)
+            new_leads.append(lead)
             imported += 1
         except Exception as e:
             print(f"Error importing lead {pf_lead.get('id')}: {e}")
@@ -4410,8 +5262,12 @@ def sync_pf_leads_to_db(pf_leads, workspace_id=None):
     if imported > 0 or updated > 0:
         try:
             db.session.commit()
+            bump_leads_count_version(ws_id)
             if imported > 0:
                 print(f"✓ Synced {imported} new leads to database")
+                flagged = count_leads_with_existing_duplicates(ws_id, new_leads)
+                if flagged:
+                    print(f"[LEADS] {flagged} synced leads match existing leads (workspace_id={ws_id})")
             if updated > 0:
                 print(f"✓ Updated {updated} existing leads")
         except Exception as e:
@@ -4577,9 +5433,37 @@ def validate_location_id(local_listing, client):
     return False, 'Invalid Location ID for PropertyFinder. Please re-select the location from search.'
 
 
+def _local_upload_path_for_url(url):
+    """Path on disk for a URL served from this app's /uploads/ route (None otherwise)."""
+    from urllib.parse import unquote, urlsplit
+
+    value = str(url or '').strip()
+    path = None
+    if value.startswith('/uploads/'):
+        path = value
+    elif APP_PUBLIC_URL and value.startswith(APP_PUBLIC_URL.rstrip('/') + '/uploads/'):
+        path = value[len(APP_PUBLIC_URL.rstrip('/')):]
+    if path is None:
+        return None
+    relative = unquote(urlsplit(path).path)[len('/uploads/'):]
+    upload_root = Path(UPLOAD_FOLDER).resolve()
+    candidate = (upload_root / relative).resolve()
+    if candidate != upload_root and upload_root not in candidate.parents:
+        return None
+    return candidate
+
+
+media_url_validator = MediaUrlValidator(
+    local_path_resolver=_local_upload_path_for_url,
+    request_timeout=getattr(Config, 'MEDIA_CHECK_TIMEOUT_SECONDS', 5),
+    deadline_seconds=getattr(Config, 'MEDIA_CHECK_DEADLINE_SECONDS', 20)
+)
+
+
 def validate_media_urls(listing_data):
     """
     Validate that media image URLs are publicly accessible.
+    Checks run concurrently with a cached result per URL (see MediaUrlValidator).
     Returns (ok, message, failed_urls, warnings).
     """
     media = listing_data.get('media') or {}
@@ -4605,25 +5489,12 @@ def validate_media_urls(listing_data):
     if getattr(Config, 'SKIP_MEDIA', False):
         return True, None, None, warnings
 
-    import requests
-
-    failed = []
-    for url in urls:
-        if not url:
-            continue
-        try:
-            resp = requests.head(url, allow_redirects=True, timeout=10)
-            status = resp.status_code
-            resp.close()
-            if status == 405:
-                resp = requests.get(url, allow_redirects=True, timeout=10, stream=True)
-                resp.raw.read(1024)
-                status = resp.status_code
-                resp.close()
-            if status < 200 or status >= 400:
-                failed.append(url)
-        except requests.RequestException:
-            failed.append(url)
+    failed, unverified = media_url_validator.check(urls)
+    if unverified:
+        warnings.append(
+            f"{len(unverified)} image URL(s) did not respond within "
+            f"{media_url_validator.deadline_seconds:g}s and were not verified."
+        )
 
     if not failed:
         return True, None, None, warnings
@@ -4743,8 +5614,79 @@ def find_pf_listing_by_reference(client, reference: str):
     return listings[0]
 
 
+# Rows per bulk status UPDATE statement.
+PF_STATUS_SYNC_CHUNK_SIZE = 1000
+
+
+def _pf_payload_hashes_after_relink(table, pf_listing_id):
+    """SET value for `pf_payload_hashes` that drops the stored hashes when `pf_listing_id` changes."""
+    return db.case(
+        (table.c.pf_listing_id.is_distinct_from(pf_listing_id), None),
+        else_=table.c.pf_payload_hashes
+    )
+
+
+def _apply_pf_status_sync_updates(rows):
+    """Write (listing_id, pf_listing_id, status_or_None) changes in bulk.
+
+    PostgreSQL gets one UPDATE ... FROM (VALUES ...) per chunk; other
+    dialects get an executemany UPDATE keyed by id. `updated_at` only moves
+    for rows whose status changes; stored PF payload hashes are dropped for
+    rows relinked to another PF listing.
+    """
+    table = LocalListing.__table__
+    status_rows = [row for row in rows if row[2] is not None]
+    link_rows = [row for row in rows if row[2] is None]
+    now = datetime.utcnow()
+
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy import Integer, String, column, values
+
+        for batch, with_status in ((status_rows, True), (link_rows, False)):
+            for start in range(0, len(batch), PF_STATUS_SYNC_CHUNK_SIZE):
+                chunk = batch[start:start + PF_STATUS_SYNC_CHUNK_SIZE]
+                changes = values(
+                    column('b_id', Integer), column('b_pf_listing_id', String), column('b_status', String),
+                    name='pf_status_changes'
+                ).data(chunk)
+                assignments = {
+                    'pf_listing_id': changes.c.b_pf_listing_id,
+                    'pf_payload_hashes': _pf_payload_hashes_after_relink(table, changes.c.b_pf_listing_id),
+                    'updated_at': table.c.updated_at,
+                }
+                if with_status:
+                    assignments.update(status=changes.c.b_status, updated_at=now)
+                db.session.execute(table.update().where(table.c.id == changes.c.b_id).values(**assignments))
+    else:
+        if status_rows:
+            db.session.execute(
+                table.update().where(table.c.id == db.bindparam('b_id')).values(
+                    pf_listing_id=db.bindparam('b_pf_listing_id'),
+                    pf_payload_hashes=_pf_payload_hashes_after_relink(table, db.bindparam('b_pf_listing_id')),
+                    status=db.bindparam('b_status'),
+                    updated_at=now
+                ),
+                [{'b_id': i, 'b_pf_listing_id': pf_id, 'b_status': status} for i, pf_id, status in status_rows]
+            )
+        if link_rows:
+            db.session.execute(
+                table.update().where(table.c.id == db.bindparam('b_id')).values(
+                    pf_listing_id=db.bindparam('b_pf_listing_id'),
+                    pf_payload_hashes=_pf_payload_hashes_after_relink(table, db.bindparam('b_pf_listing_id')),
+                    updated_at=table.c.updated_at
+                ),
+                [{'b_id': i, 'b_pf_listing_id': pf_id} for i, pf_id, _status in link_rows]
+            )
+    db.session.commit()
+
+
 def sync_local_listing_statuses_from_pf_cache(workspace_id=None):
-    """Sync LocalListing.status using cached PF listings (no extra API calls, workspace-aware)."""
+    """Sync LocalListing.status using cached PF listings (no extra API calls, workspace-aware).
+
+    PF listings are reduced once to {pf_id | reference: (pf_id, local_status)};
+    local rows are read as plain tuples and only rows whose status or PF id
+    actually differ are written, in bulk.
+    """
     ws_id = _resolve_pf_workspace_id(workspace_id)
     pf_listings = get_cached_listings(workspace_id=ws_id) or []
     if not pf_listings:
@@ -4756,44 +5698,59 @@ def sync_local_listing_statuses_from_pf_cache(workspace_id=None):
         if not isinstance(listing, dict):
             continue
         pf_id = listing.get('id')
+        target = (
+            str(pf_id) if pf_id else None,
+            map_pf_state_to_local_status(extract_pf_state_from_listing(listing))
+        )
         if pf_id is not None:
-            pf_by_id[str(pf_id)] = listing
+            pf_by_id[str(pf_id)] = target
         ref = _pf_listing_reference(listing)
         if ref:
-            pf_by_ref[ref.lower()] = listing
+            pf_by_ref[ref.lower()] = target
 
     matched = 0
     updated = 0
     changed = 0
-
-    query = LocalListing.query
+    pending = []
+    touched_workspaces = set()
+
+    query = db.session.query(
+        LocalListing.id,
+        LocalListing.workspace_id,
+        LocalListing.pf_listing_id,
+        LocalListing.reference,
+        LocalListing.status
+    )
     if ws_id:
-        query = query.filter_by(workspace_id=ws_id)
-    for local in query.all():
-        pf_listing = None
-        if local.pf_listing_id:
-            pf_listing = pf_by_id.get(str(local.pf_listing_id))
-        if not pf_listing and local.reference:
-            pf_listing = pf_by_ref.get(str(local.reference).strip().lower())
-        if not pf_listing:
+        query = query.filter(LocalListing.workspace_id == ws_id)
+    for listing_id, listing_ws_id, local_pf_id, reference, status in query.yield_per(PF_STATUS_SYNC_CHUNK_SIZE):
+        target = None
+        if local_pf_id:
+            target = pf_by_id.get(str(local_pf_id))
+        if not target and reference:
+            target = pf_by_ref.get(str(reference).strip().lower())
+        if not target:
             continue
 
         matched += 1
-        pf_id = pf_listing.get('id')
-        if pf_id and (not local.pf_listing_id or str(local.pf_listing_id) != str(pf_id)):
-            local.pf_listing_id = str(pf_id)
+        pf_id, new_status = target
+        next_pf_id = local_pf_id
+        if pf_id and (not local_pf_id or str(local_pf_id) != pf_id):
+            next_pf_id = pf_id
             changed += 1
-
-        pf_state = extract_pf_state_from_listing(pf_listing)
-        new_status = map_pf_state_to_local_status(pf_state)
-        if new_status and local.status != new_status:
-            local.status = new_status
-            local.updated_at = datetime.utcnow()
+        next_status = None
+        if new_status and status != new_status:
+            next_status = new_status
             updated += 1
             changed += 1
+            touched_workspaces.add(listing_ws_id)
+        if next_pf_id != local_pf_id or next_status is not None:
+            pending.append((listing_id, next_pf_id, next_status))
 
-    if changed:
-        db.session.commit()
+    if pending:
+        _apply_pf_status_sync_updates(pending)
+        for touched_ws_id in touched_workspaces:
+            bump_listing_counts_version(touched_ws_id)
 
     return {'matched': matched, 'updated': updated, 'changed': changed}
 
@@ -5800,14 +6757,14 @@ def _render_insights_page(workspace_id):
     """Render insights page with a safe, complete context."""
     local_listings = []
     if workspace_id:
-        base_query = scope_query(LocalListing.query, workspace_id)
+        base_query = scope_query(LocalListing.query, workspace_id).options(*LocalListing.collection_load_options())
         if can_view_workspace_wide_insights(workspace_id=workspace_id):
             local_listings = base_query.all()
         else:
             visible_user_ids = get_readable_user_ids_for_insights(workspace_id=workspace_id)
             if visible_user_ids:
                 local_listings = base_query.filter(LocalListing.assigned_to_id.in_(visible_user_ids)).all()
-    local_data = [listing.to_dict() for listing in local_listings]
+    local_data = LocalListing.to_dict_collection(local_listings)
     return render_template(
         'insights.html',
         pf_listings=[],
@@ -5831,16 +6788,13 @@ def workspace_dashboard(workspace_slug):
         ws_id = g.workspace.id
         base_query = visible_local_listing_query(ws_id)
         can_view_pf_credits = workspace_user_can_manage_all_listings(workspace_id=ws_id)
-        stats = {
-            'total': base_query.count(),
-            'published': base_query.filter_by(status='published').count(),
-            'draft': base_query.filter_by(status='draft').count(),
-        }
-        recent = base_query.order_by(LocalListing.updated_at.desc()).limit(5).all()
+        stats = visible_listing_stats(ws_id)
+        recent = base_query.options(*LocalListing.collection_load_options()) \
+            .order_by(LocalListing.updated_at.desc()).limit(5).all()
         return render_template(
             'index.html',
             stats=stats,
-            recent_listings=[l.to_dict() for l in recent],
+            recent_listings=LocalListing.to_dict_collection(recent),
             can_view_pf_credits=can_view_pf_credits
         )
     except Exception as e:
@@ -7587,6 +8541,36 @@ def api_get_audit_logs():
     })
 
 
+@app.route('/api/system/scheduler', methods=['GET'])
+@login_required
+def api_get_scheduler_status():
+    """Which node leads background scheduling, plus this node's dispatcher state"""
+    from src.services.permissions import get_permission_service
+    
+    service = get_permission_service()
+    if not service.is_system_admin(g.user):
+        return jsonify({'success': False, 'error': 'Access denied'}), 403
+    
+    lease = db.session.get(SchedulerLease, SCHEDULER_LEASE_NAME)
+    leader = lease.to_dict() if lease else None
+    if leader and lease.heartbeat_at:
+        heartbeat_age = (datetime.utcnow() - lease.heartbeat_at).total_seconds()
+        leader['heartbeat_age_seconds'] = round(heartbeat_age, 1)
+        leader['stale'] = heartbeat_age > SCHEDULER_LEADER_INTERVAL_SECONDS * 3
+    
+    next_due = loop_run_scheduler.next_due_at() if scheduler_election.is_leader else None
+    return jsonify({
+        'success': True,
+        'leader': leader,
+        'node': scheduler_election.status(),
+        'loops': {
+            'scheduled': loop_run_scheduler.pending_count() if scheduler_election.is_leader else None,
+            'next_due_at': _to_utc_iso_z(next_due) if next_due and next_due != datetime.min else None,
+            'executor': loop_executor.stats()
+        }
+    })
+
+
 # --- Check Access API (for frontend) ---
 
 @app.route('/api/check-access', methods=['POST'])
@@ -7786,17 +8770,10 @@ def _render_listings_page(workspace_id):
             except (TypeError, ValueError):
                 pass
     
-    # Search filter
+    # Search filter (indexed; sort_by=relevance orders by match quality)
+    rank_by_relevance = bool(search) and sort_by == 'relevance'
     if search:
-        search_term = f'%{search}%'
-        query = query.filter(
-            db.or_(
-                LocalListing.reference.ilike(search_term),
-                LocalListing.title_en.ilike(search_term),
-                LocalListing.location.ilike(search_term),
-                LocalListing.city.ilike(search_term)
-            )
-        )
+        query = listing_search.apply(db, query, search, ranked=rank_by_relevance)
     
     # Sorting
     valid_sort_columns = {
@@ -7813,36 +8790,31 @@ def _render_listings_page(workspace_id):
     }
     
     sort_column = valid_sort_columns.get(sort_by, LocalListing.updated_at)
-    if sort_order == 'asc':
+    if rank_by_relevance:
+        pass
+    elif sort_order == 'asc':
         query = query.order_by(sort_column.asc())
     else:
         query = query.order_by(sort_column.desc())
     
+    query = query.options(*LocalListing.collection_load_options())
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     
     # Get personal folders for sidebar (user-owned categories only)
     personal_folders = visible_folder_query(workspace_id=workspace_id).order_by(ListingFolder.name).all()
-    personal_folder_ids = {f.id for f in personal_folders}
-    visible_counts = {}
-    for listing in visible_local_listing_query(workspace_id).all():
-        normalized_folder_id = listing.folder_id if listing.folder_id in personal_folder_ids else None
-        visible_counts[normalized_folder_id] = visible_counts.get(normalized_folder_id, 0) + 1
+    folder_counts = visible_listing_folder_counts(workspace_id)
     folders = []
     for folder in personal_folders:
         data = folder.to_dict()
-        data['listing_count'] = visible_counts.get(folder.id, 0)
+        data['listing_count'] = folder_counts.get(folder.id, 0)
         folders.append(data)
     current_folder = None
     if folder_id:
-        current_folder = visible_folder_query(workspace_id=workspace_id).filter_by(id=folder_id).first()
-    uncategorized_count = visible_local_listing_query(workspace_id).filter(
-        LocalListing.folder_id.is_(None)
-    ).count()
+        current_folder = next((folder for folder in personal_folders if folder.id == folder_id), None)
+    uncategorized_count = folder_counts.get(None, 0)
     
     # Count duplicates (for showing toggle info)
-    duplicates_count = 0
-    if duplicated_folder:
-        duplicates_count = visible_local_listing_query(workspace_id).filter_by(folder_id=duplicated_folder.id).count()
+    duplicates_count = folder_counts.get(duplicated_folder.id, 0) if duplicated_folder else 0
 
     folder_nav_urls = None
     active_workspace = getattr(g, 'workspace', None) or get_active_workspace()
@@ -7868,8 +8840,7 @@ def _render_listings_page(workspace_id):
             )
     
     listing_rows = []
-    for listing in pagination.items:
-        row = listing.to_dict()
+    for row in LocalListing.to_dict_collection(pagination.items):
         folder = row.get('folder')
         if folder and folder.get('owner_user_id') != current_user_id:
             row['folder'] = None
@@ -8927,6 +9898,103 @@ def _format_pf_api_error_message(exc: PropertyFinderAPIError):
     return message, request_id, cloudfront, details
 
 
+# ==================== PF CHANGE DETECTION ====================
+
+# PF calls skipped because the relevant payload fields matched the last push.
+PF_AVOIDED_CALL_KINDS = ('listing_update', 'media_validation', 'location_validation')
+
+
+def record_pf_call_avoided(workspace_id, kind):
+    try:
+        _cache_incr(f'pf_calls_avoided:{workspace_id or 0}:{kind}')
+    except Exception as e:
+        print(f"[PF] Failed to record avoided call (workspace_id={workspace_id}): {e}")
+
+
+def get_pf_calls_avoided(workspace_id):
+    """{kind: count} of PF calls skipped by change detection (since cache start)."""
+    counts = {kind: int(cache.get(f'pf_calls_avoided:{workspace_id or 0}:{kind}') or 0) for kind in PF_AVOIDED_CALL_KINDS}
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+@app.route('/api/pf/avoided-calls', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_pf_avoided_calls():
+    """PF calls skipped by payload change detection in the current workspace"""
+    return jsonify({'success': True, 'avoided_calls': get_pf_calls_avoided(get_active_workspace_id())})
+
+
+def _sync_existing_pf_listing(local_listing, client):
+    """Push local edits to an existing PF listing, skipping unchanged payloads.
+
+    Media and location are only re-validated when their payload fields
+    changed. A listing with no recorded hashes is pushed once so PF is
+    known to match.
+    """
+    ws_id = local_listing.workspace_id
+    ok, error = resolve_assigned_agent_id(local_listing, client)
+    if not ok:
+        return {'success': False, 'status_code': 400, 'error': error, 'redirect_to': 'edit'}
+
+    listing_data = local_listing.to_pf_format()
+    changed_fields = local_listing.pf_changed_fields(listing_data)
+    if changed_fields == []:
+        record_pf_call_avoided(ws_id, 'listing_update')
+        print(f"[PF] Listing {local_listing.id} unchanged since last push; skipped PF update")
+        return {'success': True, 'pushed': False, 'changed_fields': [], 'warnings': []}
+
+    if changed_fields is None or 'location' in changed_fields:
+        ok, error = validate_location_id(local_listing, client)
+        if not ok:
+            return {'success': False, 'status_code': 400, 'error': error, 'redirect_to': 'edit'}
+    else:
+        record_pf_call_avoided(ws_id, 'location_validation')
+
+    warnings = []
+    if changed_fields is None or 'media' in changed_fields:
+        ok, error, failed_urls, warnings = validate_media_urls(listing_data)
+        if not ok:
+            return {
+                'success': False,
+                'status_code': 400,
+                'error': error,
+                'details': failed_urls,
+                'redirect_to': 'edit',
+                'warnings': warnings
+            }
+    else:
+        record_pf_call_avoided(ws_id, 'media_validation')
+
+    try:
+        # The PF client only offers full replacement (PUT), so changed fields are sent with the rest.
+        client.update_listing(local_listing.pf_listing_id, listing_data)
+    except PropertyFinderAPIError as e:
+        msg, request_id, cloudfront, details = _format_pf_api_error_message(e)
+        return {
+            'success': False,
+            'status_code': e.status_code or 400,
+            'error': f"Failed to update listing on PropertyFinder: {msg}",
+            'request_id': request_id,
+            'cloudfront': cloudfront,
+            'details': details,
+            'redirect_to': 'view',
+            'warnings': warnings
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'status_code': 400,
+            'error': f"Failed to update listing on PropertyFinder: {str(e)}",
+            'redirect_to': 'view',
+            'warnings': warnings
+        }
+    local_listing.remember_pf_payload(listing_data)
+    db.session.commit()
+    return {'success': True, 'pushed': True, 'changed_fields': changed_fields, 'warnings': warnings}
+
+
 def _publish_local_listing_to_pf(local_listing, client):
     """
     Create (if needed) and publish a local listing on PropertyFinder.
@@ -8940,12 +10008,20 @@ def _publish_local_listing_to_pf(local_listing, client):
             pf_listing = _normalize_pf_listing(client.get_listing(local_listing.pf_listing_id))
             if not pf_listing or not pf_listing.get('id'):
                 local_listing.pf_listing_id = None
+                local_listing.remember_pf_payload(None)
                 db.session.commit()
         except Exception:
             local_listing.pf_listing_id = None
+            local_listing.remember_pf_payload(None)
             db.session.commit()
 
-    if not local_listing.pf_listing_id:
+    pf_sync = None
+    if local_listing.pf_listing_id:
+        pf_sync = _sync_existing_pf_listing(local_listing, client)
+        if not pf_sync.get('success'):
+            return pf_sync
+        media_warnings.extend(pf_sync.get('warnings') or [])
+    else:
         ok, error = resolve_assigned_agent_id(local_listing, client)
         if not ok:
             return {
@@ -9018,6 +10094,7 @@ def _publish_local_listing_to_pf(local_listing, client):
                     'warnings': media_warnings
                 }
             local_listing.pf_listing_id = str(pf_id)
+            local_listing.remember_pf_payload(listing_data)
             db.session.commit()
         except PropertyFinderAPIError as e:
             if _is_pf_reference_in_use_error(e) and local_listing.reference:
@@ -9036,6 +10113,8 @@ def _publish_local_listing_to_pf(local_listing, client):
                     db.session.commit()
                     try:
                         client.update_listing(existing_pf_id, listing_data)
+                        local_listing.remember_pf_payload(listing_data)
+                        db.session.commit()
                         media_warnings.append(
                             f'Reference "{local_listing.reference}" already existed on PropertyFinder '
                             f'(ID {existing_pf_id}); updated existing listing instead of creating a new one.'
@@ -9144,6 +10223,8 @@ def _publish_local_listing_to_pf(local_listing, client):
         'pf_listing_id': local_listing.pf_listing_id,
         'pf_state': pf_state,
         'local_status': local_listing.status,
+        'pf_update_skipped': bool(pf_sync and not pf_sync.get('pushed')),
+        'changed_fields': pf_sync.get('changed_fields') if pf_sync else None,
         'warnings': media_warnings
     }
 
@@ -9190,6 +10271,8 @@ def api_publish_listing(listing_id):
                     'pf_listing_id': publish_outcome.get('pf_listing_id'),
                     'status': publish_outcome.get('local_status'),
                     'pf_state': publish_outcome.get('pf_state'),
+                    'pf_update_skipped': publish_outcome.get('pf_update_skipped', False),
+                    'changed_fields': publish_outcome.get('changed_fields'),
                     'warnings': publish_outcome.get('warnings', [])
                 })
 
@@ -9211,56 +10294,427 @@ def api_publish_listing(listing_id):
     return jsonify({'success': True, 'data': result})
 
 
-@app.route('/api/listings/<listing_id>/unpublish', methods=['POST'])
-@api_error_handler
-@login_required
-@require_active_workspace
-def api_unpublish_listing(listing_id):
-    """API: Unpublish a listing"""
-    ws_id = get_active_workspace_id()
-    client = get_client(workspace_id=ws_id)
-    
-    # Check if this is a local listing ID (integer)
-    try:
-        local_id = int(listing_id)
-        local_listing, visibility_status = get_visible_local_listing_or_status(local_id, workspace_id=ws_id, access='write')
-        if local_listing and local_listing.pf_listing_id:
-            # Use the PF listing ID instead
-            client.unpublish_listing(local_listing.pf_listing_id)
-            pf_state = None
-            try:
-                pf_listing = _normalize_pf_listing(client.get_listing(local_listing.pf_listing_id))
-                pf_state = extract_pf_state_from_listing(pf_listing)
-            except PropertyFinderAPIError:
-                pf_state = None
+# ==================== PUBLISH QUEUE ====================
 
-            new_status = map_pf_state_to_local_status(pf_state) if pf_state else None
-            if new_status and local_listing.status != new_status:
-                local_listing.status = new_status
-                local_listing.updated_at = datetime.utcnow()
-                db.session.commit()
+# Bulk publishes run in the background; jobs and per-listing items live in the
+# database so a restarted worker picks up where the previous one stopped.
+PUBLISH_JOB_MAX_LISTINGS = 500
+try:
+    PUBLISH_QUEUE_CONCURRENCY = max(1, int(os.getenv('PUBLISH_QUEUE_CONCURRENCY', '4')))
+except (TypeError, ValueError):
+    PUBLISH_QUEUE_CONCURRENCY = 4
+PUBLISH_ITEM_MAX_ATTEMPTS = 3
+# Transient failures (429/5xx) wait 30s, then 60s, ... before the next attempt.
+PUBLISH_ITEM_RETRY_BASE_SECONDS = 30
+# A running item untouched this long belongs to a dead worker and is requeued.
+PUBLISH_ITEM_STALE_SECONDS = 10 * 60
+PUBLISH_QUEUE_SWEEP_SECONDS = 60
+
+_publish_jobs_running = set()
+_publish_jobs_lock = threading.Lock()
+
+
+def schedule_publish_job(job_id):
+    """Hand a publish job to the background scheduler."""
+    loop_scheduler.add_job(
+        run_publish_job,
+        args=[job_id],
+        id=f'publish_job_{job_id}',
+        name=f'Publish job {job_id}',
+        replace_existing=True
+    )
 
-            return jsonify({
-                'success': True,
-                'pf_state': pf_state,
-                'status': local_listing.status,
-                'message': 'Unpublish request submitted'
-            })
-        if local_listing and not local_listing.pf_listing_id:
-            return jsonify({'success': False, 'error': 'Listing is not synced to PropertyFinder'}), 400
-        if visibility_status == 'hidden':
-            return jsonify({'success': False, 'error': 'Listing not found'}), 404
-    except (ValueError, TypeError):
-        pass
-    
-    result = client.unpublish_listing(listing_id)
-    return jsonify({'success': True, 'data': result})
 
+def enqueue_publish_job(workspace_id, user_id, listing_ids):
+    """Persist a publish job with one queued item per listing and schedule it."""
+    job = PublishJob(
+        workspace_id=workspace_id,
+        created_by_id=user_id,
+        status=PublishJob.STATUS_QUEUED,
+        total=len(listing_ids)
+    )
+    db.session.add(job)
+    db.session.flush()
+    db.session.execute(PublishJobItem.__table__.insert(), [
+        {'job_id': job.id, 'listing_id': listing_id, 'status': PublishJobItem.STATUS_QUEUED, 'attempts': 0}
+        for listing_id in listing_ids
+    ])
+    db.session.commit()
+    schedule_publish_job(job.id)
+    return job
+
+
+def publish_job_counts(job_ids):
+    """{job_id: {item_status: count}} for the given jobs (one GROUP BY)."""
+    counts = {job_id: {} for job_id in job_ids}
+    if not job_ids:
+        return counts
+    rows = db.session.query(
+        PublishJobItem.job_id,
+        PublishJobItem.status,
+        db.func.count(PublishJobItem.id)
+    ).filter(PublishJobItem.job_id.in_(job_ids)).group_by(PublishJobItem.job_id, PublishJobItem.status).all()
+    for job_id, status, count in rows:
+        counts[job_id][status] = int(count)
+    return counts
+
+
+def _claim_publish_job_item(job_id):
+    """Atomically move the next ready queued item of a job to running.
+
+    Returns None when no item is ready; items waiting out a retry backoff
+    are picked up by a later run of the job (see recover_publish_jobs).
+    """
+    items = PublishJobItem.__table__
+    while True:
+        row = db.session.query(PublishJobItem.id, PublishJobItem.listing_id).filter(
+            PublishJobItem.job_id == job_id,
+            PublishJobItem.status == PublishJobItem.STATUS_QUEUED,
+            db.or_(PublishJobItem.next_attempt_at == None, PublishJobItem.next_attempt_at <= datetime.utcnow())
+        ).order_by(PublishJobItem.id).first()
+        if not row:
+            return None
+        claimed = db.session.execute(
+            items.update()
+            .where(items.c.id == row.id, items.c.status == PublishJobItem.STATUS_QUEUED)
+            .values(
+                status=PublishJobItem.STATUS_RUNNING,
+                attempts=items.c.attempts + 1,
+                started_at=datetime.utcnow(),
+                finished_at=None,
+                next_attempt_at=None
+            )
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(PublishJobItem, row.id)
 
-@app.route('/api/bulk/upload', methods=['POST'])
-@api_error_handler
-@login_required
-@require_active_workspace
+
+def _is_transient_publish_failure(outcome):
+    status_code = outcome.get('status_code') or 0
+    return status_code == 429 or status_code >= 500
+
+
+def _process_publish_job_item(item, workspace_id, client):
+    """Publish one item's listing and record the outcome on the item."""
+    outcome = None
+    try:
+        listing = scope_query(LocalListing.query, workspace_id).filter_by(id=item.listing_id).first()
+        if not listing:
+            outcome = {'success': False, 'status_code': 404, 'error': 'Listing not found'}
+        else:
+            outcome = _publish_local_listing_to_pf(listing, client)
+    except Exception as e:
+        db.session.rollback()
+        outcome = {'success': False, 'status_code': 500, 'error': f'Failed to publish listing: {e}'}
+
+    item = db.session.get(PublishJobItem, item.id)
+    warnings = outcome.get('warnings') or []
+    item.warnings = json.dumps(warnings) if warnings else None
+    if outcome.get('success'):
+        item.status = PublishJobItem.STATUS_SUCCEEDED
+        item.error = None
+        item.pf_listing_id = outcome.get('pf_listing_id')
+        item.local_status = outcome.get('local_status')
+    elif _is_transient_publish_failure(outcome) and (item.attempts or 0) < PUBLISH_ITEM_MAX_ATTEMPTS:
+        item.status = PublishJobItem.STATUS_QUEUED
+        item.error = outcome.get('error')
+        backoff = PUBLISH_ITEM_RETRY_BASE_SECONDS * 2 ** max((item.attempts or 1) - 1, 0)
+        item.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff)
+    else:
+        item.status = PublishJobItem.STATUS_FAILED
+        item.error = outcome.get('error') or 'Failed to publish listing'
+    if item.status != PublishJobItem.STATUS_QUEUED:
+        item.finished_at = datetime.utcnow()
+    db.session.commit()
+    return item.status
+
+
+def _publish_job_worker(job_id, workspace_id):
+    """Worker thread: claim and publish items until the job is drained or cancelled."""
+    with app.app_context():
+        try:
+            client = get_client(workspace_id=workspace_id)
+            while True:
+                status = db.session.query(PublishJob.status).filter_by(id=job_id).scalar()
+                if status not in PublishJob.ACTIVE_STATUSES:
+                    return
+                item = _claim_publish_job_item(job_id)
+                if item is None:
+                    return
+                _process_publish_job_item(item, workspace_id, client)
+        except Exception as e:
+            db.session.rollback()
+            print(f"[PF] Publish job {job_id} worker error: {e}")
+        finally:
+            db.session.remove()
+
+
+def run_publish_job(job_id):
+    """Background job: publish every queued item of a job with bounded concurrency.
+
+    PF calls from all workers share the per-key rate limiter in the PF client.
+    """
+    with _publish_jobs_lock:
+        if job_id in _publish_jobs_running:
+            return
+        _publish_jobs_running.add(job_id)
+    try:
+        with app.app_context():
+            try:
+                job = db.session.get(PublishJob, job_id)
+                if not job or job.status not in PublishJob.ACTIVE_STATUSES:
+                    return
+                workspace_id = job.workspace_id
+                if job.status != PublishJob.STATUS_RUNNING:
+                    job.status = PublishJob.STATUS_RUNNING
+                    job.started_at = job.started_at or datetime.utcnow()
+                    db.session.commit()
+                queued = PublishJobItem.query.filter_by(job_id=job_id, status=PublishJobItem.STATUS_QUEUED).count()
+                db.session.remove()
+
+                if queued:
+                    from concurrent.futures import ThreadPoolExecutor
+                    workers = min(PUBLISH_QUEUE_CONCURRENCY, queued)
+                    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'publish-job-{job_id}') as executor:
+                        for _ in range(workers):
+                            executor.submit(_publish_job_worker, job_id, workspace_id)
+
+                job = db.session.get(PublishJob, job_id)
+                counts = publish_job_counts([job_id])[job_id]
+                unfinished = counts.get(PublishJobItem.STATUS_QUEUED, 0) + counts.get(PublishJobItem.STATUS_RUNNING, 0)
+                if job and job.status == PublishJob.STATUS_RUNNING and not unfinished:
+                    job.status = PublishJob.STATUS_COMPLETED
+                    job.finished_at = datetime.utcnow()
+                    db.session.commit()
+                print(f"[PF] Publish job {job_id} (workspace_id={workspace_id}): {counts}")
+            except Exception as e:
+                db.session.rollback()
+                print(f"[PF] Publish job {job_id} failed: {e}")
+            finally:
+                db.session.remove()
+    finally:
+        with _publish_jobs_lock:
+            _publish_jobs_running.discard(job_id)
+
+
+def recover_publish_jobs():
+    """Requeue items orphaned by a dead worker and reschedule unfinished jobs."""
+    with app.app_context():
+        try:
+            items = PublishJobItem.__table__
+            now = datetime.utcnow()
+            cutoff = now - timedelta(seconds=PUBLISH_ITEM_STALE_SECONDS)
+            # An item that already used every attempt (e.g. it keeps killing or hanging
+            # its worker) is failed rather than requeued again.
+            abandoned = db.session.execute(
+                items.update()
+                .where(
+                    items.c.status == PublishJobItem.STATUS_RUNNING,
+                    items.c.started_at < cutoff,
+                    items.c.attempts >= PUBLISH_ITEM_MAX_ATTEMPTS
+                )
+                .values(
+                    status=PublishJobItem.STATUS_FAILED,
+                    error='Publishing did not finish after repeated attempts',
+                    finished_at=now
+                )
+            ).rowcount
+            requeued = db.session.execute(
+                items.update()
+                .where(items.c.status == PublishJobItem.STATUS_RUNNING, items.c.started_at < cutoff)
+                .values(status=PublishJobItem.STATUS_QUEUED)
+            ).rowcount
+            db.session.commit()
+            if abandoned:
+                print(f"[PF] Failed {abandoned} stale publish item(s) out of attempts")
+            if requeued:
+                print(f"[PF] Requeued {requeued} stale publish item(s)")
+
+            job_ids = [job_id for (job_id,) in db.session.query(PublishJob.id).filter(
+                PublishJob.status.in_(PublishJob.ACTIVE_STATUSES)
+            ).all()]
+            with _publish_jobs_lock:
+                idle = [job_id for job_id in job_ids if job_id not in _publish_jobs_running]
+            for job_id in idle:
+                schedule_publish_job(job_id)
+        except Exception as e:
+            db.session.rollback()
+            print(f"[PF] Publish queue recovery failed: {e}")
+        finally:
+            db.session.remove()
+
+
+register_leader_job(
+    'publish_queue_recovery',
+    func=recover_publish_jobs,
+    trigger=IntervalTrigger(seconds=PUBLISH_QUEUE_SWEEP_SECONDS),
+    name='Resume unfinished publish jobs',
+    next_run_time=datetime.now()
+)
+
+
+def _get_publish_job_or_none(job_id):
+    job = db.session.get(PublishJob, job_id)
+    if not job or job.workspace_id != get_active_workspace_id():
+        return None
+    if job.created_by_id != g.user.id and not is_system_admin(g.user):
+        return None
+    return job
+
+
+@app.route('/api/listings/publish/bulk', methods=['POST'])
+@api_error_handler
+@login_required
+@require_active_workspace
+def api_bulk_publish_listings():
+    """API: Queue many local listings for background publishing"""
+    ws_id = get_active_workspace_id()
+    data = request.get_json(silent=True) or {}
+    raw_ids = data.get('listing_ids')
+    if not isinstance(raw_ids, list) or not raw_ids:
+        return jsonify({'success': False, 'error': 'listing_ids must be a non-empty array'}), 400
+
+    listing_ids = []
+    for raw in raw_ids:
+        try:
+            listing_id = int(raw)
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': f'Invalid listing id: {raw}'}), 400
+        if listing_id not in listing_ids:
+            listing_ids.append(listing_id)
+    if len(listing_ids) > PUBLISH_JOB_MAX_LISTINGS:
+        return jsonify({
+            'success': False,
+            'error': f'At most {PUBLISH_JOB_MAX_LISTINGS} listings can be published per job'
+        }), 400
+
+    visible_ids = {
+        listing_id for (listing_id,) in visible_local_listing_query(ws_id, access='write')
+        .filter(LocalListing.id.in_(listing_ids))
+        .with_entities(LocalListing.id)
+        .all()
+    }
+    not_found = [listing_id for listing_id in listing_ids if listing_id not in visible_ids]
+    queued_ids = [listing_id for listing_id in listing_ids if listing_id in visible_ids]
+    if not queued_ids:
+        return jsonify({'success': False, 'error': 'No publishable listings found', 'not_found': not_found}), 404
+
+    job = enqueue_publish_job(ws_id, g.user.id, queued_ids)
+    return jsonify({
+        'success': True,
+        'job': job.to_dict(counts={PublishJobItem.STATUS_QUEUED: len(queued_ids)}),
+        'not_found': not_found
+    }), 202
+
+
+@app.route('/api/listings/publish/jobs', methods=['GET'])
+@api_error_handler
+@login_required
+@require_active_workspace
+def api_list_publish_jobs():
+    """API: Recent publish jobs started by the current user"""
+    ws_id = get_active_workspace_id()
+    limit = min(max(request.args.get('limit', 20, type=int) or 20, 1), 100)
+    jobs = PublishJob.query.filter_by(workspace_id=ws_id, created_by_id=g.user.id).order_by(
+        PublishJob.created_at.desc(), PublishJob.id.desc()
+    ).limit(limit).all()
+    counts = publish_job_counts([job.id for job in jobs])
+    return jsonify({'success': True, 'jobs': [job.to_dict(counts=counts[job.id]) for job in jobs]})
+
+
+@app.route('/api/listings/publish/jobs/<int:job_id>', methods=['GET'])
+@api_error_handler
+@login_required
+@require_active_workspace
+def api_get_publish_job(job_id):
+    """API: Status of a publish job with per-listing results"""
+    job = _get_publish_job_or_none(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Publish job not found'}), 404
+    items = job.items.order_by(PublishJobItem.id)
+    status_filter = (request.args.get('status') or '').strip().lower()
+    if status_filter:
+        items = items.filter(PublishJobItem.status == status_filter)
+    return jsonify({
+        'success': True,
+        'job': job.to_dict(counts=publish_job_counts([job.id])[job.id]),
+        'items': [item.to_dict() for item in items.all()]
+    })
+
+
+@app.route('/api/listings/publish/jobs/<int:job_id>/cancel', methods=['POST'])
+@api_error_handler
+@login_required
+@require_active_workspace
+def api_cancel_publish_job(job_id):
+    """API: Cancel the not-yet-started listings of a publish job"""
+    job = _get_publish_job_or_none(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Publish job not found'}), 404
+    if job.status in PublishJob.ACTIVE_STATUSES:
+        items = PublishJobItem.__table__
+        db.session.execute(
+            items.update()
+            .where(items.c.job_id == job.id, items.c.status == PublishJobItem.STATUS_QUEUED)
+            .values(status=PublishJobItem.STATUS_CANCELLED, finished_at=datetime.utcnow())
+        )
+        job.status = PublishJob.STATUS_CANCELLED
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+    return jsonify({'success': True, 'job': job.to_dict(counts=publish_job_counts([job.id])[job.id])})
+
+
+@app.route('/api/listings/<listing_id>/unpublish', methods=['POST'])
+@api_error_handler
+@login_required
+@require_active_workspace
+def api_unpublish_listing(listing_id):
+    """API: Unpublish a listing"""
+    ws_id = get_active_workspace_id()
+    client = get_client(workspace_id=ws_id)
+    
+    # Check if this is a local listing ID (integer)
+    try:
+        local_id = int(listing_id)
+        local_listing, visibility_status = get_visible_local_listing_or_status(local_id, workspace_id=ws_id, access='write')
+        if local_listing and local_listing.pf_listing_id:
+            # Use the PF listing ID instead
+            client.unpublish_listing(local_listing.pf_listing_id)
+            pf_state = None
+            try:
+                pf_listing = _normalize_pf_listing(client.get_listing(local_listing.pf_listing_id))
+                pf_state = extract_pf_state_from_listing(pf_listing)
+            except PropertyFinderAPIError:
+                pf_state = None
+
+            new_status = map_pf_state_to_local_status(pf_state) if pf_state else None
+            if new_status and local_listing.status != new_status:
+                local_listing.status = new_status
+                local_listing.updated_at = datetime.utcnow()
+                db.session.commit()
+
+            return jsonify({
+                'success': True,
+                'pf_state': pf_state,
+                'status': local_listing.status,
+                'message': 'Unpublish request submitted'
+            })
+        if local_listing and not local_listing.pf_listing_id:
+            return jsonify({'success': False, 'error': 'Listing is not synced to PropertyFinder'}), 400
+        if visibility_status == 'hidden':
+            return jsonify({'success': False, 'error': 'Listing not found'}), 404
+    except (ValueError, TypeError):
+        pass
+    
+    result = client.unpublish_listing(listing_id)
+    return jsonify({'success': True, 'data': result})
+
+
+@app.route('/api/bulk/upload', methods=['POST'])
+@api_error_handler
+@login_required
+@require_active_workspace
 def api_bulk_upload():
     """API: Bulk upload listings from file"""
     if 'file' not in request.files:
@@ -9663,6 +11117,7 @@ def create_listing_form():
     
     db.session.add(local_listing)
     db.session.commit()
+    bump_listing_counts_version(ws_id)
 
     if action == 'publish':
         client = get_client(workspace_id=ws_id)
@@ -9769,6 +11224,7 @@ def update_listing_form(listing_id):
             local_listing.developer = form.get('developer')
             
             db.session.commit()
+            bump_listing_counts_version(ws_id)
 
             if action == 'publish':
                 client = get_client(workspace_id=ws_id)
@@ -9894,6 +11350,7 @@ def duplicate_listing(listing_id):
         
         db.session.add(new_listing)
         db.session.commit()
+        bump_listing_counts_version(new_listing.workspace_id)
         
         flash(f'Listing duplicated successfully! New reference: {new_listing.reference}', 'success')
         return redirect(url_for('edit_listing', listing_id=new_listing.id))
@@ -9988,6 +11445,7 @@ def send_to_pf_draft(listing_id):
             
             local_listing.pf_listing_id = str(pf_listing_id)
             local_listing.status = 'pf_draft'  # On PF as draft
+            local_listing.remember_pf_payload(listing_data)
             db.session.commit()
             
             flash(f'Listing sent to PropertyFinder as draft! PF ID: {pf_listing_id}', 'success')
@@ -10240,21 +11698,24 @@ def build_listing_from_form(form):
 @login_required
 @require_active_workspace
 def api_local_get_listings():
-    """Get all local listings"""
+    """Get all local listings (`compact=1` omits descriptions and original images)"""
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 25, type=int)
     status = request.args.get('status')
+    compact = str(request.args.get('compact', '')).lower() in ('1', 'true', 'yes')
     
     ws_id = get_active_workspace_id()
     query = visible_local_listing_query(ws_id)
     if status:
         query = query.filter_by(status=status)
+    if compact:
+        query = query.options(*LocalListing.collection_load_options())
     
     query = query.order_by(LocalListing.updated_at.desc())
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     
     return jsonify({
-        'data': [l.to_dict() for l in pagination.items],
+        'data': LocalListing.to_dict_collection(pagination.items, include_heavy_fields=not compact),
         'meta': {
             'current_page': pagination.page,
             'last_page': pagination.pages,
@@ -10334,6 +11795,7 @@ def api_local_update_listing(listing_id):
     
     listing.updated_at = datetime.utcnow()
     db.session.commit()
+    bump_listing_counts_version(ws_id)
     
     return jsonify({'success': True, 'data': listing.to_dict()})
 
@@ -10347,6 +11809,7 @@ def api_local_delete_listing(listing_id):
     listing = visible_local_listing_query(ws_id, access='write').filter_by(id=listing_id).first_or_404()
     db.session.delete(listing)
     db.session.commit()
+    bump_listing_counts_version(ws_id)
 
     # Remove listing image folder (including originals)
     try:
@@ -10409,6 +11872,130 @@ def api_local_sync_pf_status(listing_id):
         return jsonify({'success': True, 'pf_state': pf_state, 'status': listing.status, 'message': msg})
 
 
+LOCAL_BULK_CREATE_MAX_ROWS = 10000
+LOCAL_BULK_CREATE_CHUNK_SIZE = 500
+
+
+def _local_listing_insert_values(listing):
+    """Column values set on an unsaved LocalListing, for a Core bulk INSERT.
+
+    Unset columns are left out so their defaults apply; derived columns
+    (search_document, image_count, cover_image) were filled by the model
+    validators when the object was built.
+    """
+    values = {}
+    for prop in db.inspect(LocalListing).column_attrs:
+        value = getattr(listing, prop.key)
+        if value is not None:
+            values[prop.columns[0].key] = value
+    return values
+
+
+def create_local_listings_batch(items, workspace_id, actor_user, can_manage_all):
+    """Validate and insert many listings in one transaction.
+
+    All rows are validated first; references are checked with one IN query
+    per chunk and assignees come from a preloaded member map. Valid rows are
+    written LOCAL_BULK_CREATE_CHUNK_SIZE at a time with executemany INSERTs
+    and committed together. Returns (created_ids, errors).
+    """
+    members = _workspace_member_lookup(workspace_id)
+    default_agent_email = get_default_assigned_agent_email(workspace_id=workspace_id, user=actor_user)
+
+    errors = []
+    prepared = []
+    seen_references = set()
+    for idx, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': idx, 'error': 'Listing must be an object', 'reference': None})
+            continue
+        reference = str(item.get('reference') or '').strip()
+        if not reference:
+            errors.append({'index': idx, 'error': 'Reference is required.', 'reference': None,
+                           'details': {'reference': 'This field is required.'}})
+            continue
+        if reference in seen_references:
+            errors.append({'index': idx, 'error': 'Duplicate reference in this request.', 'reference': reference})
+            continue
+        seen_references.add(reference)
+        prepared.append((idx, reference, {**item, 'reference': reference}))
+
+    valid = []
+    for start in range(0, len(prepared), LOCAL_BULK_CREATE_CHUNK_SIZE):
+        chunk = prepared[start:start + LOCAL_BULK_CREATE_CHUNK_SIZE]
+        existing = {
+            reference: ws_id
+            for reference, ws_id in db.session.query(LocalListing.reference, LocalListing.workspace_id)
+            .filter(LocalListing.reference.in_([reference for _idx, reference, _item in chunk]))
+        }
+        for idx, reference, item in chunk:
+            if reference in existing:
+                message = (
+                    'Reference already exists in this workspace.'
+                    if existing[reference] == workspace_id else 'Reference already exists.'
+                )
+                errors.append({'index': idx, 'error': message, 'reference': reference})
+                continue
+            try:
+                listing, build_error = _build_local_listing_record(
+                    item, workspace_id,
+                    actor_user=actor_user,
+                    can_manage_all=can_manage_all,
+                    members=members,
+                    default_agent_email=default_agent_email
+                )
+            except Exception as e:
+                errors.append({'index': idx, 'error': str(e), 'reference': reference})
+                continue
+            if build_error:
+                _error_code, message, _status_code, details = build_error
+                error_entry = {'index': idx, 'error': message, 'reference': reference}
+                if details:
+                    error_entry['details'] = details
+                errors.append(error_entry)
+                continue
+            valid.append((idx, _local_listing_insert_values(listing)))
+
+    table = LocalListing.__table__
+    for attempt in range(2):
+        created_ids = []
+        try:
+            for start in range(0, len(valid), LOCAL_BULK_CREATE_CHUNK_SIZE):
+                chunk = valid[start:start + LOCAL_BULK_CREATE_CHUNK_SIZE]
+                # executemany needs one key set per statement; CSV-mapped rows normally share one.
+                rows_by_keys = {}
+                for _idx, values in chunk:
+                    rows_by_keys.setdefault(frozenset(values), []).append(values)
+                for rows in rows_by_keys.values():
+                    db.session.execute(table.insert(), rows)
+                ids_by_reference = dict(
+                    db.session.query(LocalListing.reference, LocalListing.id)
+                    .filter(LocalListing.reference.in_([values['reference'] for _idx, values in chunk]))
+                )
+                created_ids.extend(ids_by_reference[values['reference']] for _idx, values in chunk)
+            db.session.commit()
+            break
+        except IntegrityError:
+            # A concurrent writer took some references after the check; drop those and retry once.
+            db.session.rollback()
+            taken = {
+                reference for (reference,) in db.session.query(LocalListing.reference)
+                .filter(LocalListing.reference.in_([values['reference'] for _idx, values in valid]))
+            }
+            if attempt or not taken:
+                raise
+            errors.extend(
+                {'index': idx, 'error': 'Reference already exists.', 'reference': values['reference']}
+                for idx, values in valid if values['reference'] in taken
+            )
+            valid = [(idx, values) for idx, values in valid if values['reference'] not in taken]
+
+    if created_ids:
+        bump_listing_counts_version(workspace_id)
+    errors.sort(key=lambda error: error['index'])
+    return created_ids, errors
+
+
 @app.route('/api/local/listings/bulk', methods=['POST'])
 @login_required
 @require_active_workspace
@@ -10421,38 +12008,18 @@ def api_local_bulk_create():
 
     if not isinstance(listings_data, list):
         return jsonify({'success': False, 'error': 'listings must be a list'}), 400
-    
-    created = []
-    errors = []
-    
-    for idx, item in enumerate(listings_data):
-        try:
-            listing, create_error = _create_local_listing_record(
-                data=item or {},
-                workspace_id=ws_id,
-                actor_user=g.user,
-                can_manage_all=can_manage_all,
-                force_draft=False
-            )
-            if create_error:
-                _error_code, message, _status_code, details = create_error
-                error_entry = {
-                    'index': idx,
-                    'error': message,
-                    'reference': (item or {}).get('reference')
-                }
-                if details:
-                    error_entry['details'] = details
-                errors.append(error_entry)
-                continue
-            created.append(listing.to_dict())
-        except Exception as e:
-            ref = item.get('reference') if isinstance(item, dict) else None
-            errors.append({'index': idx, 'error': str(e), 'reference': ref})
-    
+    if len(listings_data) > LOCAL_BULK_CREATE_MAX_ROWS:
+        return jsonify({
+            'success': False,
+            'error': f'At most {LOCAL_BULK_CREATE_MAX_ROWS} listings can be created per request'
+        }), 400
+
+    created_ids, errors = create_local_listings_batch(listings_data, ws_id, g.user, can_manage_all)
+
     return jsonify({
         'success': True,
-        'created': len(created),
+        'created': len(created_ids),
+        'created_ids': created_ids,
         'errors': len(errors),
         'error_details': errors
     })
@@ -10496,6 +12063,7 @@ def api_local_bulk_update():
         updated += 1
 
     db.session.commit()
+    bump_listing_counts_version(ws_id)
     return jsonify({
         'success': True,
         'updated': updated,
@@ -10508,85 +12076,429 @@ def api_local_bulk_update():
 @require_active_workspace
 def api_local_stats():
     """Get local listings statistics"""
-    ws_id = get_active_workspace_id()
-    base_query = visible_local_listing_query(ws_id)
-    total = base_query.count()
-    published = base_query.filter_by(status='published').count()
-    draft = base_query.filter_by(status='draft').count()
-    
-    for_sale = base_query.filter_by(offering_type='sale').count()
-    for_rent = base_query.filter_by(offering_type='rent').count()
-    
-    return jsonify({
-        'total': total,
-        'published': published,
-        'draft': draft,
-        'for_sale': for_sale,
-        'for_rent': for_rent
-    })
+    return jsonify(visible_listing_stats(get_active_workspace_id()))
 
 
-# ==================== PF AUTHENTICATION ====================
 
-@app.route('/auth')
-@login_required
-@permission_required('settings')
-@require_active_workspace
-def auth_page():
-    """PropertyFinder authentication page"""
-    ws = get_active_workspace()
-    if ws:
-        return redirect(url_for('workspace_auth', workspace_slug=ws.slug))
-    pf_session = PFSession.query.first()
-    return render_template('auth.html', session=pf_session)
+# ==================== LISTING EXPORT / IMPORT ====================
 
+LISTING_TRANSFER_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+LISTING_TRANSFER_BATCH_SIZE = 1000
+LISTING_IMPORT_CONFLICT_MODES = ('skip', 'update')
+LISTING_IMPORT_MAX_ERRORS = 100
+# Exports of large workspaces exceed the app-wide 50MB upload limit.
+LISTING_IMPORT_MAX_BYTES = 1024 * 1024 * 1024
+# Plain LocalListing columns carried as-is; images/original_images/amenities,
+# the assignee and the folder are exported in portable form (URLs, email, name).
+LISTING_TRANSFER_COLUMNS = (
+    'reference', 'status', 'emirate', 'city', 'location', 'location_id', 'category',
+    'offering_type', 'property_type', 'bedrooms', 'bathrooms', 'size', 'furnishing_type',
+    'project_status', 'parking_slots', 'floor_number', 'unit_number', 'price', 'downpayment',
+    'rent_frequency', 'title_en', 'title_ar', 'description_en', 'description_ar',
+    'video_tour', 'video_360', 'assigned_agent', 'owner_id', 'owner_name', 'developer',
+    'permit_number', 'available_from', 'pf_listing_id', 'created_at', 'updated_at',
+)
+LISTING_TRANSFER_LIST_FIELDS = ('images', 'original_images', 'amenities')
+LISTING_EXPORT_COLUMNS = LISTING_TRANSFER_COLUMNS + LISTING_TRANSFER_LIST_FIELDS + ('assigned_to_email', 'folder_name')
+LISTING_IMPORT_INT_FIELDS = ('location_id', 'parking_slots')
+LISTING_IMPORT_FLOAT_FIELDS = ('size', 'price', 'downpayment')
+LISTING_IMPORT_DATETIME_FIELDS = ('created_at',)
+
+
+def build_listing_export_query(workspace_id, user):
+    """Column-only query over the user's visible listings, streamed in id order."""
+    assignee = db.aliased(User)
+    folder = db.aliased(ListingFolder)
+    query = visible_local_listing_query(workspace_id, user=user).outerjoin(
+        assignee, LocalListing.assigned_to_id == assignee.id
+    ).outerjoin(
+        folder, LocalListing.folder_id == folder.id
+    ).with_entities(
+        *[getattr(LocalListing, name).label(name) for name in LISTING_TRANSFER_COLUMNS + LISTING_TRANSFER_LIST_FIELDS],
+        assignee.email.label('assigned_to_email'),
+        folder.name.label('folder_name')
+    ).order_by(LocalListing.id.asc())
+    return query.yield_per(LISTING_TRANSFER_BATCH_SIZE)
+
+
+def _listing_export_values(row):
+    # Row order matches LISTING_EXPORT_COLUMNS (see build_listing_export_query).
+    values = dict(zip(LISTING_EXPORT_COLUMNS, row))
+    for name in ('created_at', 'updated_at'):
+        if values[name] is not None:
+            values[name] = values[name].isoformat()
+    values['images'] = parse_listing_image_urls(values['images'])
+    values['original_images'] = parse_listing_image_urls(values['original_images'])
+    values['amenities'] = [a.strip() for a in (values['amenities'] or '').split(',') if a.strip()]
+    return values
 
-@app.route('/api/auth/save-session', methods=['POST'])
-def save_pf_session():
-    """Save PropertyFinder session cookies from browser"""
-    data = request.get_json()
-    
-    # Get or create session
-    pf_session = PFSession.query.first()
-    if not pf_session:
-        pf_session = PFSession()
-        db.session.add(pf_session)
-    
-    pf_session.cookies = json.dumps(data.get('cookies', {}))
-    pf_session.user_agent = data.get('userAgent')
-    pf_session.logged_in = data.get('loggedIn', False)
-    pf_session.email = data.get('email')
-    pf_session.updated_at = datetime.utcnow()
-    
-    db.session.commit()
-    
-    return jsonify({'success': True, 'message': 'Session saved'})
 
+def iter_export_chunks(rows, columns, export_format, row_values, batch_size, csv_values=None, stats=None):
+    """Encode streamed rows as CSV/NDJSON text, one chunk per `batch_size` rows.
 
-@app.route('/api/auth/status', methods=['GET'])
-def auth_status():
-    """Check authentication status"""
-    pf_session = PFSession.query.first()
-    
-    if pf_session and pf_session.logged_in:
-        return jsonify({
-            'authenticated': True,
-            'email': pf_session.email,
-            'updated_at': pf_session.updated_at.isoformat() if pf_session.updated_at else None
-        })
-    
-    return jsonify({'authenticated': False})
+    `row_values(row)` returns a JSON-ready {column: value} dict; `csv_values`
+    may flatten it further for CSV. `stats['rows']` counts encoded rows.
+    """
+    import csv
+    import io
 
+    buffer = io.StringIO()
+    writer = None
+    if export_format == 'csv':
+        buffer.write('\ufeff')  # BOM so spreadsheet apps read Arabic text as UTF-8
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        values = row_values(row)
+        if writer is not None:
+            if csv_values is not None:
+                values = csv_values(values)
+            writer.writerow(['' if values[name] is None else values[name] for name in columns])
+        else:
+            buffer.write(json.dumps(values, ensure_ascii=False))
+            buffer.write('\n')
+        if stats is not None:
+            stats['rows'] = stats.get('rows', 0) + 1
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _listing_export_csv_values(values):
+    values['images'] = '|'.join(values['images'])
+    values['original_images'] = '|'.join(values['original_images'])
+    values['amenities'] = ','.join(values['amenities'])
+    return values
 
-@app.route('/api/auth/logout', methods=['POST'])
-def auth_logout():
-    """Clear saved session"""
-    PFSession.query.delete()
-    db.session.commit()
-    return jsonify({'success': True})
 
+def iter_listing_export_chunks(query, export_format):
+    """Encode streamed listing rows as CSV/NDJSON, one chunk per batch.
 
-# ==================== CRM: LEADS ====================
+    CSV joins images/original_images with '|' and amenities with ','.
+    """
+    return iter_export_chunks(
+        query, LISTING_EXPORT_COLUMNS, export_format, _listing_export_values,
+        LISTING_TRANSFER_BATCH_SIZE, csv_values=_listing_export_csv_values
+    )
+
+
+def iter_listing_import_records(stream, import_format):
+    """Yield (line_number, dict) from an uploaded CSV/NDJSON byte stream without reading it whole."""
+    import csv
+    import io
+
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if import_format == 'csv':
+        reader = csv.DictReader(text_stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(text_stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None
+            continue
+        yield line_number, record if isinstance(record, dict) else None
+
+
+def _listing_list_value(value, separator):
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if item and str(item).strip()]
+    return [item.strip() for item in str(value or '').split(separator) if item.strip()]
+
+
+def normalize_listing_import_record(record, assignee_ids_by_email, folder_ids_by_name):
+    """Map one import record to LocalListing column values. Raises ValueError on bad input."""
+    if not isinstance(record, dict):
+        raise ValueError('row is not a JSON object')
+    reference = str(record.get('reference') or '').strip()
+    if not reference:
+        raise ValueError('reference is required')
+    if len(reference) > 50:
+        raise ValueError('reference is longer than 50 characters')
+
+    values = {}
+    for name in LISTING_TRANSFER_COLUMNS:
+        if name == 'updated_at':
+            continue
+        value = record.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ('', None):
+            values[name] = None
+            continue
+        try:
+            if name in LISTING_IMPORT_INT_FIELDS:
+                value = int(float(value))
+            elif name in LISTING_IMPORT_FLOAT_FIELDS:
+                value = float(value)
+            elif name in LISTING_IMPORT_DATETIME_FIELDS:
+                value = datetime.fromisoformat(str(value))
+            else:
+                value = str(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'{name} is invalid')
+        values[name] = value
+    values['reference'] = reference
+    values['status'] = values.get('status') or 'draft'
+
+    images = _listing_list_value(record.get('images'), '|')
+    original_images = _listing_list_value(record.get('original_images'), '|')
+    amenities = _listing_list_value(record.get('amenities'), ',')
+    values['images'] = json.dumps(images) if images else None
+    values['original_images'] = json.dumps(original_images) if original_images else None
+    values['amenities'] = ','.join(amenities) if amenities else None
+
+    email = str(record.get('assigned_to_email') or '').strip().lower()
+    values['assigned_to_id'] = assignee_ids_by_email.get(email) if email else None
+    folder_name = str(record.get('folder_name') or '').strip()
+    values['folder_id'] = folder_ids_by_name.get(folder_name) if folder_name else None
+    values.update(LocalListing.derived_column_values(values))
+    return values
+
+
+def _apply_listing_import_batch(batch, workspace_id, on_conflict, result):
+    """Insert/update one batch of normalized listings with one lookup and bulk statements."""
+    table = LocalListing.__table__
+    references = [values['reference'] for _line, values in batch]
+    existing = {
+        row.reference: row
+        for row in db.session.query(LocalListing.id, LocalListing.reference, LocalListing.workspace_id)
+        .filter(LocalListing.reference.in_(references))
+    }
+    now = datetime.utcnow()
+    inserts = []
+    updates = []
+    for line_number, values in batch:
+        current = existing.get(values['reference'])
+        if current is None:
+            values['workspace_id'] = workspace_id
+            values['created_at'] = values.get('created_at') or now
+            values['updated_at'] = now
+            values['views'] = 0
+            values['leads'] = 0
+            inserts.append(values)
+        elif current.workspace_id != workspace_id:
+            _record_listing_import_error(result, line_number, 'reference belongs to another workspace', counter='conflicts')
+        elif on_conflict == 'update':
+            values.pop('created_at', None)
+            values['b_id'] = current.id
+            values['updated_at'] = now
+            updates.append(values)
+        else:
+            result['skipped'] += 1
+
+    if inserts:
+        db.session.execute(table.insert(), inserts)
+        result['created'] += len(inserts)
+    if updates:
+        columns = {name: db.bindparam(name) for name in updates[0] if name != 'b_id'}
+        if 'pf_listing_id' in columns:
+            columns['pf_payload_hashes'] = _pf_payload_hashes_after_relink(table, columns['pf_listing_id'])
+        db.session.execute(table.update().where(table.c.id == db.bindparam('b_id')).values(**columns), updates)
+        result['updated'] += len(updates)
+    db.session.commit()
+
+
+def _record_listing_import_error(result, line_number, message, counter='failed'):
+    result[counter] += 1
+    if len(result['errors']) < LISTING_IMPORT_MAX_ERRORS:
+        result['errors'].append({'line': line_number, 'error': message})
+
+
+def import_listing_records(records, workspace_id, user, on_conflict='skip'):
+    """Batched import of (line_number, record) pairs into a workspace.
+
+    Rows are validated as they stream in and written LISTING_TRANSFER_BATCH_SIZE
+    at a time with one reference lookup, one bulk INSERT and one bulk UPDATE per
+    batch. Existing references are skipped or updated per `on_conflict`;
+    references owned by another workspace are always reported as conflicts.
+    """
+    member_rows = db.session.query(User.email, User.id).join(
+        WorkspaceMember, WorkspaceMember.user_id == User.id
+    ).filter(WorkspaceMember.workspace_id == workspace_id).all()
+    assignee_ids_by_email = {(email or '').strip().lower(): user_id for email, user_id in member_rows if email}
+    folder_ids_by_name = {
+        name: folder_id
+        for folder_id, name in visible_folder_query(workspace_id=workspace_id, user=user)
+        .with_entities(ListingFolder.id, ListingFolder.name)
+    }
+
+    result = {'created': 0, 'updated': 0, 'skipped': 0, 'conflicts': 0, 'failed': 0, 'errors': []}
+    batch = []
+    batch_references = set()
+    for line_number, record in records:
+        try:
+            values = normalize_listing_import_record(record, assignee_ids_by_email, folder_ids_by_name)
+        except ValueError as exc:
+            _record_listing_import_error(result, line_number, str(exc))
+            continue
+        if values['reference'] in batch_references:
+            _record_listing_import_error(result, line_number, 'reference repeated in the same batch')
+            continue
+        batch.append((line_number, values))
+        batch_references.add(values['reference'])
+        if len(batch) >= LISTING_TRANSFER_BATCH_SIZE:
+            _apply_listing_import_batch(batch, workspace_id, on_conflict, result)
+            batch = []
+            batch_references = set()
+    if batch:
+        _apply_listing_import_batch(batch, workspace_id, on_conflict, result)
+
+    if result['created'] or result['updated']:
+        bump_listing_counts_version(workspace_id)
+    return result
+
+
+def _listing_transfer_filename(extension):
+    return f"listings-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{extension}"
+
+
+@app.route('/api/local/listings/export', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_export_local_listings():
+    """Stream every visible listing in the workspace as CSV or NDJSON (format=csv|ndjson)"""
+    from flask import Response, stream_with_context
+
+    ws_id = get_active_workspace_id()
+    export_format = (request.args.get('format') or 'ndjson').strip().lower()
+    if export_format not in LISTING_TRANSFER_FORMATS:
+        return jsonify({'success': False, 'error': 'format must be csv or ndjson'}), 400
+
+    mimetype, extension = LISTING_TRANSFER_FORMATS[export_format]
+    query = build_listing_export_query(ws_id, g.user)
+    response = Response(stream_with_context(iter_listing_export_chunks(query, export_format)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{_listing_transfer_filename(extension)}"'
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@app.route('/api/local/listings/import', methods=['POST'])
+@login_required
+@require_active_workspace
+@require_workspace_listing_admin
+def api_import_local_listings():
+    """Import listings from an uploaded export file (multipart `file`).
+
+    Options (form or query): format=csv|ndjson (defaults from the file
+    extension), on_conflict=skip|update for references already in this
+    workspace.
+    """
+    ws_id = get_active_workspace_id()
+    try:
+        request.max_content_length = LISTING_IMPORT_MAX_BYTES  # per-request override (Flask >= 3.1)
+    except AttributeError:
+        pass
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({'success': False, 'error': 'file is required'}), 400
+
+    import_format = str(request.values.get('format') or '').strip().lower()
+    if not import_format:
+        import_format = 'csv' if upload.filename.lower().endswith('.csv') else 'ndjson'
+    if import_format not in LISTING_TRANSFER_FORMATS:
+        return jsonify({'success': False, 'error': 'format must be csv or ndjson'}), 400
+    on_conflict = str(request.values.get('on_conflict') or 'skip').strip().lower()
+    if on_conflict not in LISTING_IMPORT_CONFLICT_MODES:
+        return jsonify({'success': False, 'error': 'on_conflict must be skip or update'}), 400
+
+    try:
+        result = import_listing_records(
+            iter_listing_import_records(upload.stream, import_format),
+            ws_id,
+            g.user,
+            on_conflict=on_conflict
+        )
+    except UnicodeDecodeError:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': 'file must be UTF-8 encoded'}), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"[LISTINGS] Import failed (workspace_id={ws_id}): {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    print(
+        f"[LISTINGS] Import (workspace_id={ws_id}): created={result['created']} updated={result['updated']} "
+        f"skipped={result['skipped']} conflicts={result['conflicts']} failed={result['failed']}"
+    )
+    return jsonify({'success': True, **result})
+
+# ==================== PF AUTHENTICATION ====================
+
+@app.route('/auth')
+@login_required
+@permission_required('settings')
+@require_active_workspace
+def auth_page():
+    """PropertyFinder authentication page"""
+    ws = get_active_workspace()
+    if ws:
+        return redirect(url_for('workspace_auth', workspace_slug=ws.slug))
+    pf_session = PFSession.query.first()
+    return render_template('auth.html', session=pf_session)
+
+
+@app.route('/api/auth/save-session', methods=['POST'])
+def save_pf_session():
+    """Save PropertyFinder session cookies from browser"""
+    data = request.get_json()
+    
+    # Get or create session
+    pf_session = PFSession.query.first()
+    if not pf_session:
+        pf_session = PFSession()
+        db.session.add(pf_session)
+    
+    pf_session.cookies = json.dumps(data.get('cookies', {}))
+    pf_session.user_agent = data.get('userAgent')
+    pf_session.logged_in = data.get('loggedIn', False)
+    pf_session.email = data.get('email')
+    pf_session.updated_at = datetime.utcnow()
+    
+    db.session.commit()
+    
+    return jsonify({'success': True, 'message': 'Session saved'})
+
+
+@app.route('/api/auth/status', methods=['GET'])
+def auth_status():
+    """Check authentication status"""
+    pf_session = PFSession.query.first()
+    
+    if pf_session and pf_session.logged_in:
+        return jsonify({
+            'authenticated': True,
+            'email': pf_session.email,
+            'updated_at': pf_session.updated_at.isoformat() if pf_session.updated_at else None
+        })
+    
+    return jsonify({'authenticated': False})
+
+
+@app.route('/api/auth/logout', methods=['POST'])
+def auth_logout():
+    """Clear saved session"""
+    PFSession.query.delete()
+    db.session.commit()
+    return jsonify({'success': True})
+
+
+# ==================== CRM: LEADS ====================
 
 from database import Lead, Customer
 
@@ -11070,6 +12982,7 @@ def _sync_linked_reminder_from_task(task, workspace_id, changed_fields=None):
     lead = Lead.query.filter_by(id=reminder.lead_id, workspace_id=workspace_id).first()
     if lead:
         _sync_lead_next_follow_up_from_reminders(lead, workspace_id)
+    return reminder
 
 
 def mask_phone_keep_last4(value):
@@ -11400,30 +13313,77 @@ def _resolve_lead_assignee_id(pf_agent_id=None, pf_listing_id=None, listing_refe
     return None, None
 
 
-@app.route('/api/leads', methods=['GET'])
-@login_required
-@require_active_workspace
-def api_get_leads():
-    """Get leads based on user permissions.
-    
-    Query params:
-    - scope: my | team (admins/system admins only)
-    - assigned_to_id: optional workspace member filter (team scope only)
+# Short-lived cache for lead counts keyed by filter signature (seconds).
+LEADS_COUNT_CACHE_SECONDS = 30
 
-    Visibility rules:
-    - Non-admin users: always own assigned leads only.
-    - Admin/system users:
-      - my: own assigned leads only (default)
-      - team: assigned team leads only (unassigned excluded)
+LEAD_SORT_COLUMNS = {
+    'created_at': Lead.created_at,
+    'received_at': Lead.received_at,
+    'name': Lead.name,
+    'priority': Lead.priority,
+    'status': Lead.status,
+}
+
+
+def _leads_count_version(workspace_id):
+    """Per-workspace generation counter mixed into lead count cache keys."""
+    return cache.get(f'leads_count_version:{workspace_id}') or 0
+
+
+def bump_leads_count_version(workspace_id):
+    """Invalidate cached lead counts for a workspace after lead writes."""
+    if not workspace_id:
+        return
+    try:
+        _cache_incr(f'leads_count_version:{workspace_id}')
+    except Exception as e:
+        print(f"[LEADS] Failed to bump count version (workspace_id={workspace_id}): {e}")
+
+
+def cached_leads_count(query, workspace_id, signature):
+    """Return (total, from_cache) for a lead query, caching per filter signature."""
+    digest = hashlib.sha1(
+        json.dumps(signature, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    cache_key = f'leads_count:{workspace_id}:{_leads_count_version(workspace_id)}:{digest}'
+    cached_total = cache.get(cache_key)
+    if cached_total is not None:
+        return int(cached_total), True
+    total = query.order_by(None).count()
+    cache.set(cache_key, total, timeout=LEADS_COUNT_CACHE_SECONDS)
+    return total, False
+
+
+def _encode_keyset_cursor(sort_key, value, row_id):
+    """Opaque keyset cursor (sort value, id) for the row after which the next page starts.
+
+    `value` may be a string, number, datetime or None.
     """
-    from sqlalchemy.orm import joinedload
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    payload = json.dumps({'s': sort_key, 'v': value, 'id': row_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
 
-    ws_id = get_active_workspace_id()
+
+def _decode_keyset_cursor(raw_cursor, sort_key):
+    """Decode a cursor produced by _encode_keyset_cursor to (value, id) (ValueError if invalid)."""
     try:
-        query, scope_meta = scoped_leads_query(workspace_id=ws_id)
-    except ValueError as exc:
-        return jsonify({'success': False, 'error': str(exc)}), 400
+        padded = raw_cursor + '=' * (-len(raw_cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        row_id = int(payload['id'])
+        value = payload.get('v')
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['dt'])
+    except Exception:
+        raise ValueError('cursor is invalid')
+    if payload.get('s') != sort_key:
+        raise ValueError('cursor does not match the requested sort')
+    return value, row_id
 
+
+def apply_lead_request_filters(query, include_status=True):
+    """Apply search/status/source/priority/lead_type query-string filters to a lead query."""
+    filters = {}
     search = (request.args.get('search') or '').strip()
     if search:
         pattern = f"%{search}%"
@@ -11435,22 +13395,90 @@ def api_get_leads():
             Lead.message.ilike(pattern),
             Lead.listing_reference.ilike(pattern),
         ))
+    filters['search'] = search
 
-    status = (request.args.get('status') or '').strip()
+    status = (request.args.get('status') or '').strip() if include_status else ''
     if status:
         query = query.filter(Lead.status == status)
+    filters['status'] = status
 
     source = (request.args.get('source') or '').strip()
     if source:
         query = query.filter(Lead.source == source)
+    filters['source'] = source
 
     priority = (request.args.get('priority') or '').strip()
     if priority:
         query = query.filter(Lead.priority == priority)
+    filters['priority'] = priority
 
     lead_type = (request.args.get('lead_type') or '').strip()
     if lead_type:
         query = query.filter(Lead.lead_type == lead_type)
+    filters['lead_type'] = lead_type
+
+    return query, filters
+
+
+def apply_lead_keyset(query, sort_key, direction, cursor=None):
+    """Order a lead query by (sort column, id) and seek past `cursor` if given.
+
+    NULL sort values are always ordered last so the seek predicate is the
+    same on PostgreSQL and SQLite.
+    """
+    sort_column = LEAD_SORT_COLUMNS.get(sort_key, Lead.created_at)
+    descending = direction != 'asc'
+    if descending:
+        query = query.order_by(sort_column.desc().nulls_last(), Lead.id.desc())
+    else:
+        query = query.order_by(sort_column.asc().nulls_last(), Lead.id.asc())
+
+    if cursor is None:
+        return query
+
+    value, lead_id = cursor
+    id_seek = Lead.id < lead_id if descending else Lead.id > lead_id
+    if value is None:
+        return query.filter(sort_column.is_(None), id_seek)
+    value_seek = sort_column < value if descending else sort_column > value
+    return query.filter(db.or_(
+        value_seek,
+        db.and_(sort_column == value, id_seek),
+        sort_column.is_(None),
+    ))
+
+
+@app.route('/api/leads', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_get_leads():
+    """Get leads based on user permissions.
+    
+    Query params:
+    - scope: my | team (admins/system admins only)
+    - assigned_to_id: optional workspace member filter (team scope only)
+    - cursor: opaque keyset cursor from meta.next_cursor (takes precedence over page offset)
+
+    Visibility rules:
+    - Non-admin users: always own assigned leads only.
+    - Admin/system users:
+      - my: own assigned leads only (default)
+      - team: assigned team leads only (unassigned excluded)
+    """
+    from sqlalchemy.orm import joinedload
+
+    ws_id = get_active_workspace_id()
+    try:
+        query, scope_meta = scoped_leads_query(workspace_id=ws_id)
+    except ValueError as exc:
+        return jsonify({'success': False, 'error': str(exc)}), 400
+
+    query, filters = apply_lead_request_filters(query)
+    search = filters['search']
+    status = filters['status']
+    source = filters['source']
+    priority = filters['priority']
+    lead_type = filters['lead_type']
 
     sort_key = (request.args.get('sort') or 'created_at').strip().lower()
     direction = (request.args.get('direction') or 'desc').strip().lower()
@@ -11478,27 +13506,43 @@ def api_get_leads():
     requested_per_page = max(1, requested_per_page)
     per_page = min(requested_per_page, max_per_page)
 
-    sort_columns = {
-        'created_at': Lead.created_at,
-        'received_at': Lead.received_at,
-        'name': Lead.name,
-        'priority': Lead.priority,
-        'status': Lead.status,
-    }
-    sort_column = sort_columns.get(sort_key, Lead.created_at)
+    if sort_key not in LEAD_SORT_COLUMNS:
+        sort_key = 'created_at'
+    if direction not in ('asc', 'desc'):
+        direction = 'desc'
 
-    total = query.count()
+    raw_cursor = (request.args.get('cursor') or '').strip()
+    cursor = None
+    if raw_cursor:
+        try:
+            cursor = _decode_keyset_cursor(raw_cursor, sort_key)
+        except ValueError as exc:
+            return jsonify({'success': False, 'error': str(exc)}), 400
+
+    total, total_cached = cached_leads_count(query, ws_id, {
+        'user_id': g.user.id,
+        'scope': scope_meta['effective_scope'],
+        'assigned_to_id': scope_meta['assigned_to_id'],
+        'tag_ids': scope_meta['tag_ids'],
+        'search': search,
+        'status': status,
+        'source': source,
+        'priority': priority,
+        'lead_type': lead_type,
+    })
     total_pages = max(1, math.ceil(total / per_page)) if total else 1
     if page > total_pages:
         page = total_pages
 
-    if direction == 'asc':
-        query = query.order_by(sort_column.asc())
-    else:
-        query = query.order_by(sort_column.desc())
-
+    query = apply_lead_keyset(query, sort_key, direction, cursor=cursor)
     query = query.options(joinedload(Lead.assigned_to))
-    leads = query.offset((page - 1) * per_page).limit(per_page).all()
+    if cursor is None:
+        query = query.offset((page - 1) * per_page)
+    # Fetch one extra row to know whether another page exists without COUNT.
+    leads = query.limit(per_page + 1).all()
+    has_next = len(leads) > per_page
+    leads = leads[:per_page]
+    next_cursor = _encode_keyset_cursor(sort_key, getattr(leads[-1], sort_key, None), leads[-1].id) if has_next and leads else None
     capped = bool(view_mode == 'kanban' and total > per_page)
     user_tags_map = _bulk_get_lead_tags_for_user(ws_id, g.user.id, [lead.id for lead in leads])
 
@@ -11531,11 +13575,474 @@ def api_get_leads():
             'per_page': per_page,
             'total': total,
             'total_pages': total_pages,
-            'has_next': page < total_pages,
-            'has_prev': page > 1,
+            'has_next': has_next,
+            'has_prev': page > 1 or cursor is not None,
             'loaded': len(leads),
             'capped': capped,
+            'next_cursor': next_cursor,
+            'total_cached': total_cached,
+        }
+    })
+
+
+# ==================== LEAD EXPORT ====================
+
+LEAD_EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+LEAD_EXPORT_BATCH_SIZE = 500
+LEAD_EXPORT_JOB_TTL_SECONDS = 24 * 60 * 60
+# A running export checkpoints after every batch; one silent this long lost its worker.
+LEAD_EXPORT_STALE_SECONDS = 5 * 60
+LEAD_EXPORT_COLUMNS = (
+    'id', 'name', 'email', 'phone', 'whatsapp', 'source', 'channel', 'status', 'pf_status',
+    'priority', 'lead_type', 'listing_reference', 'pf_listing_id', 'pf_agent_name',
+    'assigned_to_id', 'assigned_to_name', 'tags', 'message', 'notes', 'last_contact',
+    'next_follow_up', 'received_at', 'created_at', 'updated_at',
+)
+
+
+def build_lead_export_query(workspace_id, user):
+    """Column-only lead query for the request's scope/filters, streamed in id order."""
+    query, _scope_meta = scoped_leads_query(workspace_id=workspace_id, user=user)
+    query, _filters = apply_lead_request_filters(query)
+    assignee = db.aliased(User)
+    user_tags = db.aliased(LeadUserTag)
+    query = query.outerjoin(
+        assignee, Lead.assigned_to_id == assignee.id
+    ).outerjoin(
+        user_tags,
+        db.and_(
+            user_tags.workspace_id == workspace_id,
+            user_tags.lead_id == Lead.id,
+            user_tags.user_id == user.id
+        )
+    )
+    columns = [
+        getattr(Lead, name).label(name)
+        for name in LEAD_EXPORT_COLUMNS
+        if name not in ('assigned_to_name', 'tags')
+    ]
+    query = query.with_entities(
+        *columns,
+        assignee.name.label('assigned_to_name'),
+        user_tags.tags.label('tags')
+    ).order_by(Lead.id.asc())
+    # yield_per streams through a server-side cursor where the driver supports it.
+    return query.yield_per(LEAD_EXPORT_BATCH_SIZE)
+
+
+def _lead_export_values(row):
+    values = {}
+    for name in LEAD_EXPORT_COLUMNS:
+        value = getattr(row, name)
+        values[name] = value.isoformat() if isinstance(value, datetime) else value
+    return values
+
+
+def iter_lead_export_chunks(query, export_format, stats=None):
+    """Encode streamed export rows as CSV/NDJSON text, one chunk per batch."""
+    return iter_export_chunks(
+        query, LEAD_EXPORT_COLUMNS, export_format, _lead_export_values,
+        LEAD_EXPORT_BATCH_SIZE, stats=stats
+    )
+
+
+def _lead_export_filename(export_format):
+    _mimetype, extension = LEAD_EXPORT_FORMATS[export_format]
+    return f"leads-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{extension}"
+
+
+def _lead_export_path(job):
+    return EXPORTS_FOLDER / f"leads-{job.id}.{LEAD_EXPORT_FORMATS[job.format][1]}"
+
+
+def _prune_lead_exports():
+    """Remove export files and job rows older than the job TTL."""
+    cutoff = datetime.utcnow() - timedelta(seconds=LEAD_EXPORT_JOB_TTL_SECONDS)
+    try:
+        for path in EXPORTS_FOLDER.glob('leads-*'):
+            if path.stat().st_mtime < cutoff.timestamp():
+                path.unlink()
+        LeadExportJob.query.filter(
+            LeadExportJob.created_at < cutoff,
+            LeadExportJob.status.notin_(LeadExportJob.ACTIVE_STATUSES)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[LEADS] Failed to prune old exports: {e}")
+
+
+def _iter_lead_export_job_rows(query, job_id):
+    """Page `query` by lead id, checkpointing the job's progress after every page.
+
+    Each page is fetched in full before the checkpoint commits, so no cursor
+    stays open across commits.
+    """
+    last_id = None
+    rows_written = 0
+    while True:
+        page_query = query if last_id is None else query.filter(Lead.id > last_id)
+        rows = page_query.limit(LEAD_EXPORT_BATCH_SIZE).all()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1].id
+        rows_written += len(rows)
+        LeadExportJob.query.filter_by(id=job_id).update(
+            {'rows': rows_written, 'heartbeat_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+
+
+def run_lead_export_job(job_id, query_args):
+    """Background job: write a lead export file for later download."""
+    with app.test_request_context('/api/leads/export', query_string=query_args):
+        job = db.session.get(LeadExportJob, job_id)
+        if not job or job.status != LeadExportJob.STATUS_QUEUED:
+            db.session.remove()
+            return
+        stats = {'rows': 0}
+        path = _lead_export_path(job)
+        partial_path = path.with_name(path.name + '.part')
+        workspace_id = job.workspace_id
+        try:
+            user = db.session.get(User, job.user_id)
+            if not user:
+                raise ValueError('User no longer exists')
+            g.user = user
+            now = datetime.utcnow()
+            job.status = LeadExportJob.STATUS_RUNNING
+            job.started_at = now
+            job.heartbeat_at = now
+            db.session.commit()
+            query = build_lead_export_query(workspace_id, user)
+            rows = _iter_lead_export_job_rows(query, job_id)
+            with open(partial_path, 'w', encoding='utf-8', newline='') as handle:
+                for chunk in iter_lead_export_chunks(rows, job.format, stats=stats):
+                    handle.write(chunk)
+            os.replace(partial_path, path)
+            job = db.session.get(LeadExportJob, job_id)
+            job.status = LeadExportJob.STATUS_COMPLETED
+            job.rows = stats['rows']
+            job.size_bytes = path.stat().st_size
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            print(f"[LEADS] Export {job_id} wrote {stats['rows']} leads (workspace_id={workspace_id})")
+        except Exception as e:
+            db.session.rollback()
+            if partial_path.exists():
+                partial_path.unlink()
+            LeadExportJob.query.filter_by(id=job_id).update({
+                'status': LeadExportJob.STATUS_FAILED,
+                'error': str(e),
+                'finished_at': datetime.utcnow(),
+            }, synchronize_session=False)
+            db.session.commit()
+            print(f"[LEADS] Export {job_id} failed (workspace_id={workspace_id}): {e}")
+        finally:
+            db.session.remove()
+
+
+def fail_interrupted_lead_exports():
+    """Fail exports whose worker went away: queued or running without a recent checkpoint."""
+    with app.app_context():
+        try:
+            stale_before = datetime.utcnow() - timedelta(seconds=LEAD_EXPORT_STALE_SECONDS)
+            failed = LeadExportJob.query.filter(
+                db.or_(
+                    db.and_(LeadExportJob.status == LeadExportJob.STATUS_QUEUED, LeadExportJob.created_at < stale_before),
+                    db.and_(
+                        LeadExportJob.status == LeadExportJob.STATUS_RUNNING,
+                        db.or_(LeadExportJob.heartbeat_at == None, LeadExportJob.heartbeat_at < stale_before)
+                    )
+                )
+            ).update({
+                'status': LeadExportJob.STATUS_FAILED,
+                'error': 'Export was interrupted before it finished',
+                'finished_at': datetime.utcnow(),
+            }, synchronize_session=False)
+            db.session.commit()
+            if failed:
+                print(f"[LEADS] Marked {failed} interrupted export(s) as failed")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[LEADS] Export recovery failed: {e}")
+        finally:
+            db.session.remove()
+
+
+register_leader_job(
+    'lead_export_recovery',
+    func=fail_interrupted_lead_exports,
+    trigger=IntervalTrigger(seconds=LEAD_EXPORT_STALE_SECONDS),
+    name='Fail interrupted lead exports',
+    next_run_time=datetime.now()
+)
+
+
+def _get_lead_export_job_or_404(job_id):
+    cutoff = datetime.utcnow() - timedelta(seconds=LEAD_EXPORT_JOB_TTL_SECONDS)
+    return LeadExportJob.query.filter(
+        LeadExportJob.id == job_id,
+        LeadExportJob.workspace_id == get_active_workspace_id(),
+        LeadExportJob.user_id == g.user.id,
+        LeadExportJob.created_at >= cutoff
+    ).first()
+
+
+def _lead_export_job_response(job):
+    payload = job.to_dict()
+    if job.status == LeadExportJob.STATUS_COMPLETED:
+        payload['download_url'] = url_for('api_download_lead_export', job_id=job.id)
+    return payload
+
+
+@app.route('/api/leads/export', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_export_leads():
+    """Stream every lead in the current scope/filters as CSV or NDJSON.
+
+    Accepts the same scope/filter query params as GET /api/leads plus
+    format=csv|ndjson. Rows are written as they are fetched.
+    """
+    from flask import Response, stream_with_context
+
+    ws_id = get_active_workspace_id()
+    export_format = (request.args.get('format') or 'csv').strip().lower()
+    if export_format not in LEAD_EXPORT_FORMATS:
+        return jsonify({'success': False, 'error': 'format must be csv or ndjson'}), 400
+    try:
+        query = build_lead_export_query(ws_id, g.user)
+    except ValueError as exc:
+        return jsonify({'success': False, 'error': str(exc)}), 400
+
+    response = Response(
+        stream_with_context(iter_lead_export_chunks(query, export_format)),
+        mimetype=LEAD_EXPORT_FORMATS[export_format][0]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename="{_lead_export_filename(export_format)}"'
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@app.route('/api/leads/export/jobs', methods=['POST'])
+@login_required
+@require_active_workspace
+def api_create_lead_export_job():
+    """Queue a background lead export (same query params as GET /api/leads/export)"""
+    import uuid
+
+    ws_id = get_active_workspace_id()
+    data = request.get_json(silent=True) or {}
+    export_format = str(data.get('format') or request.args.get('format') or 'csv').strip().lower()
+    if export_format not in LEAD_EXPORT_FORMATS:
+        return jsonify({'success': False, 'error': 'format must be csv or ndjson'}), 400
+    try:
+        # Validate scope/filters up front so bad params fail the request, not the job.
+        resolve_leads_scope_request(workspace_id=ws_id, user=g.user)
+    except ValueError as exc:
+        return jsonify({'success': False, 'error': str(exc)}), 400
+
+    _prune_lead_exports()
+    job_id = uuid.uuid4().hex
+    query_args = [(key, value) for key, values in request.args.lists() for value in values]
+    job = LeadExportJob(
+        id=job_id,
+        workspace_id=ws_id,
+        user_id=g.user.id,
+        format=export_format,
+        filename=_lead_export_filename(export_format),
+        status=LeadExportJob.STATUS_QUEUED,
+        rows=0
+    )
+    db.session.add(job)
+    db.session.commit()
+    loop_scheduler.add_job(
+        run_lead_export_job,
+        args=[job_id, query_args],
+        id=f'lead_export_{job_id}',
+        name=f'Lead export (workspace {ws_id})',
+        replace_existing=True
+    )
+    return jsonify({'success': True, 'job': _lead_export_job_response(job)}), 202
+
+
+@app.route('/api/leads/export/jobs/<job_id>', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_get_lead_export_job(job_id):
+    """Status of a background lead export"""
+    job = _get_lead_export_job_or_404(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Export not found'}), 404
+    return jsonify({'success': True, 'job': _lead_export_job_response(job)})
+
+
+@app.route('/api/leads/export/jobs/<job_id>/download', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_download_lead_export(job_id):
+    """Download a completed background lead export"""
+    job = _get_lead_export_job_or_404(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Export not found'}), 404
+    if job.status != LeadExportJob.STATUS_COMPLETED:
+        return jsonify({'success': False, 'error': 'Export is not ready yet'}), 409
+    path = _lead_export_path(job)
+    if not path.exists():
+        return jsonify({'success': False, 'error': 'Export file has expired'}), 410
+    return send_file(str(path), mimetype=LEAD_EXPORT_FORMATS[job.format][0], as_attachment=True, download_name=job.filename)
+
+
+KANBAN_DEFAULT_PER_COLUMN = 25
+KANBAN_MAX_PER_COLUMN = 100
+
+
+def _kanban_request_options():
+    """Parse sort/direction/per_column for the Kanban endpoints."""
+    sort_key = (request.args.get('sort') or 'created_at').strip().lower()
+    if sort_key not in LEAD_SORT_COLUMNS:
+        sort_key = 'created_at'
+    direction = (request.args.get('direction') or 'desc').strip().lower()
+    if direction not in ('asc', 'desc'):
+        direction = 'desc'
+    try:
+        per_column = int(request.args.get('per_column', str(KANBAN_DEFAULT_PER_COLUMN)))
+    except ValueError:
+        per_column = KANBAN_DEFAULT_PER_COLUMN
+    per_column = min(max(1, per_column), KANBAN_MAX_PER_COLUMN)
+    return sort_key, direction, per_column
+
+
+def _load_kanban_column_page(query, status, sort_key, direction, per_column, cursor=None):
+    """Load one Kanban column page; returns (leads, next_cursor)."""
+    from sqlalchemy.orm import joinedload
+
+    column_query = apply_lead_keyset(
+        query.filter(Lead.status == status),
+        sort_key,
+        direction,
+        cursor=cursor
+    ).options(joinedload(Lead.assigned_to))
+    leads = column_query.limit(per_column + 1).all()
+    has_next = len(leads) > per_column
+    leads = leads[:per_column]
+    next_cursor = _encode_keyset_cursor(sort_key, getattr(leads[-1], sort_key, None), leads[-1].id) if has_next and leads else None
+    return leads, next_cursor
+
+
+def _serialize_kanban_leads(leads, workspace_id):
+    user_tags_map = _bulk_get_lead_tags_for_user(workspace_id, g.user.id, [lead.id for lead in leads])
+    return [
+        serialize_lead_for_response(
+            lead,
+            workspace_id=workspace_id,
+            user=g.user,
+            lead_tags_map=user_tags_map
+        ) for lead in leads
+    ]
+
+
+@app.route('/api/leads/kanban', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_get_leads_kanban():
+    """Kanban board bootstrap: per-status counts plus the first page of each column.
+
+    Accepts the same scope/filter params as GET /api/leads (status is ignored),
+    plus optional `statuses` (comma-separated) to limit which columns are loaded
+    and `per_column` for the first page size.
+    """
+    ws_id = get_active_workspace_id()
+    try:
+        query, scope_meta = scoped_leads_query(workspace_id=ws_id)
+    except ValueError as exc:
+        return jsonify({'success': False, 'error': str(exc)}), 400
+    query, filters = apply_lead_request_filters(query, include_status=False)
+    sort_key, direction, per_column = _kanban_request_options()
+
+    count_rows = (
+        query.order_by(None)
+        .with_entities(Lead.status, db.func.count(Lead.id))
+        .group_by(Lead.status)
+        .all()
+    )
+    counts = {status: int(count or 0) for status, count in count_rows if status is not None}
+
+    raw_statuses = (request.args.get('statuses') or '').strip()
+    if raw_statuses:
+        statuses = [s.strip() for s in raw_statuses.split(',') if s.strip()]
+    else:
+        statuses = list(counts.keys())
+
+    columns = {}
+    for status in statuses:
+        if not counts.get(status):
+            columns[status] = {'count': 0, 'leads': [], 'next_cursor': None}
+            continue
+        leads, next_cursor = _load_kanban_column_page(query, status, sort_key, direction, per_column)
+        columns[status] = {
+            'count': counts[status],
+            'leads': _serialize_kanban_leads(leads, ws_id),
+            'next_cursor': next_cursor,
         }
+
+    return jsonify({
+        'success': True,
+        'counts': counts,
+        'columns': columns,
+        'meta': {
+            'requested_scope': scope_meta['requested_scope'],
+            'effective_scope': scope_meta['effective_scope'],
+            'assigned_to_id': scope_meta['assigned_to_id'],
+            'tag_ids': scope_meta['tag_ids'],
+            'can_manage_all': scope_meta['can_manage_all'],
+            'can_view_team_leads': scope_meta['can_view_team_leads'],
+            **filters,
+            'sort': sort_key,
+            'direction': direction,
+            'per_column': per_column,
+            'total': sum(counts.values()),
+        }
+    })
+
+
+@app.route('/api/leads/kanban/column', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_get_leads_kanban_column():
+    """Load the next page of a single Kanban column (requires `status`, optional `cursor`)."""
+    ws_id = get_active_workspace_id()
+    status = (request.args.get('status') or '').strip()
+    if not status:
+        return jsonify({'success': False, 'error': 'status is required'}), 400
+    try:
+        query, _scope_meta = scoped_leads_query(workspace_id=ws_id)
+    except ValueError as exc:
+        return jsonify({'success': False, 'error': str(exc)}), 400
+    query, _filters = apply_lead_request_filters(query, include_status=False)
+    sort_key, direction, per_column = _kanban_request_options()
+
+    raw_cursor = (request.args.get('cursor') or '').strip()
+    cursor = None
+    if raw_cursor:
+        try:
+            cursor = _decode_keyset_cursor(raw_cursor, sort_key)
+        except ValueError as exc:
+            return jsonify({'success': False, 'error': str(exc)}), 400
+
+    leads, next_cursor = _load_kanban_column_page(query, status, sort_key, direction, per_column, cursor=cursor)
+    return jsonify({
+        'success': True,
+        'status': status,
+        'leads': _serialize_kanban_leads(leads, ws_id),
+        'next_cursor': next_cursor,
     })
 
 
@@ -11587,8 +14094,22 @@ def api_create_lead():
     if validated_tags is not None:
         _set_lead_tags_for_user(ws_id, lead.id, g.user.id, validated_tags)
     db.session.commit()
+    bump_leads_count_version(ws_id)
+
+    possible_duplicates = find_lead_duplicate_candidates(
+        ws_id,
+        phone=lead.phone,
+        whatsapp=lead.whatsapp,
+        email=lead.email,
+        exclude_lead_id=lead.id,
+        lead_query=visible_lead_query(ws_id, access='read'),
+    )
     
-    return jsonify({'success': True, 'lead': serialize_lead_for_response(lead, workspace_id=ws_id, user=g.user)})
+    return jsonify({
+        'success': True,
+        'lead': serialize_lead_for_response(lead, workspace_id=ws_id, user=g.user),
+        'possible_duplicates': possible_duplicates,
+    })
 
 
 @app.route('/api/leads/<int:lead_id>', methods=['GET'])
@@ -11645,6 +14166,7 @@ def api_update_lead(lead_id):
         lead.last_contact = datetime.utcnow()
     
     db.session.commit()
+    bump_leads_count_version(ws_id)
     return jsonify({'success': True, 'lead': serialize_lead_for_response(lead, workspace_id=ws_id, user=g.user)})
 
 
@@ -11657,9 +14179,398 @@ def api_delete_lead(lead_id):
     lead = get_visible_lead_or_404(lead_id, workspace_id=ws_id, access='write')
     db.session.delete(lead)
     db.session.commit()
+    bump_leads_count_version(ws_id)
     return jsonify({'success': True})
 
 
+# ==================== LEAD DEDUPLICATION ====================
+
+LEAD_DUPLICATE_CANDIDATE_LIMIT = 10
+LEAD_DUPLICATE_CLUSTERS_SETTING = 'lead_duplicate_clusters'
+LEAD_DUPLICATE_MAX_CLUSTERS = 1000
+LEAD_DUPLICATE_SCAN_BATCH = 2000
+# Primary lead fields filled from duplicates when empty on the primary.
+LEAD_MERGE_FILL_FIELDS = (
+    'email', 'phone', 'whatsapp', 'message', 'listing_reference', 'pf_listing_id',
+    'response_link', 'pf_agent_id', 'pf_agent_name', 'assigned_to_id', 'customer_id',
+    'notes', 'last_contact', 'next_follow_up', 'channel',
+)
+
+
+def _lead_duplicate_match_keys(phone=None, whatsapp=None, email=None):
+    """Normalized phone keys (set) and email key for a candidate lookup."""
+    phones = {key for key in (normalize_phone_e164(phone), normalize_phone_e164(whatsapp)) if key}
+    return phones, normalize_email_key(email)
+
+
+def _duplicate_record_brief(kind, record, phones, email_key):
+    matched_on = []
+    if record.phone_normalized and record.phone_normalized in phones:
+        matched_on.append('phone')
+    if email_key and record.email_normalized == email_key:
+        matched_on.append('email')
+    brief = {
+        'type': kind,
+        'id': record.id,
+        'name': record.name,
+        'phone': record.phone,
+        'email': record.email,
+        'created_at': record.created_at.isoformat() if record.created_at else None,
+        'matched_on': matched_on,
+    }
+    if kind == 'lead':
+        brief.update({
+            'status': record.status,
+            'source': record.source,
+            'assigned_to_id': record.assigned_to_id,
+        })
+    else:
+        brief['lead_id'] = record.lead_id
+    return brief
+
+
+def find_lead_duplicate_candidates(workspace_id, phone=None, whatsapp=None, email=None,
+                                   exclude_lead_id=None, lead_query=None,
+                                   limit=LEAD_DUPLICATE_CANDIDATE_LIMIT):
+    """Leads and contacts sharing a normalized phone/email (index lookups only)."""
+    phones, email_key = _lead_duplicate_match_keys(phone, whatsapp, email)
+    if not phones and not email_key:
+        return {'leads': [], 'contacts': []}
+
+    def _match_clause(model):
+        clauses = []
+        if phones:
+            clauses.append(model.phone_normalized.in_(sorted(phones)))
+        if email_key:
+            clauses.append(model.email_normalized == email_key)
+        return db.or_(*clauses)
+
+    query = lead_query if lead_query is not None else Lead.query.filter(Lead.workspace_id == workspace_id)
+    query = query.filter(_match_clause(Lead))
+    if exclude_lead_id:
+        query = query.filter(Lead.id != exclude_lead_id)
+    leads = query.order_by(Lead.created_at.desc(), Lead.id.desc()).limit(limit).all()
+
+    contacts = Contact.query.filter(
+        Contact.workspace_id == workspace_id,
+        _match_clause(Contact)
+    ).order_by(Contact.created_at.desc(), Contact.id.desc()).limit(limit).all()
+
+    return {
+        'leads': [_duplicate_record_brief('lead', lead, phones, email_key) for lead in leads],
+        'contacts': [_duplicate_record_brief('contact', contact, phones, email_key) for contact in contacts],
+    }
+
+
+def count_leads_with_existing_duplicates(workspace_id, leads):
+    """How many of `leads` share a match key with another lead in the workspace."""
+    leads = [lead for lead in (leads or []) if lead.id and (lead.phone_normalized or lead.email_normalized)]
+    if not leads:
+        return 0
+    phones = {lead.phone_normalized for lead in leads if lead.phone_normalized}
+    emails = {lead.email_normalized for lead in leads if lead.email_normalized}
+    clauses = []
+    if phones:
+        clauses.append(Lead.phone_normalized.in_(sorted(phones)))
+    if emails:
+        clauses.append(Lead.email_normalized.in_(sorted(emails)))
+    rows = db.session.query(Lead.id, Lead.phone_normalized, Lead.email_normalized).filter(
+        Lead.workspace_id == workspace_id,
+        db.or_(*clauses)
+    ).all()
+    owners_by_key = {}
+    for lead_id, phone_key, email_key in rows:
+        for key in (('phone', phone_key), ('email', email_key)):
+            if key[1]:
+                owners_by_key.setdefault(key, set()).add(lead_id)
+    flagged = 0
+    for lead in leads:
+        keys = [('phone', lead.phone_normalized), ('email', lead.email_normalized)]
+        if any(len(owners_by_key.get(key, ())) > 1 for key in keys if key[1]):
+            flagged += 1
+    return flagged
+
+
+def _lead_duplicate_key_stream(workspace_id, key_name):
+    """(key, record id) pairs for leads and contacts, ordered by one match key."""
+    lead_key = getattr(Lead, key_name)
+    contact_key = getattr(Contact, key_name)
+    stmt = db.select(
+        lead_key.label('match_key'), db.literal('lead').label('kind'), Lead.id.label('record_id')
+    ).where(
+        Lead.workspace_id == workspace_id, lead_key.isnot(None)
+    ).union_all(
+        db.select(
+            contact_key.label('match_key'), db.literal('contact').label('kind'), Contact.id.label('record_id')
+        ).where(
+            Contact.workspace_id == workspace_id, contact_key.isnot(None)
+        )
+    ).order_by('match_key', 'kind', 'record_id')
+    result = db.session.execute(stmt.execution_options(yield_per=LEAD_DUPLICATE_SCAN_BATCH))
+    for row in result:
+        yield row.match_key, (row.kind, row.record_id)
+
+
+def _load_lead_duplicate_state(workspace_id):
+    raw = AppSettings.get(LEAD_DUPLICATE_CLUSTERS_SETTING, '', workspace_id=workspace_id)
+    if not raw:
+        return {}
+    try:
+        state = json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _save_lead_duplicate_state(workspace_id, state):
+    AppSettings.set(LEAD_DUPLICATE_CLUSTERS_SETTING, json.dumps(state), workspace_id=workspace_id)
+
+
+def run_lead_duplicate_scan(workspace_id):
+    """Background job: cluster a workspace's leads/contacts by shared match keys."""
+    with app.app_context():
+        started = datetime.utcnow()
+        try:
+            clusters = cluster_sorted_keys(
+                _lead_duplicate_key_stream(workspace_id, 'phone_normalized'),
+                _lead_duplicate_key_stream(workspace_id, 'email_normalized'),
+            )
+            state = {
+                'status': 'completed',
+                'generated_at': datetime.utcnow().isoformat(),
+                'duration_ms': int((datetime.utcnow() - started).total_seconds() * 1000),
+                'cluster_count': len(clusters),
+                'record_count': sum(len(cluster) for cluster in clusters),
+                'truncated': len(clusters) > LEAD_DUPLICATE_MAX_CLUSTERS,
+                'clusters': [
+                    [[kind, record_id] for kind, record_id in cluster]
+                    for cluster in clusters[:LEAD_DUPLICATE_MAX_CLUSTERS]
+                ],
+            }
+            _save_lead_duplicate_state(workspace_id, state)
+            print(f"[LEADS] Duplicate scan found {len(clusters)} clusters (workspace_id={workspace_id})")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[LEADS] Duplicate scan failed (workspace_id={workspace_id}): {e}")
+            state = _load_lead_duplicate_state(workspace_id)
+            state.update({'status': 'failed', 'error': str(e)})
+            _save_lead_duplicate_state(workspace_id, state)
+        finally:
+            db.session.remove()
+
+
+def _prune_lead_duplicate_clusters(workspace_id, removed_lead_ids):
+    """Drop merged/deleted leads from the stored clusters."""
+    state = _load_lead_duplicate_state(workspace_id)
+    if not state.get('clusters'):
+        return
+    removed = {int(lead_id) for lead_id in removed_lead_ids}
+    clusters = []
+    for cluster in state['clusters']:
+        remaining = [member for member in cluster if not (member[0] == 'lead' and member[1] in removed)]
+        if len(remaining) > 1:
+            clusters.append(remaining)
+    state['clusters'] = clusters
+    state['cluster_count'] = len(clusters)
+    state['record_count'] = sum(len(cluster) for cluster in clusters)
+    _save_lead_duplicate_state(workspace_id, state)
+
+
+def merge_duplicate_leads(primary, duplicates):
+    """Fold `duplicates` into `primary` (caller commits). Returns moved-row counts."""
+    duplicate_ids = [lead.id for lead in duplicates]
+    for field in LEAD_MERGE_FILL_FIELDS:
+        if getattr(primary, field, None):
+            continue
+        for lead in duplicates:
+            value = getattr(lead, field, None)
+            if value:
+                setattr(primary, field, value)
+                break
+
+    received = [lead.received_at for lead in [primary] + list(duplicates) if lead.received_at]
+    if received:
+        primary.received_at = min(received)
+    merged_tags = _normalize_tag_id_list(
+        [tag for lead in [primary] + list(duplicates) for tag in str(lead.tags or '').split(',')]
+    )
+    primary.tags = ','.join(merged_tags) if merged_tags else None
+
+    moved = {
+        'reminders': LeadReminder.query.filter(LeadReminder.lead_id.in_(duplicate_ids)).update(
+            {'lead_id': primary.id}, synchronize_session=False
+        ),
+        'comments': LeadComment.query.filter(LeadComment.lead_id.in_(duplicate_ids)).update(
+            {'lead_id': primary.id}, synchronize_session=False
+        ),
+        'contacts': Contact.query.filter(Contact.lead_id.in_(duplicate_ids)).update(
+            {'lead_id': primary.id}, synchronize_session=False
+        ),
+    }
+
+    # Per-user tags are unique per (workspace, lead, user): fold into one row per user.
+    tag_rows = LeadUserTag.query.filter(
+        LeadUserTag.workspace_id == primary.workspace_id,
+        LeadUserTag.lead_id.in_([primary.id] + duplicate_ids)
+    ).all()
+    primary_rows = {row.user_id: row for row in tag_rows if row.lead_id == primary.id}
+    for row in tag_rows:
+        if row.lead_id == primary.id:
+            continue
+        target = primary_rows.get(row.user_id)
+        if target is None:
+            row.lead_id = primary.id
+            primary_rows[row.user_id] = row
+        else:
+            target.set_tags(target.get_tags() + row.get_tags())
+            db.session.delete(row)
+
+    db.session.flush()
+    for lead in duplicates:
+        db.session.delete(lead)
+    return moved
+
+
+@app.route('/api/leads/<int:lead_id>/duplicates', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_get_lead_duplicates(lead_id):
+    """Possible duplicates of a lead among visible leads and workspace contacts"""
+    ws_id = get_active_workspace_id()
+    lead = get_visible_lead_or_404(lead_id, workspace_id=ws_id, access='read')
+    candidates = find_lead_duplicate_candidates(
+        ws_id,
+        phone=lead.phone,
+        whatsapp=lead.whatsapp,
+        email=lead.email,
+        exclude_lead_id=lead.id,
+        lead_query=visible_lead_query(ws_id, access='read'),
+    )
+    return jsonify({'success': True, 'lead_id': lead.id, **candidates})
+
+
+@app.route('/api/leads/duplicates/scan', methods=['POST'])
+@login_required
+@require_active_workspace
+@require_workspace_leads_admin
+def api_scan_lead_duplicates():
+    """Queue a background duplicate clustering pass for the workspace"""
+    ws_id = get_active_workspace_id()
+    state = _load_lead_duplicate_state(ws_id)
+    state.update({'status': 'running', 'requested_at': datetime.utcnow().isoformat()})
+    state.pop('error', None)
+    _save_lead_duplicate_state(ws_id, state)
+    loop_scheduler.add_job(
+        run_lead_duplicate_scan,
+        args=[ws_id],
+        id=f'lead_duplicate_scan_{ws_id}',
+        name=f'Lead duplicate scan (workspace {ws_id})',
+        replace_existing=True
+    )
+    return jsonify({'success': True, 'status': 'running'}), 202
+
+
+@app.route('/api/leads/duplicates', methods=['GET'])
+@login_required
+@require_active_workspace
+@require_workspace_leads_admin
+def api_get_lead_duplicate_clusters():
+    """Duplicate clusters from the last background scan (paged)"""
+    ws_id = get_active_workspace_id()
+    state = _load_lead_duplicate_state(ws_id)
+    clusters = state.get('clusters') or []
+    page = max(1, request.args.get('page', 1, type=int) or 1)
+    per_page = min(100, max(1, request.args.get('per_page', 20, type=int) or 20))
+    page_clusters = clusters[(page - 1) * per_page:page * per_page]
+
+    lead_ids = {member[1] for cluster in page_clusters for member in cluster if member[0] == 'lead'}
+    contact_ids = {member[1] for cluster in page_clusters for member in cluster if member[0] == 'contact'}
+    leads = {
+        lead.id: lead for lead in Lead.query.filter(Lead.workspace_id == ws_id, Lead.id.in_(lead_ids)).all()
+    } if lead_ids else {}
+    contacts = {
+        contact.id: contact
+        for contact in Contact.query.filter(Contact.workspace_id == ws_id, Contact.id.in_(contact_ids)).all()
+    } if contact_ids else {}
+
+    items = []
+    for cluster in page_clusters:
+        members = []
+        for kind, record_id in cluster:
+            record = leads.get(record_id) if kind == 'lead' else contacts.get(record_id)
+            if record is None:
+                continue  # deleted since the scan
+            members.append(_duplicate_record_brief(
+                kind, record, {record.phone_normalized} - {None}, record.email_normalized
+            ))
+        if len(members) > 1:
+            items.append({'members': members})
+
+    return jsonify({
+        'success': True,
+        'status': state.get('status') or 'never_run',
+        'generated_at': state.get('generated_at'),
+        'error': state.get('error'),
+        'truncated': bool(state.get('truncated')),
+        'clusters': items,
+        'meta': {
+            'page': page,
+            'per_page': per_page,
+            'total': len(clusters),
+            'pages': (len(clusters) + per_page - 1) // per_page,
+        }
+    })
+
+
+@app.route('/api/leads/merge', methods=['POST'])
+@login_required
+@require_active_workspace
+@require_workspace_leads_admin
+def api_merge_leads():
+    """Merge duplicate leads into a primary lead"""
+    data = request.get_json() or {}
+    ws_id = get_active_workspace_id()
+    try:
+        primary_id = int(data.get('primary_id'))
+        duplicate_ids = []
+        for raw in data.get('duplicate_ids') or []:
+            duplicate_id = int(raw)
+            if duplicate_id != primary_id and duplicate_id not in duplicate_ids:
+                duplicate_ids.append(duplicate_id)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'primary_id and duplicate_ids must be lead ids'}), 400
+    if not duplicate_ids:
+        return jsonify({'success': False, 'error': 'No duplicate leads selected'}), 400
+
+    found = {
+        lead.id: lead
+        for lead in visible_lead_query(ws_id, access='write').filter(
+            Lead.id.in_([primary_id] + duplicate_ids)
+        ).all()
+    }
+    if primary_id not in found or any(lead_id not in found for lead_id in duplicate_ids):
+        return jsonify({'success': False, 'error': 'Lead not found'}), 404
+
+    primary = found[primary_id]
+    moved = merge_duplicate_leads(primary, [found[lead_id] for lead_id in duplicate_ids])
+    db.session.commit()
+    bump_leads_count_version(ws_id)
+    _prune_lead_duplicate_clusters(ws_id, duplicate_ids)
+
+    if moved['reminders']:
+        for reminder in LeadReminder.query.filter_by(
+            lead_id=primary.id, status=LeadReminder.STATUS_PENDING
+        ).all():
+            sync_reminder_notification(reminder, lead=primary)
+
+    return jsonify({
+        'success': True,
+        'merged': len(duplicate_ids),
+        'moved': moved,
+        'lead': serialize_lead_for_response(primary, workspace_id=ws_id, user=g.user),
+    })
+
+
 @app.route('/api/leads/<int:lead_id>/reminders', methods=['GET'])
 @login_required
 @require_active_workspace
@@ -11680,30 +14591,70 @@ def api_get_lead_reminders(lead_id):
     })
 
 
-@app.route('/api/leads/reminders/notifications', methods=['GET'])
-@login_required
-@require_active_workspace
-def api_get_lead_reminder_notifications():
-    ws_id = get_active_workspace_id()
+# ==================== REMINDER NOTIFICATIONS ====================
+
+REMINDER_STREAM_KEEPALIVE_SECONDS = 20
+
+
+def _reminder_recipient_user_id(reminder):
+    """User who gets lead-card notifications for a reminder."""
+    return reminder.assigned_to_id or reminder.created_by_id
+
+
+def _reminder_notification_entry(reminder, lead_name=None):
+    """Hub entry for a pending reminder (datetimes kept as naive UTC)."""
+    return {
+        'reminder_id': reminder.id,
+        'workspace_id': reminder.workspace_id,
+        'recipient_user_id': _reminder_recipient_user_id(reminder),
+        'lead_id': reminder.lead_id,
+        'lead_name': lead_name,
+        'title': reminder.title,
+        'due_at': reminder.due_at,
+        'task_id': reminder.task_id,
+        'type': reminder.type,
+        'assigned_to_id': reminder.assigned_to_id,
+    }
+
+
+def _reminder_notification_payload(entry, now_utc=None):
+    """JSON shape shared by the notifications endpoint and the SSE stream."""
+    now_utc = now_utc or datetime.utcnow()
+    due_at = entry.get('due_at')
+    return {
+        'reminder_id': entry['reminder_id'],
+        'lead_id': entry['lead_id'],
+        'lead_name': entry.get('lead_name'),
+        'title': entry.get('title'),
+        'due_at': due_at.isoformat() if due_at else None,
+        'is_overdue': bool(due_at and due_at < now_utc),
+        'task_id': entry.get('task_id'),
+        'type': entry.get('type'),
+        'assigned_to_id': entry.get('assigned_to_id'),
+    }
+
+
+def _query_due_reminder_notifications(workspace_id, user):
+    """Due, pending lead-card reminders for a user on leads they can see."""
     now_utc = datetime.utcnow()
     visible_lead_ids = visible_lead_query(
-        workspace_id=ws_id,
-        user=g.user,
+        workspace_id=workspace_id,
+        user=user,
         access='read'
     ).with_entities(Lead.id).subquery()
 
     reminders = LeadReminder.query.join(
         Lead, LeadReminder.lead_id == Lead.id
     ).filter(
-        LeadReminder.workspace_id == ws_id,
+        LeadReminder.workspace_id == workspace_id,
         LeadReminder.status == LeadReminder.STATUS_PENDING,
         LeadReminder.notify_on_lead_card == True,
         LeadReminder.due_at <= now_utc,
         db.or_(
-            LeadReminder.assigned_to_id == g.user.id,
+            LeadReminder.assigned_to_id == user.id,
             db.and_(
                 LeadReminder.assigned_to_id.is_(None),
-                LeadReminder.created_by_id == g.user.id
+                LeadReminder.created_by_id == user.id
             )
         ),
         LeadReminder.lead_id.in_(db.session.query(visible_lead_ids.c.id))
@@ -11712,22 +14663,117 @@ def api_get_lead_reminder_notifications():
         LeadReminder.id.asc()
     ).all()
 
+    return [
+        _reminder_notification_payload(
+            _reminder_notification_entry(reminder, reminder.lead.name if reminder.lead else None),
+            now_utc=now_utc
+        )
+        for reminder in reminders
+    ]
+
+
+def _load_pending_reminder_notification_entries():
+    """Loader used by the hub to (re)build its heap of not-yet-due reminders."""
+    with app.app_context():
+        rows = db.session.query(LeadReminder, Lead.name).join(
+            Lead, LeadReminder.lead_id == Lead.id
+        ).filter(
+            LeadReminder.status == LeadReminder.STATUS_PENDING,
+            LeadReminder.notify_on_lead_card == True,
+            LeadReminder.due_at > datetime.utcnow()
+        ).all()
+        entries = [_reminder_notification_entry(reminder, lead_name) for reminder, lead_name in rows]
+        return [entry for entry in entries if entry['recipient_user_id']]
+
+
+reminder_notification_hub = ReminderNotificationHub(loader=_load_pending_reminder_notification_entries)
+
+
+def sync_reminder_notification(reminder, lead=None, previous_recipient_id=None):
+    """Reflect a committed reminder change in the notification hub."""
+    try:
+        recipient_id = _reminder_recipient_user_id(reminder)
+        if previous_recipient_id and previous_recipient_id != recipient_id:
+            reminder_notification_hub.discard(reminder.id, reminder.workspace_id, previous_recipient_id)
+        if (
+            reminder.status == LeadReminder.STATUS_PENDING
+            and reminder.notify_on_lead_card
+            and recipient_id
+        ):
+            lead_name = lead.name if lead is not None else (reminder.lead.name if reminder.lead else None)
+            reminder_notification_hub.upsert(_reminder_notification_entry(reminder, lead_name))
+        else:
+            reminder_notification_hub.discard(reminder.id, reminder.workspace_id, recipient_id)
+    except Exception as e:
+        print(f"[REMINDERS] Failed to sync notification hub for reminder {getattr(reminder, 'id', None)}: {e}")
+
+
+@app.route('/api/leads/reminders/notifications', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_get_lead_reminder_notifications():
+    ws_id = get_active_workspace_id()
     return jsonify({
         'success': True,
-        'notifications': [{
-            'reminder_id': reminder.id,
-            'lead_id': reminder.lead_id,
-            'lead_name': reminder.lead.name if reminder.lead else None,
-            'title': reminder.title,
-            'due_at': reminder.due_at.isoformat() if reminder.due_at else None,
-            'is_overdue': bool(reminder.due_at and reminder.due_at < now_utc),
-            'task_id': reminder.task_id,
-            'type': reminder.type,
-            'assigned_to_id': reminder.assigned_to_id,
-        } for reminder in reminders]
+        'notifications': _query_due_reminder_notifications(ws_id, g.user)
     })
 
 
+@app.route('/api/leads/reminders/stream', methods=['GET'])
+@login_required
+@require_active_workspace
+def api_stream_lead_reminder_notifications():
+    """Server-Sent Events stream of reminder notifications for the current user.
+
+    Sends a `snapshot` event with everything already due, then a
+    `reminder_due` event the moment another reminder becomes due and a
+    `reminder_removed` event when one is completed, cancelled or deleted.
+    """
+    from flask import Response, stream_with_context
+
+    ws_id = get_active_workspace_id()
+    user_id = g.user.id
+    snapshot = _query_due_reminder_notifications(ws_id, g.user)
+    subscriber = reminder_notification_hub.subscribe(ws_id, user_id)
+    # Do not hold a pooled connection for the lifetime of the stream.
+    db.session.remove()
+
+    def _sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            yield _sse('snapshot', {'notifications': snapshot})
+            while True:
+                try:
+                    message = subscriber.get(timeout=REMINDER_STREAM_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                payload = message['data']
+                if message['event'] == 'reminder_due':
+                    try:
+                        visible = visible_lead_query(
+                            workspace_id=ws_id,
+                            user=User.query.get(user_id),
+                            access='read'
+                        ).filter(Lead.id == payload['lead_id']).with_entities(Lead.id).first()
+                    finally:
+                        db.session.remove()
+                    if not visible:
+                        continue
+                    payload = _reminder_notification_payload(payload)
+                yield _sse(message['event'], payload)
+        finally:
+            reminder_notification_hub.unsubscribe(ws_id, user_id, subscriber)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @app.route('/api/leads/<int:lead_id>/reminders', methods=['POST'])
 @login_required
 @require_active_workspace
@@ -11789,6 +14835,7 @@ def api_create_lead_reminder(lead_id):
 
     _sync_lead_next_follow_up_from_reminders(lead, ws_id)
     db.session.commit()
+    sync_reminder_notification(reminder, lead)
 
     return jsonify({
         'success': True,
@@ -11811,6 +14858,7 @@ def api_update_lead_reminder(lead_id, reminder_id):
     if 'status' in data:
         return jsonify({'success': False, 'error': 'status is managed by complete/cancel actions'}), 400
     changed_fields = set()
+    previous_recipient_id = _reminder_recipient_user_id(reminder)
 
     if 'type' in data:
         reminder_type = str(data.get('type') or '').strip().lower()
@@ -11870,6 +14918,7 @@ def api_update_lead_reminder(lead_id, reminder_id):
 
     _sync_lead_next_follow_up_from_reminders(lead, ws_id)
     db.session.commit()
+    sync_reminder_notification(reminder, lead, previous_recipient_id=previous_recipient_id)
     return jsonify({
         'success': True,
         'reminder': reminder.to_dict(),
@@ -11897,6 +14946,7 @@ def api_complete_lead_reminder(lead_id, reminder_id):
     )
     _sync_lead_next_follow_up_from_reminders(lead, ws_id)
     db.session.commit()
+    sync_reminder_notification(reminder, lead)
     return jsonify({
         'success': True,
         'reminder': reminder.to_dict(),
@@ -11924,6 +14974,7 @@ def api_cancel_lead_reminder(lead_id, reminder_id):
     )
     _sync_lead_next_follow_up_from_reminders(lead, ws_id)
     db.session.commit()
+    sync_reminder_notification(reminder, lead)
     return jsonify({
         'success': True,
         'reminder': reminder.to_dict(),
@@ -11938,9 +14989,11 @@ def api_delete_lead_reminder(lead_id, reminder_id):
     ws_id = get_active_workspace_id()
     lead = get_visible_lead_or_404(lead_id, workspace_id=ws_id, access='write')
     reminder = _get_lead_reminder_or_404(lead.id, reminder_id, ws_id)
+    recipient_id = _reminder_recipient_user_id(reminder)
     db.session.delete(reminder)
     _sync_lead_next_follow_up_from_reminders(lead, ws_id)
     db.session.commit()
+    reminder_notification_hub.discard(reminder_id, ws_id, recipient_id)
     return jsonify({
         'success': True,
         'lead': _lead_follow_up_payload(lead)
@@ -11966,6 +15019,7 @@ def api_bulk_delete_leads():
         deleted += 1
     
     db.session.commit()
+    bump_leads_count_version(ws_id)
     return jsonify({'success': True, 'deleted': deleted})
 
 
@@ -12044,6 +15098,7 @@ def api_bulk_update_leads():
         updated += 1
     
     db.session.commit()
+    bump_leads_count_version(ws_id)
     return jsonify({'success': True, 'updated': updated})
 
 
@@ -12197,6 +15252,7 @@ def api_auto_assign_leads():
             unmatched_by_agent[agent_key] = unmatched_by_agent.get(agent_key, 0) + 1
     
     db.session.commit()
+    bump_leads_count_version(ws_id)
 
     unmatched_agents = sorted(
         [{'pf_agent_id': k, 'count': v} for k, v in unmatched_by_agent.items()],
@@ -12344,6 +15400,7 @@ def api_sync_leads_from_pf():
             imported += 1
         
         db.session.commit()
+        bump_leads_count_version(ws_id)
         return jsonify({
             'success': True, 
             'imported': imported, 
@@ -13303,10 +16360,13 @@ def api_update_task(task_id):
         ).all()
         task.labels = labels
     
+    linked_reminder = None
     if task_sync_fields:
-        _sync_linked_reminder_from_task(task, ws_id, changed_fields=task_sync_fields)
+        linked_reminder = _sync_linked_reminder_from_task(task, ws_id, changed_fields=task_sync_fields)
 
     db.session.commit()
+    if linked_reminder:
+        sync_reminder_notification(linked_reminder)
     return jsonify({'success': True, 'task': _serialize_task_with_linked_lead(task, ws_id, user=g.user)})
 
 
@@ -13620,6 +16680,7 @@ def webhook_zapier():
     
     db.session.add(lead)
     db.session.commit()
+    bump_leads_count_version(ws_id)
     
     return jsonify({'success': True, 'lead_id': lead.id})
 
@@ -13719,6 +16780,7 @@ def webhook_propertyfinder():
 
     db.session.add(lead)
     db.session.commit()
+    bump_leads_count_version(ws_id)
 
     return jsonify({'success': True, 'lead_id': lead.id, 'event_id': event_id})
 
@@ -14400,17 +17462,14 @@ def api_get_folders():
     """API: Get all folders"""
     ws_id = get_active_workspace_id()
     personal_folders = visible_folder_query(workspace_id=ws_id).order_by(ListingFolder.name).all()
-    personal_folder_ids = {f.id for f in personal_folders}
-    visible_counts = {}
-    for listing in visible_local_listing_query(ws_id).all():
-        normalized_folder_id = listing.folder_id if listing.folder_id in personal_folder_ids else None
-        visible_counts[normalized_folder_id] = visible_counts.get(normalized_folder_id, 0) + 1
+    folder_counts = visible_listing_folder_counts(ws_id)
     folders = []
     for folder in personal_folders:
         folder_data = folder.to_dict()
-        folder_data['listing_count'] = visible_counts.get(folder.id, 0)
+        folder_data['listing_count'] = folder_counts.get(folder.id, 0)
         folders.append(folder_data)
-    uncategorized_count = visible_counts.get(None, 0)
+    # Listings in folders owned by other users count as uncategorized for this user.
+    uncategorized_count = sum(folder_counts.values()) - sum(folder['listing_count'] for folder in folders)
     return jsonify({
         'folders': folders,
         'uncategorized_count': uncategorized_count
@@ -14466,7 +17525,7 @@ def api_get_folder(folder_id):
     ws_id = get_active_workspace_id()
     folder = get_visible_folder_or_404(folder_id, workspace_id=ws_id)
     data = folder.to_dict()
-    data['listing_count'] = visible_local_listing_query(ws_id).filter_by(folder_id=folder.id).count()
+    data['listing_count'] = visible_listing_folder_counts(ws_id).get(folder.id, 0)
     return jsonify({'folder': data})
 
 
@@ -14512,6 +17571,7 @@ def api_delete_folder(folder_id):
     
     db.session.delete(folder)
     db.session.commit()
+    bump_listing_counts_version(ws_id)
     
     return jsonify({'message': 'Folder deleted successfully'})
 
@@ -14543,6 +17603,7 @@ def api_move_listings_to_folder():
         synchronize_session=False
     )
     db.session.commit()
+    bump_listing_counts_version(ws_id)
     
     return jsonify({
         'message': f'Moved {updated} listings',
@@ -14593,6 +17654,209 @@ def api_get_loops():
     })
 
 
+# ==================== LOOP CALL-BUDGET PROJECTION ====================
+
+LOOP_PROJECTION_DEFAULT_DAYS = 7
+LOOP_PROJECTION_MAX_DAYS = 31
+# Runs simulated one by one, per loop and per request. Interval and windowed
+# loops continue arithmetically past the cap; daily-times loops stop there.
+LOOP_PROJECTION_MAX_RUNS_PER_LOOP = 20000
+LOOP_PROJECTION_MAX_STEPPED_RUNS = 100000
+
+
+def _loop_run_calls(loop, listing_state):
+    """PF calls one run makes, mirroring create_duplicate_listing / delete_and_republish_listing.
+
+    `listing_state` is the listing's simulated state and is updated for the
+    next run: published duplicate count (duplicate loops) or whether the
+    listing is live on PF (delete_republish loops).
+    """
+    if loop.loop_type == 'delete_republish':
+        calls = {'delete': 1 if listing_state.get('on_pf') else 0, 'create': 1, 'publish': 1}
+        listing_state['on_pf'] = True
+        return calls
+    calls = {'delete': 0, 'create': 1, 'publish': 1}
+    if (loop.max_duplicates or 0) > 0 and listing_state.get('duplicates', 0) >= loop.max_duplicates:
+        calls['delete'] = 1  # oldest duplicate removed first
+    else:
+        listing_state['duplicates'] = listing_state.get('duplicates', 0) + 1
+    return calls
+
+
+def _loop_listing_state_settled(loop, listing_state):
+    """True once _loop_run_calls returns the same calls for this listing on every run."""
+    if loop.loop_type == 'delete_republish':
+        return bool(listing_state.get('on_pf'))
+    max_duplicates = loop.max_duplicates or 0
+    return max_duplicates <= 0 or listing_state.get('duplicates', 0) >= max_duplicates
+
+
+def _add_settled_loop_runs(projection, loop, at, end, calls, tz):
+    """Add a settled loop's runs from `at` arithmetically; None for daily-times loops."""
+    interval_seconds = _loop_interval_delta(loop).total_seconds()
+    mode = _loop_schedule_mode(loop)
+    if mode == LoopConfig.SCHEDULE_INTERVAL:
+        return projection.add_dense_runs(at, interval_seconds, calls)
+    if mode != LoopConfig.SCHEDULE_WINDOWED_INTERVAL:
+        return None
+    try:
+        start_time = parse_hhmm(loop.schedule_window_start)
+        end_time = parse_hhmm(loop.schedule_window_end)
+    except ValueError:
+        return projection.add_dense_runs(at, interval_seconds, calls)  # scheduled like an interval loop
+
+    # One arithmetic block per window: every interval from `at` until the window closes.
+    runs = 0
+    while at < end:
+        local = at.replace(tzinfo=timezone.utc).astimezone(tz)
+        if not _is_local_time_in_window(local, start_time, end_time):
+            at = _next_window_start_local(local, start_time).astimezone(timezone.utc).replace(tzinfo=None)
+            continue
+        window_end = datetime.combine(local.date(), end_time, tzinfo=local.tzinfo)
+        if window_end <= local:
+            window_end += timedelta(days=1)
+        window_end_utc = window_end.astimezone(timezone.utc).replace(tzinfo=None)
+        if local.utcoffset() != window_end.utcoffset():
+            # DST change inside the window: follow the dispatcher's wall-clock steps.
+            while at < min(end, window_end_utc):
+                projection.add_run(at, calls)
+                runs += 1
+                at = compute_next_loop_run_at(loop, now_utc=at, tz=tz)
+            continue
+        runs += projection.add_dense_runs(at, interval_seconds, calls, until=window_end_utc)
+        at = _next_window_start_local(window_end, start_time).astimezone(timezone.utc).replace(tzinfo=None)
+    return runs
+
+
+def project_workspace_loop_calls(workspace_id, days=LOOP_PROJECTION_DEFAULT_DAYS, now_utc=None):
+    """Simulate every active loop of a workspace over `days` and bucket expected PF calls per hour.
+
+    Runs follow the same scheduling functions the dispatcher uses; each run is
+    assumed to start on time and finish instantly, and failures are ignored.
+    A loop is stepped run by run only until every listing's simulated state
+    has settled; the rest of its runs are added per hour or per window.
+    Returns (projection, per-loop summaries).
+    """
+    now_utc = (now_utc or datetime.utcnow()).replace(microsecond=0)
+    end = now_utc + timedelta(days=days)
+    projection = CallBudgetProjection(now_utc, end, Config.RATE_LIMIT_PER_MINUTE)
+    tz = get_workspace_zoneinfo(workspace_id)
+
+    loops = scope_query(LoopConfig.query, workspace_id).filter(
+        LoopConfig.is_active == True,
+        LoopConfig.is_paused == False
+    ).all()
+    loop_ids = [loop.id for loop in loops]
+    sequences = {loop_id: [] for loop_id in loop_ids}
+    duplicate_counts = {}
+    if loop_ids:
+        rows = db.session.query(
+            LoopListing.loop_config_id, LoopListing.listing_id, LocalListing.pf_listing_id
+        ).join(LocalListing, LocalListing.id == LoopListing.listing_id).filter(
+            LoopListing.loop_config_id.in_(loop_ids)
+        ).order_by(LoopListing.loop_config_id, LoopListing.order_index, LoopListing.id).all()
+        for loop_id, listing_id, pf_listing_id in rows:
+            sequences[loop_id].append((listing_id, bool(pf_listing_id)))
+        for loop_id, listing_id, count in db.session.query(
+            DuplicatedListing.loop_config_id, DuplicatedListing.original_listing_id, db.func.count(DuplicatedListing.id)
+        ).filter(
+            DuplicatedListing.loop_config_id.in_(loop_ids),
+            DuplicatedListing.status == 'published'
+        ).group_by(DuplicatedListing.loop_config_id, DuplicatedListing.original_listing_id):
+            duplicate_counts[(loop_id, listing_id)] = int(count)
+
+    summaries = []
+    stepped_runs = 0
+    for loop in loops:
+        sequence = sequences[loop.id]
+        summary = {'loop_id': loop.id, 'name': loop.name, 'loop_type': loop.loop_type,
+                   'runs': 0, 'calls': 0, 'truncated': False}
+        summaries.append(summary)
+        if not sequence:
+            continue  # runs without listings make no PF calls
+
+        states = [
+            {'on_pf': on_pf, 'duplicates': duplicate_counts.get((loop.id, listing_id), 0)}
+            for listing_id, on_pf in sequence
+        ]
+        unsettled = sum(1 for state in states if not _loop_listing_state_settled(loop, state))
+        index = (loop.current_index or 0) % len(sequence)
+        at = max(loop.next_run_at or now_utc, now_utc)
+        steps = 0
+        while at < end and (unsettled or _loop_schedule_mode(loop) == LoopConfig.SCHEDULE_DAILY_TIMES):
+            if steps >= LOOP_PROJECTION_MAX_RUNS_PER_LOOP or stepped_runs >= LOOP_PROJECTION_MAX_STEPPED_RUNS:
+                break
+            steps += 1
+            stepped_runs += 1
+            allowed, _reason = is_loop_schedule_allowed_now(loop, now_utc=at, tz=tz)
+            if allowed:
+                state = states[index]
+                was_settled = _loop_listing_state_settled(loop, state)
+                calls = _loop_run_calls(loop, state)
+                if not was_settled and _loop_listing_state_settled(loop, state):
+                    unsettled -= 1
+                projection.add_run(at, calls)
+                summary['runs'] += 1
+                summary['calls'] += sum(calls.values())
+                index = (index + 1) % len(sequence)
+            at = compute_next_loop_run_at(loop, now_utc=at, tz=tz)
+        if at >= end:
+            continue
+
+        # Settled (or out of stepping budget): every run now makes the same calls.
+        calls = {
+            'delete': 1 if loop.loop_type == 'delete_republish' or (loop.max_duplicates or 0) > 0 else 0,
+            'create': 1,
+            'publish': 1
+        }
+        runs = _add_settled_loop_runs(projection, loop, at, end, calls, tz)
+        if runs is None:
+            summary['truncated'] = True
+            continue
+        summary['runs'] += runs
+        summary['calls'] += runs * sum(calls.values())
+    return projection, summaries
+
+
+@app.route('/api/loops/projection', methods=['GET'])
+@login_required
+@require_active_workspace
+@require_workspace_loops_admin
+def api_get_loop_projection():
+    """Expected PF calls per hour from this workspace's active loops vs the per-minute budget"""
+    ws_id = get_active_workspace_id()
+    days = request.args.get('days', LOOP_PROJECTION_DEFAULT_DAYS, type=int)
+    days = max(1, min(days or LOOP_PROJECTION_DEFAULT_DAYS, LOOP_PROJECTION_MAX_DAYS))
+
+    projection, summaries = project_workspace_loop_calls(ws_id, days=days)
+    visible_ids = {loop_id for (loop_id,) in visible_loop_query(workspace_id=ws_id).with_entities(LoopConfig.id)}
+
+    hours = []
+    over_budget_hours = []
+    for row in projection.hours():
+        row['hour'] = _to_utc_iso_z(row['hour'])
+        hours.append(row)
+        if row['over_budget']:
+            over_budget_hours.append(row['hour'])
+
+    return jsonify({
+        'success': True,
+        'start': _to_utc_iso_z(projection.start),
+        'end': _to_utc_iso_z(projection.end),
+        'days': days,
+        'budget': {
+            'per_minute': Config.RATE_LIMIT_PER_MINUTE,
+            'per_hour': Config.RATE_LIMIT_PER_MINUTE * 60
+        },
+        'totals': projection.totals(),
+        'peak_hour_calls': max((row['calls']['total'] for row in hours), default=0),
+        'peak_minute_calls': max((row['peak_minute_calls'] for row in hours), default=0),
+        'over_budget_hours': over_budget_hours,
+        'hours': hours,
+        'loops': [summary for summary in summaries if summary['loop_id'] in visible_ids]
+    })
+
+
 @app.route('/api/loops', methods=['POST'])
 @login_required
 @require_active_workspace
@@ -14771,6 +18035,8 @@ def api_delete_loop(loop_id):
     # Delete associated records
     LoopListing.query.filter_by(loop_config_id=loop.id).delete()
     LoopExecutionLog.query.filter_by(loop_config_id=loop.id).delete()
+    LoopExecutionDailyStat.query.filter_by(loop_config_id=loop.id).delete()
+    LoopCleanupJob.query.filter_by(loop_config_id=loop.id).delete()
     
     db.session.delete(loop)
     db.session.commit()
@@ -14889,19 +18155,47 @@ def api_run_loop_now(loop_id):
     })
 
 
+LOOP_LOGS_MAX_PAGE_SIZE = 200
+
+
 @app.route('/api/loops/<int:loop_id>/logs', methods=['GET'])
 @login_required
 @require_active_workspace
 @require_workspace_loops_admin
 def api_get_loop_logs(loop_id):
-    """Get execution logs for a loop"""
+    """Get execution logs for a loop, newest first.
+
+    Older pages are fetched with `cursor` (from `next_cursor`); logs past
+    the retention window are only available as daily stats.
+    """
     ws_id = get_active_workspace_id()
     loop = get_visible_loop_or_404(loop_id, workspace_id=ws_id)
     
-    limit = request.args.get('limit', 50, type=int)
-    logs = LoopExecutionLog.query.filter_by(loop_config_id=loop_id).order_by(
-        LoopExecutionLog.executed_at.desc()
-    ).limit(limit).all()
+    limit = max(1, min(request.args.get('limit', 50, type=int), LOOP_LOGS_MAX_PAGE_SIZE))
+    query = LoopExecutionLog.query.filter_by(loop_config_id=loop.id)
+
+    raw_cursor = (request.args.get('cursor') or '').strip()
+    if raw_cursor:
+        try:
+            before_executed_at, before_id = _decode_keyset_cursor(raw_cursor, 'executed_at')
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        # Logs without executed_at sort last on every dialect (see the order below).
+        if before_executed_at is None:
+            query = query.filter(LoopExecutionLog.executed_at.is_(None), LoopExecutionLog.id < before_id)
+        else:
+            query = query.filter(db.or_(
+                LoopExecutionLog.executed_at < before_executed_at,
+                db.and_(LoopExecutionLog.executed_at == before_executed_at, LoopExecutionLog.id < before_id),
+                LoopExecutionLog.executed_at.is_(None),
+            ))
+
+    logs = query.order_by(
+        LoopExecutionLog.executed_at.desc().nulls_last(),
+        LoopExecutionLog.id.desc()
+    ).limit(limit + 1).all()
+    has_more = len(logs) > limit
+    logs = logs[:limit]
     
     log_rows = []
     for log in logs:
@@ -14909,9 +18203,38 @@ def api_get_loop_logs(loop_id):
         row['executed_at'] = _to_utc_iso_z(getattr(log, 'executed_at', None))
         log_rows.append(row)
 
+    next_cursor = None
+    if has_more and logs:
+        next_cursor = _encode_keyset_cursor('executed_at', logs[-1].executed_at, logs[-1].id)
+
+    return jsonify({
+        'success': True,
+        'logs': log_rows,
+        'next_cursor': next_cursor,
+        'has_more': has_more
+    })
+
+
+@app.route('/api/loops/<int:loop_id>/logs/daily', methods=['GET'])
+@login_required
+@require_active_workspace
+@require_workspace_loops_admin
+def api_get_loop_daily_stats(loop_id):
+    """Daily execution rollups for a loop (days older than the raw log retention)"""
+    ws_id = get_active_workspace_id()
+    loop = get_visible_loop_or_404(loop_id, workspace_id=ws_id)
+
+    days = max(1, min(request.args.get('days', 90, type=int), 366))
+    since = datetime.utcnow().date() - timedelta(days=days)
+    stats = LoopExecutionDailyStat.query.filter(
+        LoopExecutionDailyStat.loop_config_id == loop.id,
+        LoopExecutionDailyStat.day >= since
+    ).order_by(LoopExecutionDailyStat.day.desc(), LoopExecutionDailyStat.action).all()
+
     return jsonify({
         'success': True,
-        'logs': log_rows
+        'retention_days': LOOP_LOG_RETENTION_DAYS,
+        'stats': [stat.to_dict() for stat in stats]
     })
 
 
@@ -14942,83 +18265,358 @@ def api_get_loop_duplicates(loop_id):
     })
 
 
+# ==================== LOOP DUPLICATE CLEANUP ====================
+
+# Cleanups run in the background: duplicates are deleted from PF concurrently
+# (sharing the per-key rate limiter) and checkpointed one batch at a time.
+LOOP_CLEANUP_CONCURRENCY = _env_int('LOOP_CLEANUP_CONCURRENCY', 4)
+LOOP_CLEANUP_BATCH_SIZE = 50
+# A running job without a checkpoint for this long belongs to a dead worker.
+LOOP_CLEANUP_STALE_SECONDS = 10 * 60
+LOOP_CLEANUP_SWEEP_SECONDS = 60
+
+_loop_cleanup_jobs_running = set()
+_loop_cleanup_jobs_lock = threading.Lock()
+
+
+def schedule_loop_cleanup_job(job_id):
+    """Hand a cleanup job to the background scheduler."""
+    loop_scheduler.add_job(
+        run_loop_cleanup_job,
+        args=[job_id],
+        id=f'loop_cleanup_job_{job_id}',
+        name=f'Loop cleanup job {job_id}',
+        replace_existing=True
+    )
+
+
+def _pending_loop_duplicates_query(loop_id):
+    return DuplicatedListing.query.filter_by(loop_config_id=loop_id, status='published')
+
+
+def _claim_loop_cleanup_job(job_id):
+    """Mark a job running unless another live worker holds it; returns True if claimed."""
+    jobs = LoopCleanupJob.__table__
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=LOOP_CLEANUP_STALE_SECONDS)
+    claimed = db.session.execute(
+        jobs.update()
+        .where(
+            jobs.c.id == job_id,
+            db.or_(
+                jobs.c.status == LoopCleanupJob.STATUS_QUEUED,
+                db.and_(
+                    jobs.c.status == LoopCleanupJob.STATUS_RUNNING,
+                    db.or_(jobs.c.heartbeat_at == None, jobs.c.heartbeat_at < stale_before)
+                )
+            )
+        )
+        .values(
+            status=LoopCleanupJob.STATUS_RUNNING,
+            started_at=db.func.coalesce(jobs.c.started_at, now),
+            heartbeat_at=now
+        )
+    ).rowcount
+    db.session.commit()
+    return bool(claimed)
+
+
+def _delete_duplicate_from_pf(clients, pf_listing_id):
+    """Delete one duplicate from PF; returns an error string or None."""
+    if not pf_listing_id:
+        return None
+    client = clients.get()
+    try:
+        client.delete_listing(pf_listing_id)
+        return None
+    except PropertyFinderAPIError as e:
+        if e.status_code == 404:
+            return None  # already gone from PF
+        return f"{pf_listing_id}: {e.message}"
+    except Exception as e:
+        return f"{pf_listing_id}: {e}"
+    finally:
+        clients.put(client)
+
+
+def run_loop_cleanup_job(job_id):
+    """Background job: delete a loop's published duplicates from PF, batch by batch.
+
+    Each batch is deleted concurrently, then its rows are marked deleted and
+    the job's counters are committed. Cancelling takes effect between batches.
+    Duplicates that fail stay 'published', so a later cleanup retries them.
+    """
+    with _loop_cleanup_jobs_lock:
+        if job_id in _loop_cleanup_jobs_running:
+            return
+        _loop_cleanup_jobs_running.add(job_id)
+    try:
+        with app.app_context():
+            try:
+                if not _claim_loop_cleanup_job(job_id):
+                    return
+                job = db.session.get(LoopCleanupJob, job_id)
+                loop_id, workspace_id = job.loop_config_id, job.workspace_id
+
+                from concurrent.futures import ThreadPoolExecutor
+                clients = queue.Queue()
+                for _ in range(LOOP_CLEANUP_CONCURRENCY):
+                    clients.put(get_client(workspace_id=workspace_id))
+                dups = DuplicatedListing.__table__
+                after_id = 0
+                with ThreadPoolExecutor(max_workers=LOOP_CLEANUP_CONCURRENCY,
+                                        thread_name_prefix=f'loop-cleanup-{job_id}') as executor:
+                    while True:
+                        status = db.session.query(LoopCleanupJob.status).filter_by(id=job_id).scalar()
+                        if status != LoopCleanupJob.STATUS_RUNNING:
+                            return
+                        batch = _pending_loop_duplicates_query(loop_id).filter(
+                            DuplicatedListing.id > after_id
+                        ).order_by(DuplicatedListing.id).with_entities(
+                            DuplicatedListing.id, DuplicatedListing.pf_listing_id
+                        ).limit(LOOP_CLEANUP_BATCH_SIZE).all()
+                        db.session.commit()  # don't hold a transaction open across PF calls
+                        if not batch:
+                            break
+                        after_id = batch[-1].id
+
+                        errors = list(executor.map(
+                            lambda row: _delete_duplicate_from_pf(clients, row.pf_listing_id), batch
+                        ))
+                        deleted_ids = [row.id for row, error in zip(batch, errors) if error is None]
+                        failures = [error for error in errors if error is not None]
+
+                        now = datetime.utcnow()
+                        if deleted_ids:
+                            db.session.execute(
+                                dups.update()
+                                .where(dups.c.id.in_(deleted_ids), dups.c.status == 'published')
+                                .values(status='deleted', deleted_at=now)
+                            )
+                        job = db.session.get(LoopCleanupJob, job_id)
+                        job.deleted_count = (job.deleted_count or 0) + len(deleted_ids)
+                        job.failed_count = (job.failed_count or 0) + len(failures)
+                        if failures:
+                            job.last_error = failures[-1]
+                        job.heartbeat_at = now
+                        db.session.commit()
+
+                job = db.session.get(LoopCleanupJob, job_id)
+                if job.status == LoopCleanupJob.STATUS_RUNNING:
+                    job.status = LoopCleanupJob.STATUS_COMPLETED
+                    job.finished_at = datetime.utcnow()
+                    db.session.commit()
+                print(f"[LOOP] Cleanup job {job_id} (loop {loop_id}): deleted={job.deleted_count}, failed={job.failed_count}")
+            except Exception as e:
+                db.session.rollback()
+                print(f"[LOOP] Cleanup job {job_id} failed: {e}")
+                # Terminal: the recovery sweep only picks up queued/running jobs.
+                # Progress already committed stays; a new cleanup retries what is left.
+                try:
+                    job = db.session.get(LoopCleanupJob, job_id)
+                    if job and job.status in LoopCleanupJob.ACTIVE_STATUSES:
+                        job.status = LoopCleanupJob.STATUS_FAILED
+                        job.last_error = str(e)
+                        job.finished_at = datetime.utcnow()
+                        db.session.commit()
+                except Exception:
+                    db.session.rollback()
+            finally:
+                db.session.remove()
+    finally:
+        with _loop_cleanup_jobs_lock:
+            _loop_cleanup_jobs_running.discard(job_id)
+
+
+def recover_loop_cleanup_jobs():
+    """Reschedule queued cleanups and running ones whose worker stopped checkpointing."""
+    with app.app_context():
+        try:
+            stale_before = datetime.utcnow() - timedelta(seconds=LOOP_CLEANUP_STALE_SECONDS)
+            job_ids = [job_id for (job_id,) in db.session.query(LoopCleanupJob.id).filter(
+                db.or_(
+                    LoopCleanupJob.status == LoopCleanupJob.STATUS_QUEUED,
+                    db.and_(
+                        LoopCleanupJob.status == LoopCleanupJob.STATUS_RUNNING,
+                        db.or_(LoopCleanupJob.heartbeat_at == None, LoopCleanupJob.heartbeat_at < stale_before)
+                    )
+                )
+            ).all()]
+            with _loop_cleanup_jobs_lock:
+                idle = [job_id for job_id in job_ids if job_id not in _loop_cleanup_jobs_running]
+            for job_id in idle:
+                schedule_loop_cleanup_job(job_id)
+        except Exception as e:
+            db.session.rollback()
+            print(f"[LOOP] Cleanup job recovery failed: {e}")
+        finally:
+            db.session.remove()
+
+
+register_leader_job(
+    'loop_cleanup_recovery',
+    func=recover_loop_cleanup_jobs,
+    trigger=IntervalTrigger(seconds=LOOP_CLEANUP_SWEEP_SECONDS),
+    name='Resume unfinished loop cleanups',
+    next_run_time=datetime.now()
+)
+
+
+def _loop_cleanup_job_payload(job):
+    remaining = _pending_loop_duplicates_query(job.loop_config_id).count()
+    return job.to_dict(remaining=remaining)
+
+
 @app.route('/api/loops/<int:loop_id>/cleanup', methods=['POST'])
 @login_required
 @require_active_workspace
 @require_workspace_loops_admin
 def api_cleanup_loop_duplicates(loop_id):
-    """Delete all duplicates created by a loop from PropertyFinder"""
+    """Stop a loop and start deleting all its duplicates from PropertyFinder in the background"""
     ws_id = get_active_workspace_id()
     loop = get_visible_loop_or_404(loop_id, workspace_id=ws_id)
     
     # Stop the loop first
     loop.is_active = False
     loop.is_paused = False
-    
-    client = get_client(workspace_id=ws_id)
-    deleted_count = 0
-    errors = []
-    
-    duplicates = DuplicatedListing.query.filter_by(
-        loop_config_id=loop_id,
-        status='published'
-    ).all()
-    
-    for dup in duplicates:
-        try:
-            if dup.pf_listing_id:
-                client.delete_listing(dup.pf_listing_id)
-            dup.status = 'deleted'
-            dup.deleted_at = datetime.utcnow()
-            deleted_count += 1
-        except Exception as e:
-            errors.append(f"{dup.pf_listing_id}: {str(e)}")
-    
+
+    job = LoopCleanupJob.query.filter(
+        LoopCleanupJob.loop_config_id == loop.id,
+        LoopCleanupJob.status.in_(LoopCleanupJob.ACTIVE_STATUSES)
+    ).order_by(LoopCleanupJob.id.desc()).first()
+    if job is None:
+        job = LoopCleanupJob(
+            loop_config_id=loop.id,
+            workspace_id=ws_id,
+            created_by_id=g.user.id if g.user else None,
+            status=LoopCleanupJob.STATUS_QUEUED,
+            total=_pending_loop_duplicates_query(loop.id).count()
+        )
+        db.session.add(job)
     db.session.commit()
+    schedule_loop_cleanup_job(job.id)
     
     return jsonify({
         'success': True,
-        'message': f'Deleted {deleted_count} duplicates from PropertyFinder',
-        'deleted_count': deleted_count,
-        'errors': errors if errors else None
+        'message': f'Deleting {job.total or 0} duplicates from PropertyFinder in the background',
+        'job': _loop_cleanup_job_payload(job)
+    }), 202
+
+
+@app.route('/api/loops/<int:loop_id>/cleanup', methods=['GET'])
+@login_required
+@require_active_workspace
+@require_workspace_loops_admin
+def api_get_loop_cleanup(loop_id):
+    """Progress of the loop's latest duplicate cleanup"""
+    ws_id = get_active_workspace_id()
+    loop = get_visible_loop_or_404(loop_id, workspace_id=ws_id)
+
+    job = LoopCleanupJob.query.filter_by(loop_config_id=loop.id).order_by(LoopCleanupJob.id.desc()).first()
+    return jsonify({
+        'success': True,
+        'job': _loop_cleanup_job_payload(job) if job else None
     })
 
 
+@app.route('/api/loops/<int:loop_id>/cleanup/cancel', methods=['POST'])
+@login_required
+@require_active_workspace
+@require_workspace_loops_admin
+def api_cancel_loop_cleanup(loop_id):
+    """Cancel the loop's running cleanup (duplicates already deleted stay deleted)"""
+    ws_id = get_active_workspace_id()
+    loop = get_visible_loop_or_404(loop_id, workspace_id=ws_id)
+
+    job = LoopCleanupJob.query.filter(
+        LoopCleanupJob.loop_config_id == loop.id,
+        LoopCleanupJob.status.in_(LoopCleanupJob.ACTIVE_STATUSES)
+    ).order_by(LoopCleanupJob.id.desc()).first()
+    if not job:
+        return jsonify({'success': False, 'error': 'No cleanup in progress'}), 404
+    job.status = LoopCleanupJob.STATUS_CANCELLED
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    return jsonify({'success': True, 'job': _loop_cleanup_job_payload(job)})
+
+
 # ==================== LISTING IMAGES ENDPOINTS ====================
 
+LISTING_SUMMARY_PAGE_SIZE = 50
+LISTING_SUMMARY_MAX_PAGE_SIZE = 200
+
+
 @app.route('/api/listings/summary', methods=['GET'])
 @login_required
 @require_active_workspace
 def api_listings_summary():
-    """Get summary of all listings for dropdown selection"""
+    """Page of listing summaries for dropdown selection.
+
+    Only the rendered columns are selected. Pages are ordered by reference
+    and continued with `cursor`; `prefix` narrows to references or titles
+    starting with the typed text.
+    """
     try:
         ws_id = get_active_workspace_id()
-        listings = visible_local_listing_query(ws_id).order_by(LocalListing.reference).all()
-        
-        result = []
-        for l in listings:
-            # Count images
-            image_count = 0
-            if l.images:
-                try:
-                    imgs = json.loads(l.images) if isinstance(l.images, str) else l.images
-                    image_count = len(imgs) if isinstance(imgs, list) else 0
-                except:
-                    pass
-            
-            result.append({
-                'id': l.id,
-                'reference': l.reference or f'ID-{l.id}',
-                'title': l.title_en or 'Untitled',
-                'title_en': l.title_en or 'Untitled',
-                'city': l.city,
-                'property_type': l.property_type,
-                'offering_type': l.offering_type,
-                'status': l.status or 'draft',
-                'image_count': image_count
-            })
-        
-        return jsonify({'listings': result})
+        try:
+            limit = int(request.args.get('limit', LISTING_SUMMARY_PAGE_SIZE))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'limit must be an integer'}), 400
+        limit = max(1, min(limit, LISTING_SUMMARY_MAX_PAGE_SIZE))
+
+        query = visible_local_listing_query(ws_id).with_entities(
+            LocalListing.id,
+            LocalListing.reference,
+            LocalListing.title_en,
+            LocalListing.city,
+            LocalListing.property_type,
+            LocalListing.status,
+            LocalListing.image_count,
+        )
+
+        prefix = (request.args.get('prefix') or '').strip().lower()
+        if prefix:
+            query = query.filter(db.or_(
+                db.func.lower(LocalListing.reference).startswith(prefix, autoescape=True),
+                db.func.lower(LocalListing.title_en).startswith(prefix, autoescape=True),
+            ))
+
+        raw_cursor = (request.args.get('cursor') or '').strip()
+        if raw_cursor:
+            try:
+                after_reference, after_id = _decode_keyset_cursor(raw_cursor, 'reference')
+                if after_reference is None:
+                    raise ValueError('cursor is invalid')
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            query = query.filter(db.or_(
+                LocalListing.reference > after_reference,
+                db.and_(LocalListing.reference == after_reference, LocalListing.id > after_id),
+            ))
+
+        rows = query.order_by(LocalListing.reference.asc(), LocalListing.id.asc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        result = [{
+            'id': row.id,
+            'reference': row.reference or f'ID-{row.id}',
+            'title': row.title_en or 'Untitled',
+            'city': row.city,
+            'property_type': row.property_type,
+            'status': row.status or 'draft',
+            'image_count': row.image_count or 0,
+        } for row in rows]
+
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = _encode_keyset_cursor('reference', rows[-1].reference, rows[-1].id)
+
+        return jsonify({
+            'listings': result,
+            'next_cursor': next_cursor,
+            'has_more': has_more,
+        })
     except Exception as e:
         import traceback
         print(f"[ERROR] api_listings_summary: {e}")
@@ -15250,38 +18848,54 @@ def api_delete_listing_images(listing_id):
 @login_required
 @require_active_workspace
 def api_search_listings():
-    """Search listings for assignment dropdown"""
+    """Search listings for assignment dropdown.
+
+    mode=typeahead returns a few lightweight rows (no image parsing) for
+    search-as-you-type; the default mode returns ranked full results.
+    """
     query = request.args.get('q', '').strip()
-    limit = min(int(request.args.get('limit', 20)), 50)
+    mode = (request.args.get('mode') or SEARCH_MODE_FULL).strip().lower()
+    if mode not in (SEARCH_MODE_FULL, SEARCH_MODE_TYPEAHEAD):
+        mode = SEARCH_MODE_FULL
+    max_limit = 10 if mode == SEARCH_MODE_TYPEAHEAD else 50
+    limit = min(request.args.get('limit', 8 if mode == SEARCH_MODE_TYPEAHEAD else 20, type=int) or 1, max_limit)
     
     # Build query
     ws_id = get_active_workspace_id()
     listings_query = visible_local_listing_query(ws_id)
     
     if query:
-        search = f'%{query}%'
-        listings_query = listings_query.filter(
-            db.or_(
-                LocalListing.reference.ilike(search),
-                LocalListing.title_en.ilike(search),
-                LocalListing.location.ilike(search),
-                LocalListing.property_type.ilike(search)
-            )
-        )
+        listings_query = listing_search.apply(db, listings_query, query, ranked=True, mode=mode)
+    else:
+        listings_query = listings_query.order_by(LocalListing.updated_at.desc())
+
+    if mode == SEARCH_MODE_TYPEAHEAD:
+        rows = listings_query.with_entities(
+            LocalListing.id,
+            LocalListing.reference,
+            LocalListing.title_en,
+            LocalListing.title_ar,
+            LocalListing.location,
+            LocalListing.property_type,
+            LocalListing.status
+        ).limit(limit).all()
+        results = [{
+            'id': row.id,
+            'reference': row.reference,
+            'title': row.title_en or row.title_ar or f'{row.property_type} in {row.location}',
+            'location': row.location,
+            'status': row.status
+        } for row in rows]
+        return jsonify({
+            'results': results,
+            'count': len(results),
+            'mode': mode
+        })
     
-    listings = listings_query.order_by(LocalListing.updated_at.desc()).limit(limit).all()
+    listings = listings_query.limit(limit).all()
     
     results = []
     for listing in listings:
-        # Count existing images
-        image_count = 0
-        if listing.images:
-            try:
-                images = json.loads(listing.images) if isinstance(listing.images, str) else listing.images
-                image_count = len(images) if isinstance(images, list) else 0
-            except:
-                pass
-        
         results.append({
             'id': listing.id,
             'reference': listing.reference,
@@ -15289,13 +18903,15 @@ def api_search_listings():
             'location': listing.location,
             'property_type': listing.property_type,
             'price': listing.price,
-            'image_count': image_count,
+            'image_count': listing.image_count or 0,
+            'cover_image': listing.cover_image,
             'status': listing.status
         })
     
     return jsonify({
         'results': results,
-        'count': len(results)
+        'count': len(results),
+        'mode': mode
     })
 
 
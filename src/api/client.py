@@ -12,6 +12,7 @@ Authentication Flow:
 Rate Limits:
 - Auth endpoint: 60 requests/minute
 - Other endpoints: 650 requests/minute
+Both are enforced client-side per API key (see rate_limit.py).
 """
 import json
 import time
@@ -20,6 +21,7 @@ import requests
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from .config import Config
+from .rate_limit import rate_limiter_for
 
 
 class PropertyFinderAPIError(Exception):
@@ -184,6 +186,7 @@ class PropertyFinderClient:
             print(f"[DEBUG] Requesting new access token from {token_url}")
         
         try:
+            self.rate_limiter('auth').acquire()
             # Use the session (trust_env is disabled) to avoid proxy/env leakage
             response = self.session.post(
                 token_url,
@@ -233,6 +236,11 @@ class PropertyFinderClient:
         token = self._get_access_token()
         self.session.headers['Authorization'] = f'Bearer {token}'
     
+    def rate_limiter(self, kind: str = 'api'):
+        """Shared limiter for this API key ('auth' or 'api' budget)."""
+        per_minute = Config.AUTH_RATE_LIMIT_PER_MINUTE if kind == 'auth' else Config.RATE_LIMIT_PER_MINUTE
+        return rate_limiter_for((self.base_url, self.api_key, kind), per_minute)
+
     # ==================== REQUEST HANDLER ====================
     
     def _make_request(
@@ -295,6 +303,7 @@ class PropertyFinderClient:
                     if data:
                         print(f"[DEBUG] Data: {json.dumps(data, indent=2)[:500]}...")
                 
+                (self.rate_limiter('auth') if skip_auth else self.rate_limiter()).acquire()
                 response = self.session.request(
                     method=method,
                     url=url,
@@ -326,6 +335,8 @@ class PropertyFinderClient:
                 # Handle rate limiting
                 if response.status_code == 429:
                     retry_after = int(response.headers.get('Retry-After', 60))
+                    if not skip_auth:
+                        self.rate_limiter().penalize(retry_after)
                     if attempt < retries:
                         print(f"Rate limited. Waiting {retry_after} seconds...")
                         time.sleep(retry_after)
@@ -63,8 +63,15 @@ class Config:
     BULK_BATCH_SIZE = int(_clean_env(os.getenv('PF_BULK_BATCH_SIZE', '50')))
     BULK_DELAY_SECONDS = float(_clean_env(os.getenv('PF_BULK_DELAY_SECONDS', '1')))
 
+    # Rate limits (per API key, shared by all clients in the process)
+    RATE_LIMIT_PER_MINUTE = int(_clean_env(os.getenv('PF_RATE_LIMIT_PER_MINUTE', '650')))
+    AUTH_RATE_LIMIT_PER_MINUTE = int(_clean_env(os.getenv('PF_AUTH_RATE_LIMIT_PER_MINUTE', '60')))
+
     # Media warnings
     MAX_IMAGES_WARN = int(_clean_env(os.getenv('PF_MAX_IMAGES_WARN', '15')))
+    # Media URL reachability checks before publish (per request / whole listing)
+    MEDIA_CHECK_TIMEOUT_SECONDS = float(_clean_env(os.getenv('PF_MEDIA_CHECK_TIMEOUT_SECONDS', '5')))
+    MEDIA_CHECK_DEADLINE_SECONDS = float(_clean_env(os.getenv('PF_MEDIA_CHECK_DEADLINE_SECONDS', '20')))
     
     # Default Values for Bulk Upload
     DEFAULT_AGENT_EMAIL = _clean_env(os.getenv('PF_DEFAULT_AGENT_EMAIL', ''))
@@ -0,0 +1,81 @@
+"""
+Process-wide request budgets for the PropertyFinder API.
+
+PF limits are per API key (60 auth requests/minute, 650 requests/minute
+for everything else), but a client instance is created per web request or
+background job. Limiters are therefore shared by key: every client built
+for the same credentials draws from the same token bucket, so a bulk
+publish running in the background and interactive requests together stay
+under the limit instead of each assuming it has the whole budget.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Hashable, Optional
+
+
+class RateLimiter:
+    """Thread-safe token bucket refilled continuously at `per_minute`."""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self._rate = max(float(per_minute), 1.0) / 60.0
+        self._capacity = max(float(burst if burst is not None else per_minute), 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def per_minute(self) -> float:
+        return self._rate * 60.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, sleeping until one is available.
+
+        Returns False if `timeout` seconds pass first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self._rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket so callers back off after a 429 from PF."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - max(float(seconds), 0.0) * self._rate
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+_limiters: Dict[Hashable, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def rate_limiter_for(key: Hashable, per_minute: float) -> RateLimiter:
+    """Shared limiter for `key` (created on first use)."""
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(per_minute)
+            _limiters[key] = limiter
+        return limiter
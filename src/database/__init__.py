@@ -2,21 +2,25 @@
 Database module
 """
 from .models import (
-    db, LocalListing, PFSession, User, PFCache, Lead, LeadUserTag, LeadReminder, LeadComment, Contact, Customer, AppSettings, ListingFolder,
-    LoopConfig, LoopListing, DuplicatedListing, LoopExecutionLog,
+    db, LocalListing, PFSession, User, PFCache, PublishJob, PublishJobItem, Lead, LeadUserTag, LeadExportJob, LeadReminder, LeadComment, Contact, Customer, AppSettings, ListingFolder,
+    LoopConfig, LoopListing, DuplicatedListing, LoopCleanupJob, LoopExecutionLog, LoopExecutionDailyStat, SchedulerLease,
     TaskBoard, TaskLabel, Task, TaskComment, task_label_association,
     BoardMember, task_assignee_association, BOARD_PERMISSIONS,
     Workspace, WorkspaceMember, WorkspaceConnection, WorkspaceApiCredential, WorkspaceInvite, PasswordResetToken,
     WorkspaceUserPermissionOverride,
-    SystemRole, UserSystemRole, WorkspaceRole, ModulePermission, ObjectACL, FeatureFlag, AuditLog
+    SystemRole, UserSystemRole, WorkspaceRole, ModulePermission, ObjectACL, FeatureFlag, AuditLog,
+    normalize_phone_e164, normalize_email_key, normalize_search_text,
+    parse_listing_image_urls
 )
 
 __all__ = [
-    'db', 'LocalListing', 'PFSession', 'User', 'PFCache', 'Lead', 'LeadUserTag', 'LeadReminder', 'LeadComment', 'Contact', 'Customer', 'AppSettings', 'ListingFolder',
-    'LoopConfig', 'LoopListing', 'DuplicatedListing', 'LoopExecutionLog',
+    'db', 'LocalListing', 'PFSession', 'User', 'PFCache', 'PublishJob', 'PublishJobItem', 'Lead', 'LeadUserTag', 'LeadExportJob', 'LeadReminder', 'LeadComment', 'Contact', 'Customer', 'AppSettings', 'ListingFolder',
+    'LoopConfig', 'LoopListing', 'DuplicatedListing', 'LoopCleanupJob', 'LoopExecutionLog', 'LoopExecutionDailyStat', 'SchedulerLease',
     'TaskBoard', 'TaskLabel', 'Task', 'TaskComment', 'task_label_association',
     'BoardMember', 'task_assignee_association', 'BOARD_PERMISSIONS',
     'Workspace', 'WorkspaceMember', 'WorkspaceConnection', 'WorkspaceApiCredential', 'WorkspaceInvite', 'PasswordResetToken',
     'WorkspaceUserPermissionOverride',
-    'SystemRole', 'UserSystemRole', 'WorkspaceRole', 'ModulePermission', 'ObjectACL', 'FeatureFlag', 'AuditLog'
+    'SystemRole', 'UserSystemRole', 'WorkspaceRole', 'ModulePermission', 'ObjectACL', 'FeatureFlag', 'AuditLog',
+    'normalize_phone_e164', 'normalize_email_key', 'normalize_search_text',
+    'parse_listing_image_urls'
 ]
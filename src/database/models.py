@@ -2,6 +2,7 @@
 Database Models for Local Listings Storage
 """
 import re
+import unicodedata
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -54,6 +55,148 @@ def convert_google_drive_url(url):
     return url
 
 
+DEFAULT_PHONE_COUNTRY_CODE = '+971'  # UAE
+
+
+def normalize_phone_e164(value, default_country_code=DEFAULT_PHONE_COUNTRY_CODE):
+    """Best-effort E.164 form of a phone number used as a duplicate-match key.
+
+    Accepts '+971 50 123 4567', '00971501234567', '0501234567' (local numbers
+    get `default_country_code`) and returns e.g. '+971501234567', or None
+    when the value does not look like a phone number.
+    """
+    raw = str(value or '').strip()
+    if not raw:
+        return None
+    digits = re.sub(r'\D', '', raw)
+    if not digits:
+        return None
+    if raw.startswith('+'):
+        normalized = digits
+    elif digits.startswith('00'):
+        normalized = digits[2:]
+    elif digits.startswith('0'):
+        country_digits = re.sub(r'\D', '', default_country_code or '')
+        normalized = country_digits + digits.lstrip('0')
+    elif len(digits) >= 11:
+        # Long numbers without a prefix already carry their country code.
+        normalized = digits
+    else:
+        country_digits = re.sub(r'\D', '', default_country_code or '')
+        normalized = country_digits + digits
+    if not 8 <= len(normalized) <= 15:
+        return None
+    return f'+{normalized}'
+
+
+def normalize_email_key(value):
+    """Lower-cased, trimmed email used as a duplicate-match key (None if invalid)."""
+    email = str(value or '').strip().lower()
+    if not email or '@' not in email:
+        return None
+    return email[:120]
+
+
+_ARABIC_MARKS_RE = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+_ARABIC_LETTER_FOLDS = str.maketrans({
+    '\u0623': '\u0627', '\u0625': '\u0627', '\u0622': '\u0627', '\u0671': '\u0627',  # alef variants -> alef
+    '\u0649': '\u064a',  # alef maksura -> yeh
+    '\u0629': '\u0647',  # teh marbuta -> heh
+    '\u0624': '\u0648',  # waw with hamza -> waw
+    '\u0626': '\u064a',  # yeh with hamza -> yeh
+})
+
+
+def normalize_search_text(*values):
+    """Lower-cased search text with Arabic diacritics/tatweel removed and letter variants folded.
+
+    Used both for stored listing search documents and for incoming search
+    terms, so 'Marina' matches 'MARINA' and 'مرسى' matches 'مَرسى'.
+    """
+    text = ' '.join(str(value) for value in values if value)
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKC', text).lower()
+    text = _ARABIC_MARKS_RE.sub('', text).translate(_ARABIC_LETTER_FOLDS)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def parse_listing_image_urls(raw_images):
+    """Parse a listing `images` value (JSON list, legacy pipe-separated string
+    or PropertyFinder media dicts) into a list of display URLs."""
+    import json
+    
+    if not raw_images:
+        return []
+    
+    images = []
+    
+    if isinstance(raw_images, list):
+        images = raw_images
+    else:
+        # Try JSON format first (new format from image editor)
+        try:
+            parsed = json.loads(raw_images)
+            if isinstance(parsed, list):
+                images = parsed
+        except (json.JSONDecodeError, TypeError):
+            # Fall back to pipe-separated format (legacy)
+            images = raw_images.split('|')
+    
+    # Convert relative paths to URLs and filter out invalid entries
+    result = []
+    for img in images:
+        if not img:  # Skip None, empty strings, etc.
+            continue
+            
+        url = None
+        
+        if isinstance(img, str):
+            img = img.strip()
+            if not img or img.lower() == 'none':  # Skip empty or "None" strings
+                continue
+                
+            # If it's a relative path (e.g., "listings/123/img.jpg"), prefix with /uploads/
+            if img.startswith('listings/') or img.startswith('uploads/'):
+                if not img.startswith('/'):
+                    url = '/uploads/' + (img[len('uploads/'):] if img.startswith('uploads/') else img)
+                else:
+                    url = img
+            elif img.startswith('http'):
+                # Already a full URL
+                url = img
+            elif img.startswith('/'):
+                # Already an absolute path
+                url = img
+            elif img.startswith('temp/'):
+                url = '/uploads/' + img
+            else:
+                # Assume it's a relative path, prefix with /uploads/
+                url = '/uploads/' + img
+                
+        elif isinstance(img, dict):
+            # Handle PropertyFinder format: {original: {url: "..."}}
+            url = img.get('url') or (img.get('original', {}).get('url') if img.get('original') else None)
+        
+        # Only add valid URLs
+        if url and url.lower() != 'none' and len(url) > 1:
+            result.append(url)
+    
+    return result
+
+
+def pf_payload_field_hashes(payload):
+    """Short content hash of each top-level field of a PropertyFinder payload."""
+    import hashlib
+    import json
+
+    hashes = {}
+    for key, value in (payload or {}).items():
+        encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+        hashes[key] = hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+    return hashes
+
+
 # ==================== USER & AUTHENTICATION ====================
 
 class User(db.Model):
@@ -1442,8 +1585,8 @@ class ListingFolder(db.Model):
         'fa-tag', 'fa-bookmark', 'fa-flag', 'fa-bell', 'fa-clock'
     ]
     
-    def to_dict(self):
-        """Convert to dictionary"""
+    def to_dict(self, listing_count=None):
+        """Convert to dictionary (pass `listing_count` when already known)."""
         return {
             'id': self.id,
             'owner_user_id': self.owner_user_id,
@@ -1452,7 +1595,7 @@ class ListingFolder(db.Model):
             'icon': self.icon,
             'description': self.description,
             'parent_id': self.parent_id,
-            'listing_count': self.listings.count(),
+            'listing_count': self.listings.count() if listing_count is None else listing_count,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -1504,6 +1647,14 @@ class LocalListing(db.Model):
         db.Index('idx_listings_type_beds_price', 'property_type', 'bedrooms', 'price'),
         db.Index('idx_listings_workspace_status', 'workspace_id', 'status'),
     )
+
+    # Text fields folded into `search_document` (see normalize_search_text)
+    SEARCH_DOCUMENT_FIELDS = (
+        'reference', 'title_en', 'title_ar', 'location', 'city', 'property_type',
+        'description_en', 'description_ar',
+    )
+    # Large text columns that collection views (to_dict_collection) skip.
+    DEFERRED_LIST_COLUMNS = ('description_en', 'description_ar', 'original_images', 'search_document')
     
     id = db.Column(db.Integer, primary_key=True)
     workspace_id = db.Column(db.Integer, db.ForeignKey('workspaces.id'), nullable=True, index=True)
@@ -1547,6 +1698,9 @@ class LocalListing(db.Model):
     video_tour = db.Column(db.String(500))
     video_360 = db.Column(db.String(500))
     original_images = db.Column(db.Text)  # JSON array of original image paths
+    # Denormalized from `images` on write so list views never parse image JSON
+    image_count = db.Column(db.Integer, default=0)
+    cover_image = db.Column(db.Text)
     
     # Amenities
     amenities = db.Column(db.Text)  # Comma-separated list
@@ -1574,74 +1728,80 @@ class LocalListing(db.Model):
     synced_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Normalized search text (indexed by pg_trgm / SQLite FTS5, see services.listing_search)
+    search_document = db.Column(db.Text)
+    # JSON {field: hash} of the last payload pushed to PF (the `media` entry covers the image set)
+    pf_payload_hashes = db.Column(db.Text)
+
+    @db.validates(*SEARCH_DOCUMENT_FIELDS)
+    def _validate_search_fields(self, key, value):
+        values = [value if field == key else getattr(self, field) for field in self.SEARCH_DOCUMENT_FIELDS]
+        self.search_document = normalize_search_text(*values) or None
+        return value
+    
+    def pf_changed_fields(self, payload):
+        """Top-level PF payload fields that differ from the last push (None if never recorded)."""
+        import json
+
+        if not self.pf_payload_hashes:
+            return None
+        try:
+            previous = json.loads(self.pf_payload_hashes)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(previous, dict):
+            return None
+        current = pf_payload_field_hashes(payload)
+        return sorted(key for key in set(previous) | set(current) if previous.get(key) != current.get(key))
+
+    def remember_pf_payload(self, payload):
+        """Record the payload PF now holds for this listing (None forgets it)."""
+        import json
+
+        self.pf_payload_hashes = json.dumps(pf_payload_field_hashes(payload), sort_keys=True) if payload else None
+
+    @classmethod
+    def derived_column_values(cls, values):
+        """search_document/image_count/cover_image for a column dict.
+
+        Mirrors the validators below for Core bulk inserts/updates, which
+        bypass them.
+        """
+        urls = parse_listing_image_urls(values.get('images'))
+        return {
+            'search_document': normalize_search_text(*(values.get(f) for f in cls.SEARCH_DOCUMENT_FIELDS)) or None,
+            'image_count': len(urls),
+            'cover_image': urls[0] if urls else None,
+        }
     
     def get_images(self):
         """Public method to get parsed images list"""
         return self._parse_images()
     
     def _parse_images(self):
-        """Parse images from various storage formats and return URLs"""
-        import json
-        
-        if not self.images:
-            return []
-        
-        images = []
-        
-        # Try JSON format first (new format from image editor)
-        try:
-            parsed = json.loads(self.images)
-            if isinstance(parsed, list):
-                images = parsed
-        except (json.JSONDecodeError, TypeError):
-            # Fall back to pipe-separated format (legacy)
-            images = self.images.split('|') if self.images else []
-        
-        # Convert relative paths to URLs and filter out invalid entries
-        result = []
-        for img in images:
-            if not img:  # Skip None, empty strings, etc.
-                continue
-                
-            url = None
-            
-            if isinstance(img, str):
-                img = img.strip()
-                if not img or img.lower() == 'none':  # Skip empty or "None" strings
-                    continue
-                    
-                # If it's a relative path (e.g., "listings/123/img.jpg"), prefix with /uploads/
-                if img.startswith('listings/') or img.startswith('uploads/'):
-                    if not img.startswith('/'):
-                        url = '/uploads/' + img.lstrip('uploads/')
-                    else:
-                        url = img
-                elif img.startswith('http'):
-                    # Already a full URL
-                    url = img
-                elif img.startswith('/'):
-                    # Already an absolute path
-                    url = img
-                elif img.startswith('temp/'):
-                    url = '/uploads/' + img
-                else:
-                    # Assume it's a relative path, prefix with /uploads/
-                    url = '/uploads/' + img
-                    
-            elif isinstance(img, dict):
-                # Handle PropertyFinder format: {original: {url: "..."}}
-                url = img.get('url') or (img.get('original', {}).get('url') if img.get('original') else None)
-            
-            # Only add valid URLs
-            if url and url.lower() != 'none' and len(url) > 1:
-                result.append(url)
-        
-        return result
+        """Parsed image URLs, memoized per instance until `images` changes"""
+        memo = getattr(self, '_images_memo', None)
+        if memo is None or memo[0] != self.images:
+            memo = (self.images, parse_listing_image_urls(self.images))
+            self._images_memo = memo
+        return list(memo[1])
+
+    @db.validates('images')
+    def _validate_images(self, key, value):
+        urls = parse_listing_image_urls(value)
+        self.image_count = len(urls)
+        self.cover_image = urls[0] if urls else None
+        self._images_memo = (value, urls)
+        return value
 
     def _parse_original_images(self):
-        """Parse original_images list and return URLs"""
+        """Parse original_images list and return URLs (memoized per instance)"""
         import json
         
+        memo = getattr(self, '_original_images_memo', None)
+        if memo is not None and memo[0] == self.original_images:
+            return list(memo[1])
         if not self.original_images:
             return []
         
@@ -1667,11 +1827,22 @@ class LocalListing(db.Model):
                     result.append(img)
                 else:
                     result.append('/uploads/' + img.lstrip('/'))
-        return result
+        self._original_images_memo = (self.original_images, result)
+        return list(result)
     
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
+    def to_dict(self, include_heavy_fields=True, related=None):
+        """Convert to dictionary.
+
+        `related` holds assignee names and folder dicts pre-loaded by
+        `to_dict_collection`, so no relationship is lazy-loaded per row.
+        """
+        if related is None:
+            assigned_to_name = self.assigned_to.name if self.assigned_to else None
+            folder = self.folder.to_dict() if self.folder else None
+        else:
+            assigned_to_name = related['assignee_names'].get(self.assigned_to_id)
+            folder = related['folders'].get(self.folder_id)
+        data = {
             'id': self.id,
             'reference': self.reference,
             'emirate': self.emirate,
@@ -1694,15 +1865,15 @@ class LocalListing(db.Model):
             'rent_frequency': self.rent_frequency,
             'title_en': self.title_en,
             'title_ar': self.title_ar,
-            'description_en': self.description_en,
-            'description_ar': self.description_ar,
             'images': self._parse_images(),
+            'image_count': self.image_count or 0,
+            'cover_image': self.cover_image,
             'video_tour': self.video_tour,
             'video_360': self.video_360,
             'amenities': self.amenities.split(',') if self.amenities else [],
             'assigned_agent': self.assigned_agent,
             'assigned_to_id': self.assigned_to_id,
-            'assigned_to_name': self.assigned_to.name if self.assigned_to else None,
+            'assigned_to_name': assigned_to_name,
             'owner_id': self.owner_id,
             'owner_name': self.owner_name,
             'developer': self.developer,
@@ -1713,12 +1884,56 @@ class LocalListing(db.Model):
             'status': self.status,
             'pf_listing_id': self.pf_listing_id,
             'folder_id': self.folder_id,
-            'folder': self.folder.to_dict() if self.folder else None,
+            'folder': folder,
             'synced_at': self.synced_at.isoformat() if self.synced_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'original_images': self._parse_original_images(),
         }
+        if include_heavy_fields:
+            data['description_en'] = self.description_en
+            data['description_ar'] = self.description_ar
+            data['original_images'] = self._parse_original_images()
+        return data
+
+    @classmethod
+    def collection_load_options(cls):
+        """Query options deferring the columns list views never render."""
+        return [db.defer(getattr(cls, name)) for name in cls.DEFERRED_LIST_COLUMNS]
+
+    @classmethod
+    def to_dict_collection(cls, listings, include_heavy_fields=False):
+        """Serialize many listings with a constant number of queries.
+
+        Assignee names, folders and folder listing counts are fetched with
+        one IN/GROUP BY query each instead of lazy loads per row. Heavy
+        fields (descriptions, original images) are skipped unless asked for.
+        """
+        listings = list(listings)
+        assignee_ids = {l.assigned_to_id for l in listings if l.assigned_to_id}
+        folder_ids = {l.folder_id for l in listings if l.folder_id}
+
+        assignee_names = {}
+        if assignee_ids:
+            assignee_names = dict(
+                db.session.query(User.id, User.name).filter(User.id.in_(assignee_ids)).all()
+            )
+
+        folders = {}
+        if folder_ids:
+            listing_counts = dict(
+                db.session.query(cls.folder_id, db.func.count(cls.id))
+                .filter(cls.folder_id.in_(folder_ids))
+                .group_by(cls.folder_id)
+                .all()
+            )
+            for folder in ListingFolder.query.filter(ListingFolder.id.in_(folder_ids)).all():
+                folders[folder.id] = folder.to_dict(listing_count=listing_counts.get(folder.id, 0))
+
+        related = {'assignee_names': assignee_names, 'folders': folders}
+        return [
+            listing.to_dict(include_heavy_fields=include_heavy_fields, related=related)
+            for listing in listings
+        ]
     
     @classmethod
     def from_dict(cls, data):
@@ -2161,6 +2376,94 @@ class PFCache(db.Model):
         }
 
 
+class PublishJob(db.Model):
+    """Background bulk publish of local listings to PropertyFinder"""
+    __tablename__ = 'publish_jobs'
+    __table_args__ = (
+        db.Index('idx_publish_jobs_workspace_created', 'workspace_id', 'created_at'),
+        db.Index('idx_publish_jobs_status', 'status'),
+    )
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CANCELLED = 'cancelled'
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    id = db.Column(db.Integer, primary_key=True)
+    workspace_id = db.Column(db.Integer, db.ForeignKey('workspaces.id'), nullable=False)
+    created_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_QUEUED)
+    total = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    items = db.relationship('PublishJobItem', backref='job', lazy='dynamic', cascade='all, delete-orphan')
+
+    def to_dict(self, counts=None):
+        return {
+            'id': self.id,
+            'workspace_id': self.workspace_id,
+            'created_by_id': self.created_by_id,
+            'status': self.status,
+            'total': self.total or 0,
+            'counts': counts or {},
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class PublishJobItem(db.Model):
+    """One listing inside a PublishJob, with its own status and outcome"""
+    __tablename__ = 'publish_job_items'
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'listing_id', name='uq_publish_job_item_listing'),
+        db.Index('idx_publish_job_items_job_status', 'job_id', 'status'),
+        db.Index('idx_publish_job_items_status_started', 'status', 'started_at'),
+    )
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+    FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED, STATUS_CANCELLED)
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('publish_jobs.id', ondelete='CASCADE'), nullable=False)
+    listing_id = db.Column(db.Integer, db.ForeignKey('listings.id', ondelete='SET NULL'), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_QUEUED)
+    attempts = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text, nullable=True)
+    pf_listing_id = db.Column(db.String(100), nullable=True)
+    local_status = db.Column(db.String(20), nullable=True)
+    warnings = db.Column(db.Text, nullable=True)  # JSON list
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=True)  # retry backoff for requeued items
+
+    def to_dict(self):
+        import json
+        try:
+            warnings = json.loads(self.warnings) if self.warnings else []
+        except Exception:
+            warnings = []
+        return {
+            'listing_id': self.listing_id,
+            'status': self.status,
+            'attempts': self.attempts or 0,
+            'error': self.error,
+            'pf_listing_id': self.pf_listing_id,
+            'local_status': self.local_status,
+            'warnings': warnings,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None
+        }
+
+
 # ==================== CRM: LEADS ====================
 
 class Lead(db.Model):
@@ -2186,6 +2489,11 @@ class Lead(db.Model):
         db.Index('idx_leads_agent_status', 'pf_agent_id', 'status'),
         db.Index('idx_leads_workspace_status', 'workspace_id', 'status'),
         db.Index('idx_leads_workspace_tags', 'workspace_id', 'tags'),
+        # Kanban columns page by (status, created_at) within a workspace
+        db.Index('idx_leads_workspace_status_created', 'workspace_id', 'status', 'created_at'),
+        # Duplicate matching on normalized contact keys
+        db.Index('idx_leads_workspace_phone_normalized', 'workspace_id', 'phone_normalized'),
+        db.Index('idx_leads_workspace_email_normalized', 'workspace_id', 'email_normalized'),
     )
     
     id = db.Column(db.Integer, primary_key=True)
@@ -2201,6 +2509,9 @@ class Lead(db.Model):
     email = db.Column(db.String(120))
     phone = db.Column(db.String(50))
     whatsapp = db.Column(db.String(50))
+    # Normalized match keys (maintained by the validators below)
+    phone_normalized = db.Column(db.String(20))
+    email_normalized = db.Column(db.String(120))
     
     # Inquiry
     message = db.Column(db.Text)
@@ -2237,6 +2548,18 @@ class Lead(db.Model):
     # Relationships
     assigned_to = db.relationship('User', foreign_keys=[assigned_to_id])
     customer = db.relationship('Customer', back_populates='leads')
+
+    @db.validates('phone', 'whatsapp')
+    def _validate_phone_fields(self, key, value):
+        phone = value if key == 'phone' else self.phone
+        whatsapp = value if key == 'whatsapp' else self.whatsapp
+        self.phone_normalized = normalize_phone_e164(phone) or normalize_phone_e164(whatsapp)
+        return value
+
+    @db.validates('email')
+    def _validate_email(self, key, value):
+        self.email_normalized = normalize_email_key(value)
+        return value
     
     def to_dict(self):
         return {
@@ -2339,6 +2662,52 @@ class LeadUserTag(db.Model):
         self.tags = ','.join(normalized) if normalized else None
 
 
+class LeadExportJob(db.Model):
+    """Background lead export written to EXPORTS_FOLDER for later download"""
+    __tablename__ = 'lead_export_jobs'
+    __table_args__ = (
+        db.Index('idx_lead_export_jobs_status', 'status'),
+        db.Index('idx_lead_export_jobs_created', 'created_at'),
+    )
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex, also names the export file
+    workspace_id = db.Column(db.Integer, db.ForeignKey('workspaces.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    format = db.Column(db.String(10), nullable=False)
+    filename = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_QUEUED)
+    rows = db.Column(db.Integer, default=0)
+    size_bytes = db.Column(db.BigInteger, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # last progress write while running
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'workspace_id': self.workspace_id,
+            'user_id': self.user_id,
+            'format': self.format,
+            'filename': self.filename,
+            'status': self.status,
+            'rows': self.rows or 0,
+            'size_bytes': self.size_bytes,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
 class LeadReminder(db.Model):
     """Lead reminder records for events/meetings/actions."""
     __tablename__ = 'lead_reminders'
@@ -2470,6 +2839,8 @@ class Contact(db.Model):
         db.Index('idx_contacts_lead_id', 'lead_id'),
         db.Index('idx_contacts_created_by_id', 'created_by_id'),
         db.Index('idx_contacts_created_at', 'created_at'),
+        db.Index('idx_contacts_workspace_phone_normalized', 'workspace_id', 'phone_normalized'),
+        db.Index('idx_contacts_workspace_email_normalized', 'workspace_id', 'email_normalized'),
     )
     
     id = db.Column(db.Integer, primary_key=True)
@@ -2481,6 +2852,9 @@ class Contact(db.Model):
     company = db.Column(db.String(200))
     notes = db.Column(db.Text)
     tags = db.Column(db.String(500))  # comma-separated
+    # Normalized match keys (maintained by the validators below)
+    phone_normalized = db.Column(db.String(20))
+    email_normalized = db.Column(db.String(120))
     
     # Linked to lead (optional)
     lead_id = db.Column(db.Integer, db.ForeignKey('crm_leads.id'), nullable=True)
@@ -2516,6 +2890,18 @@ class Contact(db.Model):
         ('+49', 'Germany'),
     ]
     
+    @db.validates('phone', 'country_code')
+    def _validate_phone_fields(self, key, value):
+        phone = value if key == 'phone' else self.phone
+        country_code = (value if key == 'country_code' else self.country_code) or DEFAULT_PHONE_COUNTRY_CODE
+        self.phone_normalized = normalize_phone_e164(phone, default_country_code=country_code)
+        return value
+
+    @db.validates('email')
+    def _validate_email(self, key, value):
+        self.email_normalized = normalize_email_key(value)
+        return value
+
     def get_full_phone(self):
         """Get phone with country code"""
         if self.phone.startswith('+'):
@@ -2859,22 +3245,39 @@ class LoopConfig(db.Model):
             'next_run_at': self.next_run_at.isoformat() if self.next_run_at else None,
         }
     
+    def _ordered_listings(self):
+        return self.listings.order_by(LoopListing.order_index, LoopListing.id)
+
     def get_next_listing(self):
-        """Get the next listing in the sequence"""
-        listings = self.listings.order_by(LoopListing.order_index).all()
-        if not listings:
-            return None
-        
-        # Wrap around if at end
-        index = self.current_index % len(listings)
-        return listings[index]
-    
-    def advance_index(self):
-        """Move to next listing in sequence"""
-        count = self.listings.count()
-        if count > 0:
-            self.current_index = (self.current_index + 1) % count
-        db.session.commit()
+        """Get the next listing in the sequence (one indexed OFFSET lookup)"""
+        index = max(self.current_index or 0, 0)
+        loop_listing = self._ordered_listings().offset(index).limit(1).first()
+        if loop_listing is None and index:
+            # Listings were removed since the index was stored: wrap around.
+            count = self.listings.count()
+            if not count:
+                return None
+            index %= count
+            loop_listing = self._ordered_listings().offset(index).limit(1).first()
+        self._next_listing_index = index
+        return loop_listing
+    
+    def advance_index(self, commit=True):
+        """Move to next listing in sequence.
+
+        The wrap-around is computed by the UPDATE itself, so a run can fold
+        this into its own commit (commit=False) without a separate COUNT.
+        """
+        index = getattr(self, '_next_listing_index', None)
+        if index is None:
+            index = max(self.current_index or 0, 0)
+        count = db.select(db.func.count(LoopListing.id)).where(
+            LoopListing.loop_config_id == self.id
+        ).scalar_subquery()
+        self.current_index = db.func.coalesce((index + 1) % db.func.nullif(count, 0), 0)
+        self._next_listing_index = None
+        if commit:
+            db.session.commit()
 
 
 class LoopListing(db.Model):
@@ -2884,6 +3287,7 @@ class LoopListing(db.Model):
         db.Index('idx_loop_listings_loop_config_id', 'loop_config_id'),
         db.Index('idx_loop_listings_listing_id', 'listing_id'),
         db.Index('idx_loop_listings_order_index', 'order_index'),
+        db.Index('idx_loop_listings_loop_order', 'loop_config_id', 'order_index'),
     )
     
     id = db.Column(db.Integer, primary_key=True)
@@ -2972,6 +3376,57 @@ class DuplicatedListing(db.Model):
         }
 
 
+class LoopCleanupJob(db.Model):
+    """Background deletion of a loop's published duplicates from PropertyFinder.
+
+    Pending work is the loop's DuplicatedListing rows still marked
+    'published'; each batch is committed as it finishes, so an interrupted
+    job resumes with whatever is left.
+    """
+    __tablename__ = 'loop_cleanup_jobs'
+    __table_args__ = (
+        db.Index('idx_loop_cleanup_jobs_loop_created', 'loop_config_id', 'created_at'),
+        db.Index('idx_loop_cleanup_jobs_status', 'status'),
+    )
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CANCELLED = 'cancelled'
+    STATUS_FAILED = 'failed'
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    id = db.Column(db.Integer, primary_key=True)
+    loop_config_id = db.Column(db.Integer, db.ForeignKey('loop_configs.id', ondelete='CASCADE'), nullable=False)
+    workspace_id = db.Column(db.Integer, db.ForeignKey('workspaces.id'), nullable=True)
+    created_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_QUEUED)
+    total = db.Column(db.Integer, default=0)
+    deleted_count = db.Column(db.Integer, default=0)
+    failed_count = db.Column(db.Integer, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # last checkpoint
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self, remaining=None):
+        return {
+            'id': self.id,
+            'loop_config_id': self.loop_config_id,
+            'status': self.status,
+            'total': self.total or 0,
+            'deleted_count': self.deleted_count or 0,
+            'failed_count': self.failed_count or 0,
+            'remaining': remaining,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
 class LoopExecutionLog(db.Model):
     """Log of loop executions for debugging and monitoring"""
     __tablename__ = 'loop_execution_logs'
@@ -2981,6 +3436,7 @@ class LoopExecutionLog(db.Model):
         db.Index('idx_loop_exec_action', 'action'),
         db.Index('idx_loop_exec_success', 'success'),
         db.Index('idx_loop_exec_executed_at', 'executed_at'),
+        db.Index('idx_loop_exec_loop_executed', 'loop_config_id', 'executed_at'),
     )
     
     id = db.Column(db.Integer, primary_key=True)
@@ -2996,6 +3452,8 @@ class LoopExecutionLog(db.Model):
     # Timestamps
     executed_at = db.Column(db.DateTime, default=datetime.utcnow)
     duration_ms = db.Column(db.Integer, nullable=True)
+    scheduled_for = db.Column(db.DateTime, nullable=True)  # next_run_at the run was due at
+    lag_ms = db.Column(db.Integer, nullable=True)  # start time minus scheduled_for
     
     def to_dict(self):
         return {
@@ -3007,7 +3465,61 @@ class LoopExecutionLog(db.Model):
             'message': self.message,
             'pf_listing_id': self.pf_listing_id,
             'executed_at': self.executed_at.isoformat() if self.executed_at else None,
-            'duration_ms': self.duration_ms
+            'duration_ms': self.duration_ms,
+            'scheduled_for': self.scheduled_for.isoformat() if self.scheduled_for else None,
+            'lag_ms': self.lag_ms
+        }
+
+
+class LoopExecutionDailyStat(db.Model):
+    """Daily rollup of loop executions (raw logs older than the retention window are pruned)"""
+    __tablename__ = 'loop_execution_daily_stats'
+    __table_args__ = (
+        db.UniqueConstraint('loop_config_id', 'day', 'action', name='uq_loop_exec_daily_loop_day_action'),
+        db.Index('idx_loop_exec_daily_day', 'day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    loop_config_id = db.Column(db.Integer, db.ForeignKey('loop_configs.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)  # UTC
+    action = db.Column(db.String(50), nullable=True)
+
+    runs = db.Column(db.Integer, default=0)
+    successes = db.Column(db.Integer, default=0)
+    failures = db.Column(db.Integer, default=0)
+    avg_duration_ms = db.Column(db.Integer, nullable=True)
+    p95_duration_ms = db.Column(db.Integer, nullable=True)
+
+    def to_dict(self):
+        return {
+            'loop_config_id': self.loop_config_id,
+            'day': self.day.isoformat() if self.day else None,
+            'action': self.action,
+            'runs': self.runs,
+            'successes': self.successes,
+            'failures': self.failures,
+            'avg_duration_ms': self.avg_duration_ms,
+            'p95_duration_ms': self.p95_duration_ms
+        }
+
+
+class SchedulerLease(db.Model):
+    """Which node currently leads background scheduling (heartbeat written by the leader)"""
+    __tablename__ = 'scheduler_leases'
+
+    name = db.Column(db.String(50), primary_key=True)
+    node_id = db.Column(db.String(255), nullable=False)
+    backend = db.Column(db.String(50), nullable=True)
+    acquired_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'node_id': self.node_id,
+            'backend': self.backend,
+            'acquired_at': self.acquired_at.isoformat() if self.acquired_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None
         }
 
 
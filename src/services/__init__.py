@@ -4,6 +4,13 @@ Contains business logic services including permissions, caching, and more.
 """
 
 from .permissions import PermissionService, check_access, list_effective_permissions
+from .reminder_notifications import ReminderNotificationHub
+from .lead_dedupe import cluster_sorted_keys
+from .listing_search import ListingSearch
+from .media_validation import MediaUrlValidator
+from .loop_schedule import LoopRunScheduler, WorkspaceFairExecutor
+from .leader_election import LeaderElection, PostgresAdvisoryLock, FileLock
+from .loop_projection import CallBudgetProjection
 from .i18n import (
     SUPPORTED_LANGUAGES,
     DEFAULT_LANGUAGE,
@@ -21,6 +28,16 @@ __all__ = [
     'PermissionService',
     'check_access',
     'list_effective_permissions',
+    'ReminderNotificationHub',
+    'cluster_sorted_keys',
+    'ListingSearch',
+    'MediaUrlValidator',
+    'LoopRunScheduler',
+    'WorkspaceFairExecutor',
+    'LeaderElection',
+    'PostgresAdvisoryLock',
+    'FileLock',
+    'CallBudgetProjection',
     'SUPPORTED_LANGUAGES',
     'DEFAULT_LANGUAGE',
     'get_language',
@@ -0,0 +1,77 @@
+"""
+Duplicate clustering for leads and contacts.
+
+Records are matched on normalized match keys (E.164 phone, lower-cased
+email). The bulk pass is a sort-based sweep: for each key the caller
+streams rows already ordered by that key (an index scan in the database),
+adjacent rows with the same key are unioned, and the resulting
+union-find components with more than one member are the duplicate
+clusters. Each key costs one ordered scan, so a whole workspace is
+clustered in O(n log n) without pairwise comparisons.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class _DisjointSet:
+    """Union-find with path halving and union by size."""
+
+    def __init__(self):
+        self._parent: Dict[Hashable, Hashable] = {}
+        self._size: Dict[Hashable, int] = {}
+
+    def add(self, item: Hashable) -> None:
+        if item not in self._parent:
+            self._parent[item] = item
+            self._size[item] = 1
+
+    def find(self, item: Hashable) -> Hashable:
+        self.add(item)
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: Hashable, b: Hashable) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+
+    def groups(self) -> List[List[Hashable]]:
+        grouped: Dict[Hashable, List[Hashable]] = {}
+        for item in self._parent:
+            grouped.setdefault(self.find(item), []).append(item)
+        return list(grouped.values())
+
+
+def cluster_sorted_keys(*sorted_streams: Iterable[Tuple[Optional[str], Hashable]]) -> List[List[Hashable]]:
+    """Cluster record ids that share a key in any of the given streams.
+
+    Each stream yields ``(key, record_id)`` pairs ordered by key; rows with
+    an empty key are ignored. Record ids must be mutually comparable (e.g.
+    ``('lead', 12)`` tuples). Returns clusters (lists of ids, each sorted)
+    with at least two members, largest first.
+    """
+    dsu = _DisjointSet()
+    for stream in sorted_streams:
+        previous_key = None
+        previous_id = None
+        for key, record_id in stream:
+            if not key:
+                previous_key = None
+                continue
+            if key == previous_key:
+                dsu.union(previous_id, record_id)
+            else:
+                previous_key = key
+                previous_id = record_id
+    clusters = [sorted(group) for group in dsu.groups() if len(group) > 1]
+    clusters.sort(key=lambda group: (-len(group), group[0]))
+    return clusters
@@ -0,0 +1,222 @@
+"""
+Leader election for background schedulers.
+
+Every web worker imports app.py, but periodic work (loop dispatch, PF
+auto-refresh, publish-queue recovery) must run in exactly one process.
+Processes compete for a lock; the holder is the leader and starts the
+scheduled jobs, the others keep retrying and take over when the lock is
+freed.
+
+- PostgreSQL: a session-level ``pg_try_advisory_lock`` held on a dedicated
+  connection. If the leader dies its connection drops and the lock is
+  released by the server, so failover needs no lease expiry.
+- Anything else (SQLite): an exclusive ``flock`` on a file next to the
+  database, released by the OS when the process exits. This covers
+  several workers on one host, which is all SQLite supports anyway.
+
+The leader also reports itself through a heartbeat callback so other
+nodes can show who holds leadership.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+
+LOGGER = logging.getLogger(__name__)
+
+BACKEND_POSTGRES = 'postgres_advisory_lock'
+BACKEND_FILE = 'file_lock'
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class PostgresAdvisoryLock:
+    """Session-level advisory lock held on its own connection."""
+
+    backend = BACKEND_POSTGRES
+
+    def __init__(self, engine, key: int):
+        self._engine = engine
+        self._key = int(key)
+        self._conn = None
+
+    def acquire(self) -> bool:
+        conn = self._engine.connect()
+        try:
+            acquired = bool(conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {'key': self._key}).scalar())
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def is_held(self) -> bool:
+        if self._conn is None:
+            return False
+        try:
+            self._conn.execute(text("SELECT 1"))
+            self._conn.commit()
+            return True
+        except Exception:
+            self._discard()
+            return False
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': self._key})
+            self._conn.commit()
+        except Exception:
+            pass
+        self._discard()
+
+    def _discard(self) -> None:
+        try:
+            self._conn.invalidate()  # never hand a lock-holding connection back to the pool
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+class FileLock:
+    """Exclusive non-blocking flock on a file (single host)."""
+
+    backend = BACKEND_FILE
+
+    def __init__(self, path: str):
+        self._path = path
+        self._handle = None
+
+    def acquire(self) -> bool:
+        try:
+            import fcntl
+        except ImportError:
+            return True  # no flock (Windows dev box): assume a single process
+        handle = open(self._path, 'a+')
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._handle = handle
+        return True
+
+    def is_held(self) -> bool:
+        return self._handle is not None
+
+    def release(self) -> None:
+        if self._handle is None:
+            return
+        try:
+            import fcntl
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        except Exception:
+            pass
+        self._handle.close()
+        self._handle = None
+
+
+class LeaderElection:
+    """Background thread that acquires/keeps a leader lock and flips callbacks."""
+
+    def __init__(self, lock, on_elected: Callable[[], None], on_demoted: Optional[Callable[[], None]] = None,
+                 heartbeat: Optional[Callable[['LeaderElection'], None]] = None,
+                 interval_seconds: int = 15, node_id: Optional[str] = None):
+        self._lock = lock
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._heartbeat = heartbeat
+        self._interval = max(1, int(interval_seconds or 15))
+        self.node_id = node_id or default_node_id()
+        self._is_leader = False
+        self._leader_since: Optional[datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    @property
+    def backend(self) -> str:
+        return self._lock.backend
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'node_id': self.node_id,
+            'backend': self.backend,
+            'is_leader': self._is_leader,
+            'leader_since': self._leader_since.isoformat() if self._leader_since else None,
+            'interval_seconds': self._interval,
+        }
+
+    def start(self) -> None:
+        """Start campaigning (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='leader-election', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop campaigning and give up leadership so another node can take over."""
+        self._stop.set()
+        if self._is_leader:
+            self._demote()
+        self._lock.release()
+
+    def tick(self) -> bool:
+        """One election round; returns whether this node is leader afterwards."""
+        if self._is_leader:
+            if not self._lock.is_held():
+                LOGGER.warning("Leader lock lost on %s", self.node_id)
+                self._demote()
+        else:
+            try:
+                acquired = self._lock.acquire()
+            except Exception as exc:
+                LOGGER.error("Leader lock attempt failed: %s", exc)
+                acquired = False
+            if acquired:
+                self._is_leader = True
+                self._leader_since = datetime.utcnow()
+                try:
+                    self._on_elected()
+                except Exception as exc:
+                    LOGGER.error("Starting leader jobs failed: %s", exc)
+        if self._is_leader and self._heartbeat is not None:
+            try:
+                self._heartbeat(self)
+            except Exception as exc:
+                LOGGER.error("Leader heartbeat failed: %s", exc)
+        return self._is_leader
+
+    def _demote(self) -> None:
+        self._is_leader = False
+        self._leader_since = None
+        if self._on_demoted is not None:
+            try:
+                self._on_demoted()
+            except Exception as exc:
+                LOGGER.error("Stopping leader jobs failed: %s", exc)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(self._interval)
@@ -0,0 +1,182 @@
+"""
+Indexed free-text search over local listings.
+
+Every listing carries a normalized ``search_document`` (reference, titles,
+location, type and descriptions in English and Arabic; see
+``normalize_search_text``). Matching uses the best index the database
+offers:
+
+- PostgreSQL: a pg_trgm GIN index, so ``LIKE '%term%'`` is index-assisted
+  for any script, and ``word_similarity`` ranks the matches.
+- SQLite: an external-content FTS5 table with the trigram tokenizer, kept
+  in sync by triggers and ranked with bm25.
+- Anything else (or a missing extension): plain LIKE on the document.
+
+Typeahead mode returns a handful of rows ordered by reference-prefix hits
+first, so the caller can project only the columns it renders.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from sqlalchemy import Float, Integer, case, column, func, text
+
+
+FTS_TABLE = 'listings_search_fts'
+MAX_TERMS = 8
+# Trigram indexes only help for terms of at least three characters.
+TRIGRAM_MIN_LENGTH = 3
+
+SEARCH_MODE_FULL = 'full'
+SEARCH_MODE_TYPEAHEAD = 'typeahead'
+
+BACKEND_POSTGRES = 'pg_trgm'
+BACKEND_SQLITE = 'fts5'
+BACKEND_LIKE = 'like'
+
+
+def search_terms(raw: Optional[str]) -> List[str]:
+    """Normalized, de-duplicated search terms from user input."""
+    from database import normalize_search_text
+
+    terms = []
+    for term in normalize_search_text(raw or '').split(' '):
+        if term and term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+class ListingSearch:
+    """Builds dialect-specific search filters/rankings for LocalListing queries."""
+
+    def __init__(self):
+        self._backend: Optional[str] = None
+
+    # ==================== SCHEMA ====================
+
+    def ensure_schema(self, db) -> List[str]:
+        """Create the search index for the current dialect (idempotent). Returns log lines."""
+        messages = []
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            with db.engine.connect() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_listings_search_trgm "
+                    "ON listings USING gin (search_document gin_trgm_ops)"
+                ))
+                conn.commit()
+            messages.append('pg_trgm search index ready')
+        elif dialect == 'sqlite':
+            with db.engine.connect() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"),
+                    {'name': FTS_TABLE}
+                ).fetchone()
+                if not exists:
+                    conn.execute(text(
+                        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                        "search_document, content='listings', content_rowid='id', tokenize='trigram')"
+                    ))
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS listings_search_ai AFTER INSERT ON listings BEGIN "
+                    f"INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document); END"
+                ))
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS listings_search_ad AFTER DELETE ON listings BEGIN "
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) "
+                    f"VALUES ('delete', old.id, old.search_document); END"
+                ))
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS listings_search_au AFTER UPDATE OF search_document ON listings BEGIN "
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) "
+                    f"VALUES ('delete', old.id, old.search_document); "
+                    f"INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document); END"
+                ))
+                if not exists:
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                    messages.append('FTS5 search index created')
+                conn.commit()
+        self._backend = None
+        return messages
+
+    def backend(self, db) -> str:
+        """Which search strategy the connected database supports (cached)."""
+        if self._backend is not None:
+            return self._backend
+        backend = BACKEND_LIKE
+        try:
+            dialect = db.engine.dialect.name
+            with db.engine.connect() as conn:
+                if dialect == 'postgresql':
+                    if conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).fetchone():
+                        backend = BACKEND_POSTGRES
+                elif dialect == 'sqlite':
+                    if conn.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"),
+                        {'name': FTS_TABLE}
+                    ).fetchone():
+                        backend = BACKEND_SQLITE
+        except Exception:
+            return BACKEND_LIKE  # not cached, so the next call retries detection
+        self._backend = backend
+        return backend
+
+    # ==================== QUERIES ====================
+
+    def apply(self, db, query, raw_term: Optional[str], ranked: bool = False,
+              mode: str = SEARCH_MODE_FULL):
+        """Filter a LocalListing query by `raw_term`; optionally order by relevance.
+
+        Returns the query unchanged when the term has no searchable content.
+        """
+        from database import LocalListing
+
+        terms = search_terms(raw_term)
+        if not terms:
+            return query
+        document = LocalListing.search_document
+        backend = self.backend(db)
+        rank_columns = []
+
+        if backend == BACKEND_SQLITE:
+            indexed = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+            short_terms = [term for term in terms if len(term) < TRIGRAM_MIN_LENGTH]
+            if indexed:
+                match_expr = ' AND '.join(_fts_phrase(term) for term in indexed)
+                fts = text(
+                    f"SELECT rowid AS listing_id, bm25({FTS_TABLE}) AS score "
+                    f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match_expr"
+                ).bindparams(match_expr=match_expr).columns(
+                    column('listing_id', Integer), column('score', Float)
+                ).subquery('listing_search_fts')
+                query = query.join(fts, fts.c.listing_id == LocalListing.id)
+                rank_columns.append(fts.c.score.asc())  # bm25: lower is better
+            for term in short_terms:
+                query = query.filter(document.contains(term, autoescape=True))
+        else:
+            for term in terms:
+                query = query.filter(document.contains(term, autoescape=True))
+            if backend == BACKEND_POSTGRES:
+                rank_columns.append(func.word_similarity(' '.join(terms), document).desc())
+
+        if not ranked:
+            return query
+
+        reference = func.lower(LocalListing.reference)
+        first_term = terms[0]
+        reference_rank = case(
+            (reference == first_term, 0),
+            (reference.startswith(first_term, autoescape=True), 1),
+            else_=2
+        )
+        ordering = [reference_rank] + rank_columns
+        if mode != SEARCH_MODE_TYPEAHEAD:
+            ordering.append(LocalListing.updated_at.desc())
+        ordering.append(LocalListing.id.desc())
+        return query.order_by(None).order_by(*ordering)
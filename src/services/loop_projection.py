@@ -0,0 +1,122 @@
+"""
+Projected PropertyFinder API usage of listing loops.
+
+app.py walks every active loop of a workspace through its real schedule
+(``compute_next_loop_run_at``) over the requested horizon and reports each
+run here. ``CallBudgetProjection`` accumulates the expected PF calls per
+hour and the busiest minute of each hour, then compares both against the
+per-key request budget so operators can see overload before PF starts
+answering 429.
+
+Once a loop's per-listing state stops changing, its runs are added
+arithmetically per hour (``add_dense_runs``) instead of run by run: the
+whole horizon for interval loops, one call per window for windowed loops.
+A loop every few seconds over a month then costs no more to project than
+an hourly one.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+CALL_KINDS = ('delete', 'create', 'publish')
+
+
+class CallBudgetProjection:
+    """Hourly buckets of expected PF calls between `start` and `end` (naive UTC)."""
+
+    def __init__(self, start: datetime, end: datetime, per_minute_budget: float):
+        self.start = start.replace(minute=0, second=0, microsecond=0)
+        self.end = end
+        self.per_minute_budget = float(per_minute_budget)
+        hours = max(1, math.ceil((end - self.start).total_seconds() / 3600))
+        self._runs = [0] * hours
+        self._calls = {kind: [0] * hours for kind in CALL_KINDS}
+        self._minute_calls: Dict[int, int] = {}  # minute offset -> calls
+        self._dense_minute_calls = [0] * hours  # per-minute upper bound from dense loops
+
+    @property
+    def hour_count(self) -> int:
+        return len(self._runs)
+
+    def _hour_index(self, at: datetime) -> Optional[int]:
+        if at < self.start or at >= self.end:
+            return None
+        index = int((at - self.start).total_seconds() // 3600)
+        return index if index < len(self._runs) else None
+
+    def add_run(self, at: datetime, calls: Dict[str, int]) -> None:
+        """Record one loop run at `at` making `calls` ({kind: count})."""
+        index = self._hour_index(at)
+        if index is None:
+            return
+        self._runs[index] += 1
+        total = 0
+        for kind in CALL_KINDS:
+            count = calls.get(kind, 0)
+            self._calls[kind][index] += count
+            total += count
+        minute = int((at - self.start).total_seconds() // 60)
+        self._minute_calls[minute] = self._minute_calls.get(minute, 0) + total
+
+    def add_dense_runs(self, first_at: datetime, interval_seconds: float, calls: Dict[str, int],
+                       until: Optional[datetime] = None) -> int:
+        """Record runs at `first_at + k * interval_seconds` before `until` (default: the end).
+
+        Returns the run count.
+        """
+        interval_seconds = max(float(interval_seconds), 1.0)
+        stop = min(until, self.end) if until is not None else self.end
+        per_run = sum(calls.get(kind, 0) for kind in CALL_KINDS)
+        per_minute = math.ceil(60.0 / interval_seconds) * per_run
+        first = max(first_at, self.start)
+        offset = (first - first_at).total_seconds()
+        k_first = math.ceil(offset / interval_seconds)
+        total_runs = 0
+        for index in range(int((first - self.start).total_seconds() // 3600), len(self._runs)):
+            hour_start = self.start + timedelta(hours=index)
+            if hour_start >= stop:
+                break
+            hour_end = min(hour_start + timedelta(hours=1), stop)
+            lo = max(k_first, math.ceil((hour_start - first_at).total_seconds() / interval_seconds))
+            hi = math.ceil((hour_end - first_at).total_seconds() / interval_seconds)
+            runs = max(0, hi - lo)
+            if not runs:
+                continue
+            total_runs += runs
+            self._runs[index] += runs
+            for kind in CALL_KINDS:
+                self._calls[kind][index] += runs * calls.get(kind, 0)
+            self._dense_minute_calls[index] += per_minute
+        return total_runs
+
+    def hours(self) -> List[Dict[str, Any]]:
+        """Per-hour rows with call counts, busiest minute and over-budget flag."""
+        peak_minutes = [0] * len(self._runs)
+        for minute, calls in self._minute_calls.items():
+            index = minute // 60
+            if calls > peak_minutes[index]:
+                peak_minutes[index] = calls
+        per_hour_budget = self.per_minute_budget * 60
+        rows = []
+        for index in range(len(self._runs)):
+            calls = {kind: self._calls[kind][index] for kind in CALL_KINDS}
+            total = sum(calls.values())
+            peak_minute = peak_minutes[index] + self._dense_minute_calls[index]
+            rows.append({
+                'hour': self.start + timedelta(hours=index),
+                'runs': self._runs[index],
+                'calls': dict(calls, total=total),
+                'peak_minute_calls': peak_minute,
+                'budget_used': round(total / per_hour_budget, 4) if per_hour_budget else None,
+                'over_budget': total > per_hour_budget or peak_minute > self.per_minute_budget,
+            })
+        return rows
+
+    def totals(self) -> Dict[str, int]:
+        totals = {kind: sum(self._calls[kind]) for kind in CALL_KINDS}
+        totals['total'] = sum(totals.values())
+        totals['runs'] = sum(self._runs)
+        return totals
@@ -0,0 +1,263 @@
+"""
+Event-driven scheduling of listing loops.
+
+Instead of polling the database every second for due loops, the scheduler
+keeps a min-heap of ``(next_run_at, loop_id)`` for every runnable loop. A
+single dispatcher thread sleeps until the earliest entry is due and hands
+the due loop ids to a runner callback. The heap is built from the database
+on start, updated in place whenever a loop is created, edited, paused,
+resumed, stopped or run (see the session hooks in app.py), and reconciled
+against the database periodically so writes from other processes are
+picked up.
+
+Due loops are executed by ``WorkspaceFairExecutor``: a bounded thread pool
+that caps how many loops of one workspace run at once and serves
+workspaces round-robin, so one workspace with slow PF calls cannot hold
+up everyone else's loops.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LoopRunScheduler:
+    """Due-time priority queue of loops with a sleeping dispatcher thread.
+
+    ``loader`` returns ``(loop_id, next_run_at)`` pairs for every runnable
+    loop (naive UTC; ``None`` means due now). ``runner`` receives a list of
+    due loop ids and should re-check each loop before running it, since an
+    entry may have been scheduled just before the loop was changed.
+    """
+
+    def __init__(self, runner: Callable[[List[int]], None],
+                 loader: Optional[Callable[[], Iterable[Tuple[int, Optional[datetime]]]]] = None,
+                 resync_seconds: int = 60):
+        self._runner = runner
+        self._loader = loader
+        self._resync_seconds = max(5, int(resync_seconds or 60))
+        self._heap: List[Tuple[datetime, int, int]] = []
+        self._entries: Dict[int, int] = {}
+        self._tokens = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._last_resync: Optional[datetime] = None
+
+    # ==================== HEAP MAINTENANCE ====================
+
+    def _push(self, loop_id: int, due_at: Optional[datetime]) -> None:
+        token = next(self._tokens)
+        self._entries[loop_id] = token
+        heapq.heappush(self._heap, (due_at or datetime.min, loop_id, token))
+
+    def _dispatching(self) -> bool:
+        return self._thread is not None and not self._stopped
+
+    def upsert(self, loop_id: int, due_at: Optional[datetime]) -> None:
+        """Schedule (or reschedule) a runnable loop; ignored while the dispatcher is not running."""
+        with self._cond:
+            if not self._dispatching():
+                return  # start() reconciles from the loader anyway
+            self._push(int(loop_id), due_at)
+            self._cond.notify()
+
+    def discard(self, loop_id: int) -> None:
+        """Forget a loop that was stopped, paused or deleted."""
+        with self._cond:
+            if self._entries.pop(int(loop_id), None) is not None:
+                self._cond.notify()
+
+    def rebuild(self, entries: Iterable[Tuple[int, Optional[datetime]]]) -> None:
+        """Replace the heap with a fresh set of runnable loops."""
+        with self._cond:
+            if self._stopped:
+                return  # a resync that finished after stop()
+            self._heap = []
+            self._entries = {}
+            for loop_id, due_at in entries:
+                token = next(self._tokens)
+                self._entries[int(loop_id)] = token
+                self._heap.append((due_at or datetime.min, int(loop_id), token))
+            heapq.heapify(self._heap)
+            self._last_resync = datetime.utcnow()
+            self._cond.notify()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    def next_due_at(self) -> Optional[datetime]:
+        """Earliest scheduled run (None when nothing is scheduled)."""
+        with self._cond:
+            self._drop_stale_head()
+            return self._heap[0][0] if self._heap else None
+
+    # ==================== DISPATCHER ====================
+
+    def start(self) -> None:
+        """Start the dispatcher thread (idempotent)."""
+        with self._cond:
+            self._stopped = False
+            self._last_resync = None  # reconcile first; the heap may be stale after a stop
+            if self._thread is not None and self._thread.is_alive():
+                self._cond.notify()
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name='loop-run-scheduler',
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop dispatching and drop the heap; start() rebuilds it from the loader."""
+        with self._cond:
+            self._stopped = True
+            self._heap = []
+            self._entries = {}
+            self._cond.notify_all()
+
+    def _drop_stale_head(self) -> None:
+        while self._heap and self._entries.get(self._heap[0][1]) != self._heap[0][2]:
+            heapq.heappop(self._heap)  # rescheduled or discarded
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _due_at, loop_id, token = heapq.heappop(self._heap)
+            if self._entries.get(loop_id) != token:
+                continue
+            self._entries.pop(loop_id, None)
+            due.append(loop_id)
+        return due
+
+    def _resync_due(self, now: datetime) -> bool:
+        if self._loader is None:
+            return False
+        if self._last_resync is None:
+            return True
+        return (now - self._last_resync).total_seconds() >= self._resync_seconds
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = datetime.utcnow()
+                needs_resync = self._resync_due(now)
+                due = [] if needs_resync else self._pop_due(now)
+                if not needs_resync and not due:
+                    self._drop_stale_head()
+                    timeout = float(self._resync_seconds)
+                    if self._heap:
+                        timeout = min(timeout, max(0.0, (self._heap[0][0] - now).total_seconds()))
+                    if self._last_resync is not None and self._loader is not None:
+                        elapsed = (now - self._last_resync).total_seconds()
+                        timeout = min(timeout, max(0.0, self._resync_seconds - elapsed))
+                    self._cond.wait(timeout=timeout)
+                    continue
+
+            if needs_resync:
+                try:
+                    self.rebuild(self._loader())
+                except Exception as exc:
+                    LOGGER.error("Loop schedule resync failed: %s", exc)
+                    with self._cond:
+                        self._last_resync = datetime.utcnow()
+                continue
+
+            try:
+                self._runner(due)
+            except Exception as exc:
+                LOGGER.error("Loop runner failed for %s: %s", due, exc)
+
+
+class WorkspaceFairExecutor:
+    """Bounded pool with per-workspace concurrency limits and round-robin fairness.
+
+    Jobs carry a key (the loop id); a key that is already queued or running
+    is not accepted again, so a loop reported due twice runs once.
+    """
+
+    def __init__(self, max_workers: int = 4, per_workspace: int = 1,
+                 thread_name_prefix: str = 'loop-worker'):
+        self._max_workers = max(1, int(max_workers))
+        self._per_workspace = max(1, int(per_workspace))
+        self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._queues: Dict[Hashable, Deque[Tuple[Hashable, Callable[..., Any], tuple]]] = {}
+        self._turns: Deque[Hashable] = deque()
+        self._running: Dict[Hashable, int] = {}
+        self._keys = set()
+        self._in_flight = 0
+
+    def submit(self, workspace_id: Hashable, key: Hashable, fn: Callable[..., Any], *args) -> bool:
+        """Queue `fn(*args)` for a workspace; False if `key` is already queued or running."""
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            self._queues.setdefault(workspace_id, deque()).append((key, fn, args))
+            if workspace_id not in self._turns:
+                self._turns.append(workspace_id)
+            self._dispatch_locked()
+        return True
+
+    def is_pending(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._keys
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_workers': self._max_workers,
+                'per_workspace': self._per_workspace,
+                'running': {ws: count for ws, count in self._running.items() if count},
+                'queued': {ws: len(jobs) for ws, jobs in self._queues.items()},
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch_locked(self) -> None:
+        while self._in_flight < self._max_workers and self._turns:
+            for _ in range(len(self._turns)):
+                workspace_id = self._turns[0]
+                self._turns.rotate(-1)  # served (or skipped) workspaces go to the back
+                if self._running.get(workspace_id, 0) < self._per_workspace:
+                    break
+            else:
+                return  # every waiting workspace is at its limit
+            jobs = self._queues[workspace_id]
+            key, fn, args = jobs.popleft()
+            if not jobs:
+                del self._queues[workspace_id]
+                self._turns.remove(workspace_id)
+            self._running[workspace_id] = self._running.get(workspace_id, 0) + 1
+            self._in_flight += 1
+            self._pool.submit(self._run, workspace_id, key, fn, args)
+
+    def _run(self, workspace_id: Hashable, key: Hashable, fn: Callable[..., Any], args: tuple) -> None:
+        try:
+            fn(*args)
+        except Exception as exc:
+            LOGGER.error("Loop job %s failed: %s", key, exc)
+        finally:
+            with self._lock:
+                self._running[workspace_id] -= 1
+                if not self._running[workspace_id]:
+                    del self._running[workspace_id]
+                self._in_flight -= 1
+                self._keys.discard(key)
+                self._dispatch_locked()
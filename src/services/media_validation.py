@@ -0,0 +1,170 @@
+"""
+Reachability checks for listing media URLs before they are sent to PF.
+
+URLs are checked concurrently through one shared HTTP session whose
+connection pool is capped per host, so a listing with many images on the
+same CDN reuses a few keep-alive connections instead of opening one per
+image. Results are cached briefly by URL (failures for less time than
+successes) in a bounded LRU, URLs served from our own ``/uploads/`` folder are checked on
+disk, and the whole check is bounded by an overall deadline: URLs that
+have not answered by then are reported as unverified rather than holding
+up the caller.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class MediaUrlValidator:
+    """Concurrent, cached HEAD/ranged-GET checks for media URLs."""
+
+    def __init__(self, local_path_resolver: Optional[Callable[[str], Optional[Path]]] = None,
+                 max_workers: int = 8, connections_per_host: int = 4,
+                 request_timeout: float = 5.0, deadline_seconds: float = 20.0,
+                 ok_ttl_seconds: int = 600, failure_ttl_seconds: int = 60,
+                 max_cache_entries: int = 10000):
+        self._local_path_resolver = local_path_resolver
+        self._max_workers = max(1, int(max_workers))
+        self._connections_per_host = max(1, int(connections_per_host))
+        self._request_timeout = float(request_timeout)
+        self._deadline_seconds = float(deadline_seconds)
+        self._ok_ttl = ok_ttl_seconds
+        self._failure_ttl = failure_ttl_seconds
+        self._max_cache_entries = max(1, int(max_cache_entries))
+        self._cache: 'OrderedDict[str, Tuple[bool, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._session = None
+
+    @property
+    def deadline_seconds(self) -> float:
+        return self._deadline_seconds
+
+    # ==================== CACHE ====================
+
+    def _cached(self, url: str) -> Optional[bool]:
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is None:
+                return None
+            ok, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._cache.pop(url, None)
+                return None
+            self._cache.move_to_end(url)
+            return ok
+
+    def _remember(self, url: str, ok: bool) -> None:
+        ttl = self._ok_ttl if ok else self._failure_ttl
+        now = time.monotonic()
+        with self._lock:
+            self._cache[url] = (ok, now + ttl)
+            self._cache.move_to_end(url)
+            if len(self._cache) <= self._max_cache_entries:
+                return
+            # Over the bound: sweep expired entries first, then evict least recently used.
+            for key in [key for key, (_, expires_at) in self._cache.items() if expires_at <= now]:
+                del self._cache[key]
+            while len(self._cache) > self._max_cache_entries:
+                self._cache.popitem(last=False)
+
+    # ==================== CHECKS ====================
+
+    def _http_session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                # pool_block caps concurrent connections per host at the pool size.
+                adapter = HTTPAdapter(
+                    pool_connections=self._max_workers,
+                    pool_maxsize=self._connections_per_host,
+                    pool_block=True,
+                    max_retries=0
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+
+    def _check_http(self, url: str, timeout: float) -> bool:
+        import requests
+
+        session = self._http_session()
+        try:
+            resp = session.head(url, allow_redirects=True, timeout=timeout)
+            status = resp.status_code
+            resp.close()
+            if status == 405:
+                resp = session.get(url, allow_redirects=True, timeout=timeout, stream=True,
+                                   headers={'Range': 'bytes=0-1023'})
+                resp.raw.read(1024)
+                status = resp.status_code
+                resp.close()
+        except requests.RequestException:
+            return False
+        return 200 <= status < 400
+
+    def _check_one(self, url: str, timeout: float) -> bool:
+        ok = self._check_http(url, timeout)
+        self._remember(url, ok)
+        return ok
+
+    def check(self, urls: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Check URLs; returns (failed, unverified) in input order.
+
+        `unverified` holds URLs whose check did not finish before the
+        deadline; a late answer is still cached for the next call.
+        """
+        ordered = []
+        for url in urls:
+            if url and url not in ordered:
+                ordered.append(url)
+
+        results: Dict[str, bool] = {}
+        pending = []
+        for url in ordered:
+            cached = self._cached(url)
+            if cached is not None:
+                results[url] = cached
+                continue
+            local_path = self._local_path_resolver(url) if self._local_path_resolver else None
+            if local_path is not None:
+                results[url] = local_path.is_file()
+                continue
+            pending.append(url)
+
+        if pending:
+            deadline = time.monotonic() + self._deadline_seconds
+            timeout = min(self._request_timeout, self._deadline_seconds)
+            executor = ThreadPoolExecutor(
+                max_workers=min(self._max_workers, len(pending)),
+                thread_name_prefix='media-url-check'
+            )
+            try:
+                futures = {executor.submit(self._check_one, url, timeout): url for url in pending}
+                not_done = set(futures)
+                while not_done:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    done, not_done = wait(not_done, timeout=remaining, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            results[futures[future]] = future.result()
+                        except Exception:
+                            results[futures[future]] = False
+            finally:
+                # Don't wait for stragglers; their own request timeout ends them.
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        failed = [url for url in ordered if results.get(url) is False]
+        unverified = [url for url in ordered if url not in results]
+        return failed, unverified
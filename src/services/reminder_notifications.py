@@ -0,0 +1,211 @@
+"""
+In-process push hub for lead reminder notifications.
+
+Pending reminders are kept in a min-heap ordered by due time. A single
+dispatcher thread sleeps until the earliest reminder is due and then fans
+the notification out to the per-user subscriber queues that back the
+Server-Sent Events stream. The heap is rebuilt from the database on start
+and periodically reconciled (so writes made by other processes are picked
+up), and updated in place whenever a reminder is created, edited,
+completed, cancelled or deleted.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Subscriber queues are bounded so a stalled client cannot grow memory.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class ReminderNotificationHub:
+    """Due-time priority queue of reminders with per-user subscribers.
+
+    Entries are plain dicts with at least ``reminder_id``, ``workspace_id``,
+    ``due_at`` (naive UTC datetime) and ``recipient_user_id``.
+    """
+
+    def __init__(self, loader: Optional[Callable[[], Iterable[Dict[str, Any]]]] = None,
+                 resync_seconds: int = 300):
+        self._loader = loader
+        self._resync_seconds = max(30, int(resync_seconds or 300))
+        self._heap: List[Tuple[datetime, int, int]] = []
+        self._entries: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+        self._tokens = itertools.count()
+        self._subscribers: Dict[Tuple[int, int], Set[queue.Queue]] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._last_resync: Optional[datetime] = None
+        self._removed: Dict[int, int] = {}  # reminder_id -> token of its discard
+
+    # ==================== HEAP MAINTENANCE ====================
+
+    def upsert(self, entry: Dict[str, Any]) -> None:
+        """Add or reschedule a pending reminder."""
+        reminder_id = int(entry['reminder_id'])
+        with self._cond:
+            token = next(self._tokens)
+            self._entries[reminder_id] = (token, dict(entry))
+            heapq.heappush(self._heap, (entry['due_at'], reminder_id, token))
+            self._cond.notify()
+
+    def discard(self, reminder_id: int, workspace_id: Optional[int] = None,
+                recipient_user_id: Optional[int] = None) -> None:
+        """Drop a reminder (completed/cancelled/deleted) and tell its recipient."""
+        with self._cond:
+            self._entries.pop(int(reminder_id), None)
+            self._removed[int(reminder_id)] = next(self._tokens)
+            self._cond.notify()
+        if workspace_id and recipient_user_id:
+            self._publish(workspace_id, recipient_user_id, {
+                'event': 'reminder_removed',
+                'data': {'reminder_id': int(reminder_id)},
+            })
+
+    def snapshot_token(self) -> int:
+        """Mark taken before loading from the database; pass it to `rebuild`."""
+        with self._cond:
+            return next(self._tokens)
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]], since_token: Optional[int] = None) -> None:
+        """Replace the heap with a fresh set of pending reminders.
+
+        With `since_token` (from `snapshot_token` before the load), upserts and
+        discards made while the loader was querying win over the loaded rows,
+        and entries already due are kept so the dispatcher still publishes
+        them (the loader only returns reminders due in the future).
+        """
+        with self._cond:
+            previous = self._entries
+            now = datetime.utcnow()
+            self._heap = []
+            self._entries = {}
+            for entry in entries:
+                reminder_id = int(entry['reminder_id'])
+                if since_token is not None and self._removed.get(reminder_id, -1) > since_token:
+                    continue
+                self._entries[reminder_id] = (next(self._tokens), dict(entry))
+            if since_token is not None:
+                for reminder_id, (token, entry) in previous.items():
+                    if token > since_token or (reminder_id not in self._entries and entry['due_at'] <= now):
+                        self._entries[reminder_id] = (next(self._tokens), entry)
+            for reminder_id, (token, entry) in self._entries.items():
+                self._heap.append((entry['due_at'], reminder_id, token))
+            heapq.heapify(self._heap)
+            self._removed = {}
+            self._last_resync = now
+            self._cond.notify()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    # ==================== SUBSCRIBERS ====================
+
+    def subscribe(self, workspace_id: int, user_id: int) -> queue.Queue:
+        """Register a subscriber queue for one user's stream in a workspace."""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._cond:
+            self._subscribers.setdefault((int(workspace_id), int(user_id)), set()).add(subscriber)
+        self.start()
+        return subscriber
+
+    def unsubscribe(self, workspace_id: int, user_id: int, subscriber: queue.Queue) -> None:
+        key = (int(workspace_id), int(user_id))
+        with self._cond:
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(key, None)
+
+    def _publish(self, workspace_id: int, user_id: int, message: Dict[str, Any]) -> None:
+        with self._cond:
+            subscribers = list(self._subscribers.get((int(workspace_id), int(user_id)), ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                LOGGER.warning("Dropping reminder notification for slow subscriber (user_id=%s)", user_id)
+
+    # ==================== DISPATCHER ====================
+
+    def start(self) -> None:
+        """Start the dispatcher thread (idempotent)."""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run,
+                name='reminder-notification-dispatcher',
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _pop_due(self, now: datetime) -> List[Dict[str, Any]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _due_at, reminder_id, token = heapq.heappop(self._heap)
+            current = self._entries.get(reminder_id)
+            if current is None or current[0] != token:
+                continue  # stale heap entry (rescheduled or removed)
+            self._entries.pop(reminder_id, None)
+            due.append(current[1])
+        return due
+
+    def _resync_due(self, now: datetime) -> bool:
+        if self._loader is None:
+            return False
+        if self._last_resync is None:
+            return True
+        return (now - self._last_resync).total_seconds() >= self._resync_seconds
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = datetime.utcnow()
+                needs_resync = self._resync_due(now)
+                # Publish what is due before any resync replaces the heap.
+                due = self._pop_due(now)
+                if not needs_resync and not due:
+                    timeout = float(self._resync_seconds)
+                    if self._heap:
+                        timeout = min(timeout, max(0.0, (self._heap[0][0] - now).total_seconds()))
+                    if self._last_resync is not None and self._loader is not None:
+                        elapsed = (now - self._last_resync).total_seconds()
+                        timeout = min(timeout, max(0.0, self._resync_seconds - elapsed))
+                    self._cond.wait(timeout=timeout)
+                    continue
+
+            for entry in due:
+                self._publish(entry['workspace_id'], entry['recipient_user_id'], {
+                    'event': 'reminder_due',
+                    'data': entry,
+                })
+
+            if needs_resync:
+                try:
+                    since_token = self.snapshot_token()
+                    self.rebuild(self._loader(), since_token=since_token)
+                except Exception as exc:
+                    LOGGER.error("Reminder notification resync failed: %s", exc)
+                    with self._cond:
+                        self._last_resync = datetime.utcnow()
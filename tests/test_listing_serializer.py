@@ -0,0 +1,107 @@
+"""Listing collection serialization must not issue per-row queries."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+DB_DIR = tempfile.mkdtemp(prefix='listing-serializer-')
+os.environ['DATABASE_URL'] = f"sqlite:///{Path(DB_DIR) / 'test.db'}"
+os.environ.pop('REDIS_URL', None)
+sys.path.insert(0, str(ROOT))
+
+import app as app_module  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import app, db  # noqa: E402
+from database import ListingFolder, LocalListing, User, Workspace, WorkspaceMember  # noqa: E402
+
+LISTING_COUNT = 120
+
+
+@pytest.fixture(scope='module')
+def seeded():
+    app_module.loop_scheduler.pause()
+    app_module.loop_run_scheduler.stop()
+    app_module.scheduler_election.stop()
+    with app.app_context():
+        workspace = Workspace.query.first()
+        agents = []
+        for index in range(5):
+            agent = User(email=f'agent{index}@example.com', name=f'Agent {index}', role='admin', is_active=True)
+            agent.set_password('secret')
+            agents.append(agent)
+        db.session.add_all(agents)
+        db.session.flush()
+        for agent in agents:
+            db.session.add(WorkspaceMember(workspace_id=workspace.id, user_id=agent.id, role='owner'))
+        folders = [
+            ListingFolder(name=f'Folder {index}', workspace_id=workspace.id, owner_user_id=agents[0].id)
+            for index in range(7)
+        ]
+        db.session.add_all(folders)
+        db.session.flush()
+        for index in range(LISTING_COUNT):
+            db.session.add(LocalListing(
+                reference=f'SER{index:04d}',
+                workspace_id=workspace.id,
+                title_en=f'Listing {index}',
+                status='draft',
+                assigned_to_id=agents[index % len(agents)].id,
+                folder_id=folders[index % len(folders)].id,
+            ))
+        db.session.commit()
+        yield {'user_id': agents[0].id, 'workspace_id': workspace.id}
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *_args, **_kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *_exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def _collection_statements(page_size):
+    with app.app_context():
+        listings = LocalListing.query.order_by(LocalListing.id).limit(page_size).all()
+        assert len(listings) == page_size
+        with StatementCounter(db.engine) as counter:
+            data = LocalListing.to_dict_collection(listings)
+        assert all(item['assigned_to_name'] and item['folder'] for item in data)
+        return counter.count
+
+
+def _endpoint_statements(seeded, page_size, compact):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = seeded['user_id']
+        session['current_workspace_id'] = seeded['workspace_id']
+    with app.app_context():
+        engine = db.engine
+    with StatementCounter(engine) as counter:
+        response = client.get(f'/api/local/listings?per_page={page_size}&compact={compact}')
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == page_size
+    return counter.count
+
+
+def test_to_dict_collection_statement_count_is_independent_of_page_size(seeded):
+    assert _collection_statements(10) == _collection_statements(100)
+
+
+@pytest.mark.parametrize('compact', ['0', '1'])
+def test_listing_page_statement_count_is_independent_of_page_size(seeded, compact):
+    _endpoint_statements(seeded, 10, compact)  # warm per-request caches (workspace, permissions)
+    assert _endpoint_statements(seeded, 10, compact) == _endpoint_statements(seeded, 100, compact)